@@ -8,7 +8,7 @@ DEFLOC = "data/training/"
 
 
 def main():
-    training_handler = trainer.TrainingHandler()
+    training_handler = trainer.TrainingHandler(journal=True)
     filename = get_filename()
 
     training_handler.load(filename)
@@ -33,7 +33,7 @@ def get_filename() -> str:
 
 
 def get_training_info_data() -> Dict:
-    keys = trainer.TrainingInfo.__annotations__.keys()
+    keys = trainer.get_input_fields()
     r = {}
     for key in keys:
         if key == "attributes":
@@ -50,7 +50,7 @@ def get_list_of_attribtues() -> List[str]:
 
 def register_new_training(handler: trainer.TrainingHandler, training_info: Dict):
     new_info = trainer.TrainingInfo(**training_info)
-    handler.add_training_info(new_info)
+    handler.add_training_info(new_info, save=True)
 
 
 def print_welcome_message():
@@ -59,6 +59,7 @@ def print_welcome_message():
 The program will repeatly ask for the training data until you decide to not continue. Therefore, this might be crude but good way to register the training data so that we can use it in the ES program afterwards.
 For filename, you don't need to specify the exact location since it will be automatically saved in the 'data/training/' directory.
 If there is a newline need to be added for example in the description, use '\\n'.
+Every training is saved as soon as it is entered, so nothing is lost if the program is closed early.
 """
     print(msg)
 
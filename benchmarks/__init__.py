@@ -0,0 +1,11 @@
+"""Reproducible benchmarks of the data, engine and rendering hot paths.
+
+Usage::
+
+    python -m benchmarks run --scale small
+    python -m benchmarks run --scale full -k data. -o before.json
+    python -m benchmarks compare before.json after.json
+
+Run from the repository root, like the application, so the assets are found. The synthetic
+datasets are generated once per scale into benchmarks/.data and the results are saved as JSON.
+"""
@@ -0,0 +1,82 @@
+"""Benchmarks of the player data: loading, processing and normalizing the season files."""
+
+import os
+
+import pandas as pd
+
+from utils import columnar
+from utils import schema
+from utils.datahandler import DataHandler, get_processor
+from utils._processor import PROCESSOR
+
+from . import generators
+from .runner import Context, benchmark
+
+# NOTE: Processing players one by one is slow by design, only this many rows are processed per call.
+PER_ROW_LIMIT = 10_000
+
+
+def get_season(context: Context) -> str:
+    """Get the directory of the generated season of a context, writing it the first time."""
+    directory = os.path.join(context.data_dir, "season")
+    generators.write_season(directory, context.players, context.seed)
+    return directory
+
+
+def get_filename(context: Context, position: str) -> str:
+    return os.path.join(get_season(context), f"{position}_raw_data.csv")
+
+
+def _register(position: str):
+    processor = get_processor(position)
+
+    @benchmark(f"data.load_csv[{position}]")
+    def load_csv(context: Context):
+        handler = DataHandler(processor)
+        filename = get_filename(context, position)
+        return lambda: handler.load_data_from_csv(filename)
+
+    @benchmark(f"data.load_columnar[{position}]")
+    def load_columnar(context: Context):
+        handler = DataHandler(processor)
+        filename = get_filename(context, position)
+        # NOTE: Written apart from the csv file, so the csv benchmarks keep reading the csv file.
+        target = os.path.join(context.data_dir, "columnar", f"{position}.npy")
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            columnar.write_columnar(pd.read_csv(filename, dtype=str), target)
+        return lambda: handler.load_data_from_columnar(target, mmap=False)
+
+    @benchmark(f"data.get_data[{position}]")
+    def get_data(context: Context):
+        handler = DataHandler(processor)
+        handler.load_data_from_csv(get_filename(context, position))
+        return handler.get_data
+
+    @benchmark(f"data.get_normalized_data[{position}]")
+    def get_normalized_data(context: Context):
+        handler = DataHandler(processor)
+        handler.load_data_from_csv(get_filename(context, position))
+        return handler.get_normalized_data
+
+
+def _register_processor(position: str, processor: type):
+    @benchmark(f"processor.per_row[{processor.__name__}]")
+    def per_row(context: Context):
+        handler = DataHandler(processor)
+        handler.load_data_from_csv(get_filename(context, position))
+        records = handler._columns.head(PER_ROW_LIMIT).to_dict("records")
+        return lambda: [processor(record).data for record in records]
+
+    @benchmark(f"processor.process[{processor.__name__}]")
+    def process(context: Context):
+        handler = DataHandler(processor)
+        handler.load_data_from_csv(get_filename(context, position))
+        records = handler._columns.to_dict("records")
+        return lambda: processor.process(records)
+
+
+for _position in schema.get_positions():
+    _register(_position)
+for _position, _processor in PROCESSOR.items():
+    _register_processor(_position, _processor)
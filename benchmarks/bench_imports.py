@@ -0,0 +1,82 @@
+"""Import time of the application, measured in fresh interpreters.
+
+Usage::
+
+    python -m benchmarks.bench_imports [--module main] [--top 15]
+
+Prints the slowest imports (from `python -X importtime`) and which heavy modules were imported.
+"""
+
+import sys
+import argparse
+import subprocess
+from typing import List, Tuple
+
+from .runner import Context, benchmark
+
+HEAVY_MODULES = ["pandas", "selenium", "rich", "numpy", "PIL", "customtkinter"]
+
+
+def get_import_times(module: str = "main") -> List[Tuple[str, float, float]]:
+    """Import a module in a fresh interpreter and get the import time of every module it imports.
+
+    :param module: The module to import, defaults to "main"
+    :type module: str, optional
+    :return: A list of (module, self time, cumulative time) in seconds, in import order.
+    :rtype: list[tuple[str, float, float]]
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return times
+
+
+def get_imported_modules(module: str = "main") -> List[str]:
+    """Get the HEAVY_MODULES imported by importing a module in a fresh interpreter."""
+    code = (
+        f"import sys, {module}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return process.stdout.split()
+
+
+def _import_module(module: str):
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+
+
+@benchmark("startup.import[main]")
+def import_main(context: Context):
+    return lambda: _import_module("main")
+
+
+@benchmark("startup.import[pandas]")
+def import_pandas(context: Context):
+    # NOTE: The cost deferred by the lazy imports, paid on the first data access.
+    return lambda: _import_module("pandas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the import time of a module.")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    times = get_import_times(args.module)
+    total = next(cumulative for name, _, cumulative in times if name == args.module)
+    print(f"{'module':<60} {'self ms':>10} {'total ms':>10}")
+    for name, self_time, cumulative in sorted(times, key=lambda t: -t[2])[: args.top]:
+        print(f"{name:<60} {self_time * 1000:>10.1f} {cumulative * 1000:>10.1f}")
+    print(f"\nimport {args.module}: {total * 1000:.1f} ms")
+    print(f"heavy modules imported: {', '.join(get_imported_modules(args.module))}")
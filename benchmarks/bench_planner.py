@@ -0,0 +1,85 @@
+"""Solve time of the weekly plan optimizer across catalogue sizes.
+
+Usage::
+
+    python -m benchmarks.bench_planner
+"""
+
+import time
+import random
+import argparse
+
+from engine import planner
+from engine.trainer import TrainingInfo
+
+from .runner import Context, benchmark
+
+ATTRIBUTES = [f"Attribute {i}" for i in range(40)]
+MAX_REPEATS = 2
+
+
+def make_catalogue(size: int, seed: int = 0):
+    """Make a synthetic catalogue of `size` drills training 1 to 3 attributes each."""
+    rng = random.Random(seed)
+    return [
+        TrainingInfo(
+            f"Drill {i}", "", "defender", rng.sample(ATTRIBUTES, rng.randint(1, 3))
+        )
+        for i in range(size)
+    ]
+
+
+def make_deficits(players: int, seed: int = 0):
+    """Make the deficits of `players` players on 10 random attributes each."""
+    rng = random.Random(seed)
+    return [
+        {attr: rng.uniform(0, 10) for attr in rng.sample(ATTRIBUTES, 10)}
+        for _ in range(players)
+    ]
+
+
+def run(sizes, players: int = 1, repeat: int = 5):
+    deficits = make_deficits(players)
+    print(f"{'drills':>8} {'method':>7} {'value':>10} {'ms':>10}")
+    for size in sizes:
+        catalogue = make_catalogue(size)
+        minutes = {
+            info.name: random.Random(i).choice([10, 15, 20, 30])
+            for i, info in enumerate(catalogue)
+        }
+        # NOTE: Like method="auto", the exact solver only runs on small instances.
+        exact = size * MAX_REPEATS <= planner.EXACT_LIMIT
+        methods = ["exact", "greedy"] if exact else ["greedy"]
+        for method in methods:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                plan = planner.plan_week(
+                    catalogue,
+                    deficits,
+                    minutes=minutes,
+                    repetitions=2,
+                    max_repeats=MAX_REPEATS,
+                    method=method,
+                )
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            print(f"{size:>8} {method:>7} {plan.value:>10.2f} {elapsed:>10.2f}")
+
+
+@benchmark("planner.plan_week")
+def plan_week(context: Context):
+    catalogue = make_catalogue(context.drills, context.seed)
+    deficits = make_deficits(5, context.seed)
+    return lambda: planner.plan_week(
+        catalogue, deficits, repetitions=2, max_repeats=MAX_REPEATS, method="greedy"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the weekly plan optimizer.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[8, 16, 100, 1000, 10000, 50000]
+    )
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.players, args.repeat)
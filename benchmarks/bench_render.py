@@ -0,0 +1,105 @@
+"""Benchmarks of the image rendering: backgrounds, text renders and the widget images.
+
+The widgets are drawn headless with `utils.render`, the drawing code of `ui.widgets` without Tk.
+"""
+
+import os
+
+from engine import report
+from utils import image as uimage
+from utils import render
+from utils import render_cache
+from utils.font import RenderFont
+
+from .runner import Context, benchmark
+
+# NOTE: The widgets default to the "arial" system font, which is not installed everywhere.
+FONT = "assets/fonts/HankenGrotesk-Medium.ttf"
+BACKGROUND_SIZE = (1350, 800)
+
+
+def use_cache_dir(context: Context):
+    """Keep the render cache of the benchmarks apart from the user cache."""
+    os.environ["PCA_RENDER_CACHE_DIR"] = os.path.join(context.data_dir, "renders")
+
+
+@benchmark("render.text_bg_builder")
+def text_bg_builder(context: Context):
+    return lambda: uimage.render_text_bg("defender", BACKGROUND_SIZE)
+
+
+@benchmark("render.text_bg_builder[cached]")
+def text_bg_builder_cached(context: Context):
+    use_cache_dir(context)
+    # NOTE: A size which is not pre-rendered, see utils.prebuilt.
+    return lambda: uimage.text_bg_builder("defender", (1351, 801))
+
+
+@benchmark("render.font.get_render")
+def font_get_render(context: Context):
+    font = RenderFont("assets/fonts/Anton-Regular.ttf")
+    return lambda: font.render(
+        "Fill in data for\nDEFENDER", 100, (255, 255, 0), align="center"
+    )
+
+
+@benchmark("render.font.get_render[cached]")
+def font_get_render_cached(context: Context):
+    use_cache_dir(context)
+    font = RenderFont("assets/fonts/Anton-Regular.ttf")
+    return lambda: font.get_render("Cached title", 100, (255, 255, 0), align="center")
+
+
+@benchmark("render.meter")
+def meter(context: Context):
+    base = render.render_meter_base(150)
+    return lambda: [
+        render.render_meter(
+            value, meter_size=150, suffix="%", textfont=(FONT, 25), base=base
+        )
+        for value in range(0, 101, 10)
+    ]
+
+
+@benchmark("render.slider_meter")
+def slider_meter(context: Context):
+    base = render.render_slider_base(500, 60)
+    return lambda: [
+        render.render_slider(value, 500, 60, threshold=50, base=base)
+        for value in range(0, 101, 10)
+    ]
+
+
+def _render_card():
+    subtext = "Improve the duels and the aerial battles of the defenders. " * 3
+    return render.render_card(
+        "Defensive heading drill",
+        subtext=subtext,
+        text_font=(FONT, 18),
+        subtext_font=(FONT, 16),
+    )
+
+
+@benchmark("render.card_button")
+def card_button(context: Context):
+    return _render_card
+
+
+@benchmark("render.card_button[cached]")
+def card_button_cached(context: Context):
+    use_cache_dir(context)
+    return lambda: render_cache.get_or_render(
+        "benchmark_card_button", [], _render_card, [FONT]
+    )
+
+
+@benchmark("render.report")
+def player_report(context: Context):
+    player = report.PlayerReport(
+        "Benchmark player",
+        "forward",
+        "data_new",
+        attributes=[(f"Attribute {i}", i * 9, 50) for i in range(10)],
+        trainings=[(f"Drill {i}", "Repeated sets of ten. " * 6) for i in range(8)],
+    )
+    return lambda: report.render_report(player)
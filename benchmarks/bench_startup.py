@@ -0,0 +1,92 @@
+"""Time to first window of the app, from source or from a packaged build.
+
+Usage::
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --profile source "python main.py" \\
+        --profile default dist/pca_v0.2.1/pca_v0.2.1 \\
+        --profile startup dist/pca_v0.2.1_startup/pca_v0.2.1_startup
+
+Each profile is launched with PCA_EXIT_ON_IDLE=1, so the app closes as soon as its first page is
+shown, and the wall time from launch to exit is measured. The first run of each profile is a cold
+start, the next runs are warm (the files are in the OS cache). A display is needed.
+"""
+
+import os
+import sys
+import time
+import shlex
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+DEFAULT_PROFILES = [("source", f"{shlex.quote(sys.executable)} main.py")]
+
+
+def time_startup(command: str, runs: int = 5) -> List[float]:
+    """Launch a command several times and time each run.
+
+    :param command: The command launching the app.
+    :type command: str
+    :param runs: The number of runs, defaults to 5
+    :type runs: int, optional
+    :raises RuntimeError: If the app fails to start.
+    :return: The wall time of each run in seconds, the first one is the cold start.
+    :rtype: list[float]
+    """
+    env = {**os.environ, "PCA_EXIT_ON_IDLE": "1"}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run(shlex.split(command), env=env, capture_output=True)
+        times.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"{command} exited with {process.returncode}: {process.stderr.decode()[-500:]}"
+            )
+    return times
+
+
+def compare(
+    profiles: List[Tuple[str, str]], runs: int = 5
+) -> Dict[str, Dict[str, float]]:
+    """Time the startup of every profile.
+
+    :param profiles: A list of (name, command).
+    :type profiles: list[tuple[str, str]]
+    :param runs: The number of runs per profile, defaults to 5
+    :type runs: int, optional
+    :return: A dictionary of profile name and its cold start, warm median and warm min in seconds.
+    :rtype: dict[str, dict[str, float]]
+    """
+    results = {}
+    for name, command in profiles:
+        times = time_startup(command, runs)
+        warm = times[1:] or times
+        results[name] = {
+            "cold": times[0],
+            "warm": statistics.median(warm),
+            "min": min(warm),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the startup time of builds.")
+    parser.add_argument(
+        "--profile",
+        nargs=2,
+        action="append",
+        metavar=("NAME", "COMMAND"),
+        help="A build to time, e.g. startup dist/pca/pca. Defaults to the source.",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = compare(args.profile or DEFAULT_PROFILES, args.runs)
+    print(f"{'profile':<16} {'cold ms':>10} {'warm ms':>10} {'min ms':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<16} {result['cold'] * 1000:>10.1f} {result['warm'] * 1000:>10.1f} {result['min'] * 1000:>10.1f}"
+        )
@@ -0,0 +1,46 @@
+"""Benchmarks of the training catalogue: loading, retrieving and saving."""
+
+import os
+import shutil
+
+from engine.trainer import TrainingHandler
+
+from . import generators
+from .runner import Context, benchmark
+
+ATTRIBUTES = ["Attribute 1", "Attribute 7", "Attribute 23"]
+
+
+def get_catalogue(context: Context) -> str:
+    """Get the catalogue file of a context, writing it the first time."""
+    filename = os.path.join(context.data_dir, "training", "training_data.csv")
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    return generators.write_catalogue(filename, context.drills, context.seed)
+
+
+@benchmark("training.load")
+def load(context: Context):
+    filename = get_catalogue(context)
+    return lambda: TrainingHandler(filename)
+
+
+@benchmark("training.retrieve")
+def retrieve(context: Context):
+    handler = TrainingHandler(get_catalogue(context))
+    return lambda: handler.retrieve(ATTRIBUTES)
+
+
+@benchmark("training.retrieve[position]")
+def retrieve_position(context: Context):
+    handler = TrainingHandler(get_catalogue(context))
+    return lambda: handler.retrieve(ATTRIBUTES, position="defender")
+
+
+@benchmark("training.save")
+def save(context: Context):
+    # NOTE: Saved to a copy, the generated catalogue is left untouched.
+    filename = os.path.join(context.data_dir, "training", "save", "training_data.csv")
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    shutil.copyfile(get_catalogue(context), filename)
+    handler = TrainingHandler(filename)
+    return handler.save
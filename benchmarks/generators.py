@@ -0,0 +1,109 @@
+"""Synthetic datasets shaped like the scraped season files and the training catalogue."""
+
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from engine.trainer import TrainingHandler, TrainingInfo
+from utils import schema
+
+ATTRIBUTES = [f"Attribute {i}" for i in range(40)]
+
+
+def _format_counts(values: np.ndarray) -> pd.Series:
+    """Format integers like the scraped counts, e.g. "2,396"."""
+    return pd.Series(values).map("{:,}".format)
+
+
+def make_players(position: str, n: int, seed: int = 0) -> pd.DataFrame:
+    """Make the raw data of n players of a position, with every column its schema reads.
+
+    :param position: Position of the players.
+    :type position: str
+    :param n: The number of players.
+    :type n: int
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :return: The raw data, formatted as scraped ("2,396", "63%", "45.12").
+    :rtype: pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    data = {"name": [f"Player {i}" for i in range(n)]}
+    for column in schema.get_schema(position).raw_columns:
+        if column.endswith("%"):
+            data[column] = pd.Series(rng.integers(0, 101, n)).map("{}%".format)
+        elif column.lower().endswith("per match"):
+            data[column] = pd.Series(rng.uniform(5, 80, n)).map("{:.2f}".format)
+        elif column == "Passes":
+            data[column] = _format_counts(rng.integers(1, 4000, n))
+        else:
+            data[column] = _format_counts(rng.integers(0, 500, n))
+    return pd.DataFrame(data)
+
+
+def write_season(directory: str, n: int, seed: int = 0) -> List[str]:
+    """Write the raw data files of n players for every position, unless they already exist.
+
+    :param directory: The season directory.
+    :type directory: str
+    :param n: The number of players per position.
+    :type n: int
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :return: The raw data filenames.
+    :rtype: list[str]
+    """
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for i, position in enumerate(schema.get_positions()):
+        filename = os.path.join(directory, f"{position}_raw_data.csv")
+        if not os.path.exists(filename):
+            make_players(position, n, seed + i).to_csv(filename, index=False)
+        filenames.append(filename)
+    return filenames
+
+
+def make_catalogue(n: int, seed: int = 0) -> List[TrainingInfo]:
+    """Make a catalogue of n drills training 1 to 3 attributes each.
+
+    :param n: The number of drills.
+    :type n: int
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :return: A list of TrainingInfo objects.
+    :rtype: list[TrainingInfo]
+    """
+    rng = np.random.default_rng(seed)
+    positions = schema.get_positions()
+    words = ["rondo", "crossing", "1v1", "pressing", "finishing", "passing", "sprint"]
+    catalogue = []
+    for i in range(n):
+        attributes = rng.choice(ATTRIBUTES, rng.integers(1, 4), replace=False)
+        description = " ".join(rng.choice(words, 20))
+        position = positions[i % len(positions)]
+        catalogue.append(
+            TrainingInfo(f"Drill {i}", description, position, list(attributes))
+        )
+    return catalogue
+
+
+def write_catalogue(filename: str, n: int, seed: int = 0) -> str:
+    """Write a catalogue csv file of n drills, unless it already exists.
+
+    :param filename: The csv filename.
+    :type filename: str
+    :param n: The number of drills.
+    :type n: int
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :return: The filename.
+    :rtype: str
+    """
+    if not os.path.exists(filename):
+        handler = TrainingHandler()
+        handler.filename = filename
+        handler.training_list = make_catalogue(n, seed)
+        handler.save()
+    return filename
@@ -0,0 +1,294 @@
+"""Registry, timing and JSON results of the benchmarks."""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import platform
+import datetime
+import statistics
+import subprocess
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+SCALES = {
+    "small": {"players": 1_000, "drills": 1_000},
+    "medium": {"players": 100_000, "drills": 10_000},
+    "full": {"players": 1_000_000, "drills": 100_000},
+}
+MODULES = [
+    "bench_data",
+    "bench_training",
+    "bench_render",
+    "bench_planner",
+    "bench_imports",
+]
+
+Setup = Callable[["Context"], Callable[[], Any]]
+
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+@dataclass
+class Context:
+    """What a benchmark setup gets: the scale and a directory for its generated data.
+
+    :param scale: The scale name, see SCALES.
+    :type scale: str
+    :param players: The number of players per position.
+    :type players: int
+    :param drills: The number of drills in the catalogue.
+    :type drills: int
+    :param data_dir: The directory of the generated data of this scale.
+    :type data_dir: str
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    """
+
+    scale: str
+    players: int
+    drills: int
+    data_dir: str
+    seed: int = 0
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark. The decorated function does the setup and returns the function to time.
+
+    :param name: The benchmark name, e.g. "data.get_data[defender]".
+    :type name: str
+    :raises ValueError: If the name is already registered.
+    """
+
+    def decorator(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered.")
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def load_benchmarks():
+    """Import the benchmark modules, which register their benchmarks."""
+    import importlib
+
+    for module in MODULES:
+        importlib.import_module(f"{__package__}.{module}")
+
+
+def get_context(scale: str = "small", seed: int = 0) -> Context:
+    """Get the context of a scale.
+
+    :param scale: The scale name, see SCALES, defaults to "small"
+    :type scale: str, optional
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :raises ValueError: If the scale is unknown.
+    :return: The context.
+    :rtype: Context
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Invalid scale. Scale must be either {', '.join(SCALES)}")
+    data_dir = os.path.join(DATA_DIR, f"{scale}-{seed}")
+    os.makedirs(data_dir, exist_ok=True)
+    return Context(scale, data_dir=data_dir, seed=seed, **SCALES[scale])
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """Time a function, after one warm-up call. Its output is discarded.
+
+    :param fn: The function to time.
+    :type fn: Callable[[], Any]
+    :param repeat: The number of timed calls, defaults to 5
+    :type repeat: int, optional
+    :return: The min, median, mean, max and standard deviation in seconds, and repeat.
+    :rtype: dict[str, float]
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def get_metadata(scale: str) -> Dict[str, Any]:
+    """Get what identifies a run: the commit, the scale and the machine."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, False
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "scale": scale,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def run(
+    scale: str = "small", repeat: int = 5, pattern: str = None, seed: int = 0
+) -> Dict[str, Any]:
+    """Run the registered benchmarks.
+
+    :param scale: The scale name, see SCALES, defaults to "small"
+    :type scale: str, optional
+    :param repeat: The number of timed calls of each benchmark, defaults to 5
+    :type repeat: int, optional
+    :param pattern: Only run the benchmarks whose name matches this regular expression, defaults to None
+    :type pattern: str, optional
+    :param seed: The random seed, defaults to 0
+    :type seed: int, optional
+    :return: The results: {"metadata": {...}, "results": {name: timing}}.
+    :rtype: dict
+    """
+    load_benchmarks()
+    context = get_context(scale, seed)
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = setup(context)
+        results[name] = measure(fn, repeat)
+        print(f"[benchmarks]   {name:<48} {results[name]['median'] * 1000:>12.3f} ms")
+    return {"metadata": get_metadata(scale), "results": results}
+
+
+def save(results: Dict[str, Any], filename: str = None) -> str:
+    """Save the results as JSON.
+
+    :param results: The results of `run`.
+    :type results: dict
+    :param filename: The JSON file, defaults to RESULTS_DIR/<scale>-<commit>.json
+    :type filename: str, optional
+    :return: The filename.
+    :rtype: str
+    """
+    if filename is None:
+        metadata = results["metadata"]
+        commit = metadata["commit"] or "unknown"
+        if metadata["dirty"]:
+            commit += "-dirty"
+        filename = os.path.join(RESULTS_DIR, f"{metadata['scale']}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with open(filename, "w") as file:
+        json.dump(results, file, indent=2)
+    return filename
+
+
+def load(filename: str) -> Dict[str, Any]:
+    """Load results saved by `save`."""
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+def compare(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    stat: str = "median",
+    threshold: float = 0.1,
+) -> List[str]:
+    """Compare two results, benchmark by benchmark.
+
+    :param old: The baseline results.
+    :type old: dict
+    :param new: The results to compare with the baseline.
+    :type new: dict
+    :param stat: The timing compared, defaults to "median"
+    :type stat: str, optional
+    :param threshold: The relative change reported as faster or slower, defaults to 0.1
+    :type threshold: float, optional
+    :return: One line per benchmark present in both results.
+    :rtype: list[str]
+    """
+    lines = []
+    for name, timing in new["results"].items():
+        if name not in old["results"]:
+            continue
+        before, after = old["results"][name][stat], timing[stat]
+        ratio = after / before if before else float("inf")
+        if ratio < 1 - threshold:
+            verdict = "faster"
+        elif ratio > 1 + threshold:
+            verdict = "SLOWER"
+        else:
+            verdict = ""
+        lines.append(
+            f"{name:<48} {before * 1000:>12.3f} {after * 1000:>12.3f} {ratio:>7.2f}x {verdict}"
+        )
+    return lines
+
+
+def main(argv: List[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--scale", choices=list(SCALES), default="small")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "-k", dest="pattern", help="Only run the benchmarks matching this regex."
+    )
+    run_parser.add_argument("-o", dest="output", help="The JSON results file.")
+    list_parser = commands.add_parser("list", help="List the benchmarks.")
+    list_parser.add_argument("-k", dest="pattern")
+    compare_parser = commands.add_parser("compare", help="Compare two results.")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--stat", default="median")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.scale, args.repeat, args.pattern, args.seed)
+        print(f"[benchmarks]   Results saved to {save(results, args.output)}")
+    elif args.command == "list":
+        load_benchmarks()
+        for name in BENCHMARKS:
+            if not args.pattern or re.search(args.pattern, name):
+                print(name)
+    else:
+        old, new = load(args.old), load(args.new)
+        print(f"{'benchmark':<48} {'old ms':>12} {'new ms':>12} {'ratio':>8}")
+        for line in compare(old, new, args.stat, args.threshold):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
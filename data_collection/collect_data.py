@@ -1,9 +1,12 @@
 import os
 import sys
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from rich.console import Console
 
 from . import scrapper
+from utils import columnar
+from utils import parser
 
 console = Console()
 print = console.print
@@ -24,9 +27,26 @@ def process_collection(position_name, season, save_to):
     print(df.head())
     filename = os.path.join(save_to, f"{position_name}_raw_data.csv")
     df.to_csv(filename, index=False)
+    reports = {}
+    columnar.write_columnar(df, columnar.get_columnar_location(filename), reports)
+    for line in parser.format_report(reports).splitlines():
+        print(f"[yellow]Invalid values[/yellow] {line}")
 
 
-def collect_data(season: str, save_to: str = None, position: str = None):
+def collect_data(
+    season: str, save_to: str = None, position: str = None, workers: int = 1
+):
+    """Scrape and save the data of a season, one position after the other or in parallel.
+
+    :param season: The season, e.g. "2022/23"
+    :type season: str
+    :param save_to: The output directory, defaults to the season directory of DATA_DIR
+    :type save_to: str, optional
+    :param position: The position to collect, defaults to None for every position
+    :type position: str, optional
+    :param workers: The number of processes, each scraping one position, defaults to 1. See `data_collection.pipeline` to process several seasons.
+    :type workers: int, optional
+    """
     if save_to is None:
         _data_dir = os.path.join(DATA_DIR, season.replace("/", "-"))
     else:
@@ -38,9 +58,19 @@ def collect_data(season: str, save_to: str = None, position: str = None):
         to_collect = ["defender", "midfielder", "goalkeeper", "forward"]
     else:
         to_collect = [position]
-    for position_name in to_collect:
-        print(f"Processing data collection for {position_name}...")
-        process_collection(position_name, season, _data_dir)
+    if workers > 1 and len(to_collect) > 1:
+        print(f"Processing data collection for {', '.join(to_collect)}...")
+        with ProcessPoolExecutor(max_workers=min(workers, len(to_collect))) as executor:
+            futures = [
+                executor.submit(process_collection, p, season, _data_dir)
+                for p in to_collect
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for position_name in to_collect:
+            print(f"Processing data collection for {position_name}...")
+            process_collection(position_name, season, _data_dir)
     print("All process complete!", style="bold green")
 
 
@@ -1,63 +1,23 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-goalkeeper_data = [
-    "Saves",
-    "Penalties Saved",
-    "Punches",
-    "Catches",
-    "Sweeper clearances",
-    "Goal Kicks",
-    "Clean sheets",
-    "Passes",
-    "Passes per match",
-]
+from utils import schema
 
-defender_data = [
-    "Tackle success %",
-    "Clearances",
-    "Headed Clearance",
-    "Duels won",
-    "Duels lost",
-    "Aerial battles won",
-    "Aerial battles lost",
-    "Cross accuracy %",
-    "Passes",
-    "Passes per match",
-]
 
-midfielder_data = [
-    "Goals",
-    "Headed goals",
-    "Goals with right foot",
-    "Goals with left foot",
-    "Shooting accuracy %",
-    "Cross accuracy %",
-    "Tackle success %",
-    "Duels won",
-    "Duels lost",
-    "Aerial battles won",
-    "Aerial battles lost",
-    "Passes",
-    "Passes per match",
-]
+def get_data_model(position: str) -> list[str] | None:
+    """Get the stats to scrape for a position: the columns read by its schema, see `utils.schema`.
 
-forward_data = [
-    "Goals",
-    "Headed goals",
-    "Goals with right foot",
-    "Goals with left foot",
-    "Shooting accuracy %",
-    "Passes",
-    "Passes per match",
-]
+    :param position: Position of the player.
+    :type position: str
+    :return: A list of stat names, or None to scrape every stat if the position has no schema.
+    :rtype: list[str] | None
+    """
+    if position.lower() not in schema.get_positions():
+        return None
+    return schema.get_schema(position).raw_columns
 
-data_model = {
-    "defender": defender_data,
-    "forward": forward_data,
-    "midfielder": midfielder_data,
-    "goalkeeper": goalkeeper_data,
-}
+
+data_model = {position: get_data_model(position) for position in schema.get_positions()}
 
 
 class DataExtractor:
@@ -0,0 +1,242 @@
+"""Rebuild the data of many seasons and positions in parallel.
+
+Each (season, position) unit is independent: a worker process parses the raw csv file into the
+columnar file (see `utils.columnar`), processes it with the processor of the position and writes the
+benchmark store with its sorted columns, the empirical CDFs used to normalize and score players
+(see `utils.store`). A full historical rebuild then scales with the number of cores instead of
+walking every season and position in turn.
+
+Usage::
+
+    python -m data_collection.pipeline [--root data] [--seasons 2022-23 data_new] [--positions defender] [--workers 4] [--rebuild] [--collect]
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
+
+from engine.benchmark import is_season, season_key
+from utils import columnar
+from utils import datahandler
+from utils import schema
+
+Unit = Tuple[str, str]
+
+
+@dataclass
+class UnitResult:
+    """The outcome of a (season, position) unit.
+
+    :param season: The season directory name.
+    :type season: str
+    :param position: Position of the players.
+    :type position: str
+    :param rows: The number of players processed.
+    :type rows: int
+    :param seconds: The time spent by the worker.
+    :type seconds: float
+    :param written: The written filenames.
+    :type written: list[str]
+    :param error: Why the unit was skipped, None if it succeeded.
+    :type error: str | None
+    """
+
+    season: str
+    position: str
+    rows: int = 0
+    seconds: float = 0.0
+    written: List[str] = field(default_factory=list)
+    error: str = None
+
+
+def get_source(season: str, position: str, root: str = "data") -> str:
+    """Get the raw csv file of a unit, see `utils.datahandler.get_file_location`."""
+    return os.path.join(root, season, f"{position.lower()}_raw_data.csv")
+
+
+def get_units(
+    root: str = "data", seasons: Iterable[str] = None, positions: Iterable[str] = None
+) -> List[Unit]:
+    """List the (season, position) units to process.
+
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :param seasons: The season directories, defaults to every directory of root with data
+    :type seasons: Iterable[str], optional
+    :param positions: The positions, defaults to every position of `utils.schema`
+    :type positions: Iterable[str], optional
+    :return: The units, oldest season first when seasons is not given.
+    :rtype: list[tuple[str, str]]
+    """
+    positions = [p.lower() for p in positions or schema.get_positions()]
+    if seasons is None:
+        seasons = []
+        if os.path.isdir(root):
+            seasons = sorted(
+                (s for s in os.listdir(root) if os.path.isdir(os.path.join(root, s))),
+                key=season_key,
+            )
+        return [
+            (season, position)
+            for season in seasons
+            for position in positions
+            if os.path.exists(get_source(season, position, root))
+            or columnar.is_up_to_date(get_source(season, position, root))
+        ]
+    return [(season, position) for season in seasons for position in positions]
+
+
+def process_unit(
+    season: str,
+    position: str,
+    root: str = "data",
+    rebuild: bool = False,
+    collect: bool = False,
+) -> UnitResult:
+    """Parse, process and write the benchmark store of one season and position. Each step is skipped if its output is up to date.
+
+    :param season: The season directory name, e.g. "2022-23"
+    :type season: str
+    :param position: Position of the players.
+    :type position: str
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :param rebuild: If True, always rewrite the columnar file and the store, defaults to False
+    :type rebuild: bool, optional
+    :param collect: If True, scrape the data when there is none, see `data_collection.collect_data`. Only seasons such as "2022-23" are scraped. Defaults to False
+    :type collect: bool, optional
+    :return: The outcome of the unit. Any error is kept in `UnitResult.error`, it never stops the other units.
+    :rtype: UnitResult
+    """
+    start = time.perf_counter()
+    result = UnitResult(season, position)
+    source = get_source(season, position, root)
+    try:
+        if not (os.path.exists(source) or columnar.is_up_to_date(source)):
+            if not collect:
+                result.error = f"{source} does not exist"
+                return result
+            if not is_season(season):
+                result.error = f"{season} is not a season, it cannot be collected"
+                return result
+            # NOTE: Imported here, the scrapper pulls in selenium and rich.
+            from .collect_data import process_collection
+
+            directory = os.path.dirname(source)
+            process_collection(position, season.replace("-", "/"), directory)
+            result.written += [source, columnar.get_columnar_location(source)]
+
+        if os.path.exists(source) and (rebuild or not columnar.is_up_to_date(source)):
+            result.written += columnar.convert_csv(source)
+        store = datahandler.get_benchmark_store(
+            position, season=season, rebuild=rebuild, root=root
+        )
+    except Exception as e:
+        # NOTE: Any failure, e.g. a locked or corrupted file, only skips this unit.
+        result.error = f"{type(e).__name__} {e}"
+    else:
+        result.rows = len(store.values)
+        result.written.append(store.filename)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run(
+    units: Iterable[Unit],
+    root: str = "data",
+    workers: int = None,
+    rebuild: bool = False,
+    collect: bool = False,
+) -> List[UnitResult]:
+    """Process units in parallel, see `process_unit`.
+
+    :param units: The (season, position) units, see `get_units`.
+    :type units: Iterable[tuple[str, str]]
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :param workers: The number of processes, defaults to the number of CPUs. With 1, the units are processed in this process.
+    :type workers: int, optional
+    :param rebuild: If True, always rewrite the columnar files and the stores, defaults to False
+    :type rebuild: bool, optional
+    :param collect: If True, scrape the units without data, defaults to False
+    :type collect: bool, optional
+    :return: The outcome of every unit, in the order of units.
+    :rtype: list[UnitResult]
+    """
+    units = list(units)
+    workers = min(workers or os.cpu_count() or 1, max(len(units), 1))
+    if workers == 1:
+        results = []
+        for season, position in units:
+            results.append(process_unit(season, position, root, rebuild, collect))
+            _report(results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_unit, season, position, root, rebuild, collect): i
+            for i, (season, position) in enumerate(units)
+        }
+        results = [None] * len(units)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # NOTE: The worker process died, e.g. out of memory.
+                results[i] = UnitResult(*units[i], error=f"{type(e).__name__} {e}")
+            _report(results[i])
+    return results
+
+
+def _report(result: UnitResult):
+    if result.error is not None:
+        print(
+            f"[pipeline]   Skipped {result.position} in {result.season}: {result.error}"
+        )
+        return
+    print(
+        f"[pipeline]   {result.season} {result.position}: {result.rows} players in {result.seconds:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default="data", help="The data directory.")
+    parser.add_argument(
+        "--seasons", nargs="+", help="The season directories, defaults to all."
+    )
+    parser.add_argument(
+        "--positions",
+        nargs="+",
+        choices=schema.get_positions(),
+        help="The positions, defaults to all.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of processes, defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Rewrite the up to date files too."
+    )
+    parser.add_argument(
+        "--collect", action="store_true", help="Scrape the units without data."
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    units = get_units(args.root, args.seasons, args.positions)
+    results = run(units, args.root, args.workers, args.rebuild, args.collect)
+    failed = sum(result.error is not None for result in results)
+    print(
+        f"[pipeline]   Processed {len(results) - failed}/{len(results)} units in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
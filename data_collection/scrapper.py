@@ -144,7 +144,7 @@ def collect_data(
             By.XPATH, "./html/body/main/div[3]/div/div/div[2]/div/div/ul"
         )
         dmodel = model.DataExtractor(data_table)
-        data = dmodel.get_stats(model.data_model.get(position.lower(), None))
+        data = dmodel.get_stats(model.get_data_model(position))
 
         print(f"Process Complete for [green]{player['name']}[/green]")
         print(data)
@@ -0,0 +1,254 @@
+import os
+import re
+from bisect import insort
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from utils import columnar
+from utils import datahandler
+from utils import schema
+from utils.stats import BenchmarkAggregator
+
+_SEASON_PATTERN = re.compile(r"^(\d{4})[-/](\d{2})$")
+
+_engines: Dict[str, "BenchmarkEngine"] = {}
+
+
+def is_season(name: str) -> bool:
+    """Check if a directory name is a season such as "2022-23" or "2022/23", and not e.g. "data_new".
+
+    :param name: The directory name.
+    :type name: str
+    :return: True if name is a season.
+    :rtype: bool
+    """
+    return _SEASON_PATTERN.match(name) is not None
+
+
+def season_key(season: str) -> Tuple[int, int, str]:
+    """Sort key of a season directory name. Seasons such as "2022-23" are ordered by year after every other directory name, which are ordered alphabetically.
+
+    :param season: The season directory name.
+    :type season: str
+    :return: A sort key.
+    :rtype: tuple[int, int, str]
+    """
+    match = _SEASON_PATTERN.match(season)
+    if match is None:
+        return (0, 0, season)
+    return (1, int(match.group(1)), season)
+
+
+class BenchmarkEngine:
+    """Season-aware benchmarks of every position in every season directory under `root`.
+
+    The benchmark of each (season, position) is aggregated once, from the shared benchmark store,
+    and kept together with the per-attribute trends across seasons, so both queries are dictionary
+    lookups. A position is only loaded the first time it is queried, and calling `refresh` only
+    loads the seasons that are new or changed since the last call.
+
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    """
+
+    def __init__(self, root: str = "data"):
+        self.root = root
+        self._benchmarks: Dict[Tuple[str, str], Dict[str, Dict[str, float]]] = {}
+        self._signatures: Dict[Tuple[str, str], float] = {}
+        self._trends: Dict[Tuple[str, str], List[Tuple[Tuple, str, Dict]]] = {}
+        self._seasons: List[str] = []
+        self._positions: Set[str] = set()
+
+    def refresh(self, positions: Iterable[str] = None) -> List[Tuple[str, str]]:
+        """Index the season directories and load the (season, position) data that is new or changed.
+
+        :param positions: The positions to load, defaults to the positions loaded so far.
+        :type positions: Iterable[str], optional
+        :return: A list of the (season, position) pairs loaded by this call.
+        :rtype: list[tuple[str, str]]
+        """
+        if positions is None:
+            positions = list(self._positions)
+        positions = [p.lower() for p in positions]
+        self._positions.update(positions)
+        return self._refresh(self._discover(positions))
+
+    def _refresh(self, found: List[Tuple[str, str, str]]) -> List[Tuple[str, str]]:
+        """Load the (season, position, source file) that are new or changed, see `refresh`."""
+        loaded = []
+        for season, position, source in found:
+            key = (season, position)
+            signature = self._get_signature(source)
+            if self._signatures.get(key) == signature:
+                continue
+            self._signatures[key] = signature
+            if self._load(season, position):
+                loaded.append(key)
+        return loaded
+
+    def get_seasons(self, position: str = None) -> List[str]:
+        """Get the seasons with a benchmark, oldest first. See `season_key` for the order.
+
+        :param position: If given, only the seasons having a benchmark for this position, defaults to None
+        :type position: str, optional
+        :return: List of season names. Without position, only the seasons of the positions loaded so far.
+        :rtype: list[str]
+        """
+        if position is None:
+            return list(self._seasons)
+        position = self._require(position)
+        return [s for s in self._seasons if (s, position) in self._benchmarks]
+
+    def latest_season(self, position: str) -> Union[str, None]:
+        """Get the current season if it has a benchmark for position, else the latest season that has one.
+
+        :param position: Position of the player.
+        :type position: str
+        :return: The season name, or None if no season has a benchmark for position.
+        :rtype: str | None
+        """
+        current = datahandler.get_current_season().replace("/", "-")
+        if self.has_benchmark(position, current):
+            return current
+        seasons = self.get_seasons(position)
+        return seasons[-1] if seasons else None
+
+    def resolve_season(self, position: str, season: str = None) -> str:
+        """Get season if it has a benchmark for position, otherwise fall back to `latest_season`.
+
+        :param position: Position of the player.
+        :type position: str
+        :param season: The preferred season, defaults to None
+        :type season: str, optional
+        :raises ValueError: If no season has a benchmark for position.
+        :return: The season name.
+        :rtype: str
+        """
+        if season is not None and self.has_benchmark(position, season):
+            return season
+        latest = self.latest_season(position)
+        if latest is None:
+            raise ValueError(f"No benchmark for {position}")
+        return latest
+
+    def has_benchmark(self, position: str, season: str) -> bool:
+        """Check if a benchmark exists for position in season.
+
+        :param position: Position of the player.
+        :type position: str
+        :param season: The season name.
+        :type season: str
+        :return: True if a benchmark exists.
+        :rtype: bool
+        """
+        position = position.lower()
+        if position not in self._positions:
+            # NOTE: Only load this season, the other seasons are loaded if the position is queried.
+            self._refresh(self._discover([position], [season]))
+        return (season, position) in self._benchmarks
+
+    def benchmark(self, position: str, season: str) -> Dict[str, Dict[str, float]]:
+        """Get the benchmark of a position in a season.
+
+        :param position: Position of the player.
+        :type position: str
+        :param season: The season name.
+        :type season: str
+        :raises KeyError: If there is no benchmark for position in season.
+        :return: A dictionary of attribute name to its summary, see `utils.stats.AttributeSummary.get`.
+        :rtype: dict[str, dict[str, float]]
+        """
+        key = (season, self._require(position))
+        if key not in self._benchmarks:
+            raise KeyError(f"No benchmark for {position} in season {season}.")
+        return self._benchmarks[key]
+
+    def trend(
+        self, attribute: str, position: str, stat: str = "mean"
+    ) -> List[Tuple[str, float]]:
+        """Get the trend of an attribute of a position across the seasons.
+
+        :param attribute: The attribute name.
+        :type attribute: str
+        :param position: Position of the player.
+        :type position: str
+        :param stat: The summary value to follow, e.g. "mean", "p50" or "max", defaults to "mean"
+        :type stat: str, optional
+        :return: A list of (season, value), oldest season first. Empty if the attribute is unknown.
+        :rtype: list[tuple[str, float]]
+        """
+        series = self._trends.get((self._require(position), attribute), [])
+        return [(season, summary[stat]) for _, season, summary in series]
+
+    def _require(self, position: str) -> str:
+        """Load position the first time it is queried. Return the lower case position."""
+        position = position.lower()
+        if position not in self._positions:
+            self.refresh([position])
+        return position
+
+    def _discover(
+        self, positions: List[str], seasons: List[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """List the (season, position, source file) of the positions in the seasons, every season directory by default."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        positions = [p for p in schema.get_positions() if p in positions]
+        if seasons is None:
+            seasons = os.listdir(self.root)
+        for season in sorted(seasons, key=season_key):
+            for position in positions:
+                source = os.path.join(self.root, season, f"{position}_raw_data.csv")
+                if os.path.exists(source) or columnar.is_up_to_date(source):
+                    found.append((season, position, source))
+        return found
+
+    def _get_signature(self, source: str) -> float:
+        """Get the modification time of the newest existing source file."""
+        sources = [source, columnar.get_columnar_location(source)]
+        return max(os.path.getmtime(f) for f in sources if os.path.exists(f))
+
+    def _load(self, season: str, position: str) -> bool:
+        """Aggregate the benchmark of a (season, position) and update the trends.
+
+        :return: True if the benchmark was loaded, False if the data could not be processed.
+        :rtype: bool
+        """
+        try:
+            store = datahandler.get_benchmark_store(
+                position, season=season, root=self.root
+            )
+        except (KeyError, ValueError, ZeroDivisionError) as e:
+            print(
+                f"[BenchmarkEngine]   Skipped {position} in {season}: {type(e).__name__} {e}"
+            )
+            return False
+
+        aggregator = BenchmarkAggregator()
+        aggregator.push_columns({attr: store.column(attr) for attr in store.attributes})
+        benchmark = aggregator.get()
+        self._benchmarks[(season, position)] = benchmark
+        if season not in self._seasons:
+            insort(self._seasons, season, key=season_key)
+
+        for attr, summary in benchmark.items():
+            series = self._trends.setdefault((position, attr), [])
+            series[:] = [item for item in series if item[1] != season]
+            insort(series, (season_key(season), season, summary), key=lambda i: i[0])
+        return True
+
+
+def get_engine(root: str = "data") -> BenchmarkEngine:
+    """Get the benchmark engine of a data directory. The engine is created once per process and refreshed on every call, which only loads the new or changed seasons of the positions queried so far.
+
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :return: The benchmark engine.
+    :rtype: BenchmarkEngine
+    """
+    engine = _engines.get(root)
+    if engine is None:
+        engine = _engines[root] = BenchmarkEngine(root)
+    else:
+        engine.refresh()
+    return engine
@@ -0,0 +1,254 @@
+"""SQLite storage backend for the training catalogue.
+
+Usage::
+
+    python -m engine.database import data/training/training_01.csv data/training/training_01.db
+    python -m engine.database export data/training/training_01.db data/training/training_01.csv
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import argparse
+from typing import Union, List, Tuple
+
+from .trainer import TrainingHandler, TrainingInfo, get_input_fields
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS training (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    position TEXT NOT NULL,
+    attributes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attribute (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS training_attribute (
+    attribute_id INTEGER NOT NULL REFERENCES attribute(id),
+    training_id INTEGER NOT NULL REFERENCES training(id),
+    PRIMARY KEY (attribute_id, training_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS training_position_idx ON training(position);
+CREATE INDEX IF NOT EXISTS training_attribute_training_idx ON training_attribute(training_id);
+"""
+
+
+class SQLiteTrainingHandler(TrainingHandler):
+    """TrainingHandler storing the trainings in a SQLite database instead of a csv file.
+
+    Nothing is loaded at startup. `retrieve` is an indexed query on the position and on the
+    attribute junction table, and `add_training_info` is a single insert. The database runs in WAL
+    mode so several processes can share it. `training_list` is read once and kept up to date by
+    `add_training_info`, call `load` again to see the trainings added by other processes.
+    """
+
+    def __init__(self, filename: str = None):
+        """Initialize the SQLiteTrainingHandler.
+
+        :param filename: A SQLite database file, defaults to None
+        :type filename: str, optional
+        """
+        self._connection = None
+        self._training_list = None
+        super().__init__(filename)
+
+    @property
+    def training_list(self) -> List[TrainingInfo]:
+        """All the trainings of the database, in insertion order."""
+        if self._connection is None:
+            return []
+        if self._training_list is None:
+            rows = self._connection.execute(
+                "SELECT name, description, position, attributes FROM training ORDER BY id"
+            )
+            self._training_list = [self._to_training_info(row) for row in rows]
+        return self._training_list
+
+    @training_list.setter
+    def training_list(self, value: List[TrainingInfo]):
+        # NOTE: TrainingHandler.__init__ resets the list. The database is the only storage here.
+        if value:
+            raise AttributeError("Use add_training_info to add trainings.")
+
+    def load(self, filename: str):
+        """Open the database, creating it if it does not exist.
+
+        :param filename: The name of the database file to open.
+        :type filename: str
+        """
+        self.filename = filename
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = sqlite3.connect(self.filename)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._training_list = None
+        self._search_index = None
+        print("[TrainingHandler]   Database Opened")
+
+    def save(self):
+        """Commit the pending trainings into the database.
+
+        :raises Exception: If no file is loaded, raises an exception.
+        """
+        if self._connection is None:
+            raise Exception(
+                "Could not save because TrainingHandler does not load any file yet."
+            )
+        self._connection.commit()
+        count = self._connection.execute("SELECT COUNT(*) FROM training").fetchone()[0]
+        self._save_search_index()
+        print(f"[TrainingHandler]   Successfully save all {count} training info")
+
+    def compact(self):
+        """Commit the pending trainings, there is no journal to merge."""
+        self.save()
+
+    def add_training_info(self, new_training: TrainingInfo, save=False):
+        """Insert training information into the database.
+
+        :param new_training: A TrainingInfo object.
+        :type new_training: TrainingInfo
+        :param save: If true, commit the insert right away, defaults to False
+        :type save: bool, optional
+        """
+        if self._connection is None:
+            raise Exception(
+                "Could not add training because TrainingHandler does not load any file yet."
+            )
+        data = new_training.get()
+        cursor = self._connection.execute(
+            "INSERT INTO training (name, description, position, attributes) VALUES (?, ?, ?, ?)",
+            (
+                data["name"],
+                data["description"],
+                data["position"],
+                json.dumps(data["attributes"]),
+            ),
+        )
+        training_id = cursor.lastrowid
+        for attr in {a.strip().lower() for a in new_training.attributes if a.strip()}:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO attribute (name) VALUES (?)", (attr,)
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO training_attribute (attribute_id, training_id) "
+                "SELECT id, ? FROM attribute WHERE name = ?",
+                (training_id, attr),
+            )
+        if self._training_list is not None:
+            self._training_list.append(new_training)
+        self._index_training(new_training)
+        if save:
+            self._connection.commit()
+
+    def retrieve(
+        self,
+        attributes: Union[str, List[str], Tuple[str]],
+        position: str = None,
+    ) -> Union[List[TrainingInfo], None]:
+        """Retrieve the training information base on the given attributes. See `TrainingHandler.retrieve`.
+
+        :param attributes: A single attribute string or  a list of attributes to retrieve the training information.
+        :type attributes: str | list[str] | tuple[str]
+        :param position: Optional filter to retrieve the training information, defaults to None
+        :type position: str, optional
+        :raises TypeError: If argument attributes is not a list or tuple.
+        :return: A list of TrainingInfo objects based on the attributes/position filters. Return None if no training info found.
+        :rtype: list[TrainingInfo] | None
+        """
+        if type(attributes) == str:
+            attributes = [attributes]
+
+        if type(attributes) not in [list, tuple]:
+            raise TypeError("attributes must be list or tuple")
+
+        if (
+            self._connection is None
+            or not self._connection.execute("SELECT 1 FROM training LIMIT 1").fetchone()
+        ):
+            return
+
+        query = (
+            "SELECT t.name, t.description, t.position, t.attributes "
+            "FROM attribute a "
+            "JOIN training_attribute ta ON ta.attribute_id = a.id "
+            "JOIN training t ON t.id = ta.training_id "
+            "WHERE a.name = ?"
+        )
+        if position is not None:
+            query += " AND t.position = ?"
+        query += " ORDER BY t.id"
+
+        filtered_info = []
+        done = set()
+        for attr in attributes:
+            params = (attr.strip().lower(),)
+            if position is not None:
+                params += (position.lower(),)
+            for row in self._connection.execute(query, params):
+                if row[0] in done:
+                    continue
+                done.add(row[0])
+                filtered_info.append(self._to_training_info(row))
+        return filtered_info
+
+    def import_csv(self, filename: str):
+        """Insert every training of a csv catalogue into the database.
+
+        :param filename: The csv file to import.
+        :type filename: str
+        """
+        with open(filename, "r", newline="") as file:
+            reader = csv.DictReader(file)
+            for training in reader:
+                self.add_training_info(TrainingInfo(**training))
+        self.save()
+
+    def export_csv(self, filename: str):
+        """Write every training of the database into a csv catalogue.
+
+        :param filename: The csv file to write.
+        :type filename: str
+        """
+        with open(filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, get_input_fields())
+            writer.writeheader()
+            writer.writerows([training.get() for training in self.training_list])
+
+    def close(self):
+        """Commit and close the database."""
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+            self._training_list = None
+
+    def _to_training_info(self, row: Tuple[str, str, str, str]) -> TrainingInfo:
+        name, description, position, attributes = row
+        return TrainingInfo(name, description, position, json.loads(attributes))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import or export the training catalogue between csv and SQLite."
+    )
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        handler = SQLiteTrainingHandler(args.target)
+        handler.import_csv(args.source)
+    else:
+        handler = SQLiteTrainingHandler(args.source)
+        handler.export_csv(args.target)
+    handler.close()
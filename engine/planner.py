@@ -0,0 +1,375 @@
+"""Weekly training plan optimizer.
+
+A plan is a set of drills spread over the sessions of a week. Its value is the deficit it covers:
+each weak attribute adds its deficit * min(times trained, repetitions) / repetitions, so training
+an attribute more than `repetitions` times brings nothing. This value has diminishing returns,
+which makes the lazy greedy search below a good approximation. Small instances are solved exactly
+with a dynamic programming over the covered attributes and the minutes left in each session.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Union
+
+DEFAULT_MINUTES = 15
+EXACT_LIMIT = 16
+
+Deficits = Union[Dict[str, float], List[Dict[str, float]]]
+
+
+@dataclass
+class WeeklyPlan:
+    """A weekly plan.
+
+    :param sessions: The drills of each session.
+    :type sessions: list[list[TrainingInfo]]
+    :param value: The total deficit covered.
+    :type value: float
+    :param covered: The deficit covered for each attribute.
+    :type covered: dict[str, float]
+    :param method: The solver used, "greedy" or "exact".
+    :type method: str
+    :param minutes: The minutes used in each session.
+    :type minutes: list[int]
+    """
+
+    sessions: List[List[Any]]
+    value: float = 0.0
+    covered: Dict[str, float] = field(default_factory=dict)
+    method: str = "greedy"
+    minutes: List[int] = field(default_factory=list)
+
+    def get_drills(self) -> List[Any]:
+        """Get the drills of the plan, each listed once, in session order.
+
+        :return: A list of TrainingInfo objects.
+        :rtype: list[TrainingInfo]
+        """
+        result = []
+        done = set()
+        for session in self.sessions:
+            for info in session:
+                if info.name not in done:
+                    done.add(info.name)
+                    result.append(info)
+        return result
+
+
+def get_total_deficits(deficits: Deficits) -> Dict[str, float]:
+    """Sum the positive deficits of one player or of a whole squad. Attributes are case insensitive.
+
+    :param deficits: A dictionary of attribute name and deficit, or a list of them (one per player).
+    :type deficits: dict[str, float] | list[dict[str, float]]
+    :return: A dictionary of lower case attribute name and total deficit.
+    :rtype: dict[str, float]
+    """
+    if isinstance(deficits, dict):
+        deficits = [deficits]
+    total: Dict[str, float] = {}
+    for player in deficits:
+        for attr, deficit in player.items():
+            if deficit > 0:
+                key = attr.strip().lower()
+                total[key] = total.get(key, 0.0) + float(deficit)
+    return total
+
+
+class _Drill:
+    """A candidate drill: the first training of a name with the attributes of every training with that name."""
+
+    __slots__ = ("info", "attrs", "minutes")
+
+    def __init__(self, info: Any, attrs: List[int], minutes: int):
+        self.info = info
+        self.attrs = attrs
+        self.minutes = minutes
+
+
+class _Schedule:
+    """The sessions being filled, first fit. A drill is played at most once per session."""
+
+    def __init__(self, sessions: int, session_minutes: int):
+        self.session_minutes = session_minutes
+        self.sessions: List[List[Any]] = [[] for _ in range(sessions)]
+        self.remaining = [session_minutes] * sessions
+        self.names: List[set] = [set() for _ in range(sessions)]
+
+    def find(self, drill: _Drill) -> int:
+        for i, remaining in enumerate(self.remaining):
+            if remaining >= drill.minutes and drill.info.name not in self.names[i]:
+                return i
+        return -1
+
+    def add(self, drill: _Drill, i: int):
+        self.sessions[i].append(drill.info)
+        self.remaining[i] -= drill.minutes
+        self.names[i].add(drill.info.name)
+
+    def get_plan(self) -> WeeklyPlan:
+        minutes = [self.session_minutes - r for r in self.remaining]
+        return WeeklyPlan(self.sessions, minutes=minutes)
+
+
+def plan_week(
+    training_list: List[Any],
+    deficits: Deficits,
+    session_minutes: int = 90,
+    sessions: int = 3,
+    minutes: Dict[str, int] = None,
+    max_repeats: int = 1,
+    repetitions: int = 1,
+    method: str = "auto",
+) -> WeeklyPlan:
+    """Choose the drills of a week maximizing the deficit covered.
+
+    :param training_list: The candidate TrainingInfo objects, e.g. the trainings of a position.
+    :type training_list: list[TrainingInfo]
+    :param deficits: The deficits of a player or of a squad, see `get_total_deficits`.
+    :type deficits: dict[str, float] | list[dict[str, float]]
+    :param session_minutes: The length of a session, defaults to 90
+    :type session_minutes: int, optional
+    :param sessions: The number of sessions in the week, defaults to 3
+    :type sessions: int, optional
+    :param minutes: The length of each drill by name, defaults to DEFAULT_MINUTES for every drill.
+    :type minutes: dict[str, int], optional
+    :param max_repeats: The maximum number of sessions a drill is played in, defaults to 1
+    :type max_repeats: int, optional
+    :param repetitions: The number of times a weak attribute should be trained in the week, defaults to 1
+    :type repetitions: int, optional
+    :param method: "auto", "greedy" or "exact". "auto" is exact for at most EXACT_LIMIT candidate drills (repeats included), defaults to "auto"
+    :type method: str, optional
+    :raises ValueError: If method is invalid.
+    :return: The plan.
+    :rtype: WeeklyPlan
+    """
+    if method not in ["auto", "greedy", "exact"]:
+        raise ValueError("method must be either auto, greedy or exact")
+    total = get_total_deficits(deficits)
+    attributes = list(total)
+    weights = [total[attr] / repetitions for attr in attributes]
+    attr_ids = {attr: i for i, attr in enumerate(attributes)}
+    minutes = minutes or {}
+    max_repeats = min(max_repeats, sessions)
+
+    drills: Dict[str, _Drill] = {}
+    for info in training_list:
+        attrs = {attr_ids.get(a.strip().lower()) for a in info.attributes} - {None}
+        length = minutes.get(info.name, DEFAULT_MINUTES)
+        if not attrs or length > session_minutes:
+            continue
+        drill = drills.get(info.name)
+        if drill is None:
+            drills[info.name] = _Drill(info, sorted(attrs), length)
+        else:
+            drill.attrs = sorted(attrs.union(drill.attrs))
+    candidates = list(drills.values())
+
+    if method == "auto":
+        items = len(candidates) * max_repeats
+        method = "exact" if items <= EXACT_LIMIT else "greedy"
+
+    if method == "exact":
+        plan = _solve_exact(
+            candidates, weights, sessions, session_minutes, max_repeats, repetitions
+        )
+    else:
+        plan = _solve_greedy(
+            candidates, weights, sessions, session_minutes, max_repeats, repetitions
+        )
+
+    trained = [0] * len(attributes)
+    for session in plan.sessions:
+        for info in session:
+            for a in drills[info.name].attrs:
+                trained[a] += 1
+    plan.covered = {
+        attr: weights[a] * min(trained[a], repetitions)
+        for a, attr in enumerate(attributes)
+        if trained[a]
+    }
+    plan.value = sum(plan.covered.values())
+    plan.method = method
+    return plan
+
+
+def _gain(drill: _Drill, trained: List[int], weights: List[float], repetitions: int):
+    return sum(weights[a] for a in drill.attrs if trained[a] < repetitions)
+
+
+def _solve_greedy(
+    candidates: List[_Drill],
+    weights: List[float],
+    sessions: int,
+    session_minutes: int,
+    max_repeats: int,
+    repetitions: int,
+) -> WeeklyPlan:
+    """Lazy greedy by covered deficit per minute. Gains only decrease as the plan grows, so a stale gain is an upper bound and only the top of the heap is re-evaluated."""
+    schedule = _Schedule(sessions, session_minutes)
+    trained = [0] * len(weights)
+    used = [0] * len(candidates)
+    heap = [
+        (-_gain(d, trained, weights, repetitions) / d.minutes, i)
+        for i, d in enumerate(candidates)
+    ]
+    heapq.heapify(heap)
+    while heap:
+        _, i = heapq.heappop(heap)
+        drill = candidates[i]
+        ratio = _gain(drill, trained, weights, repetitions) / drill.minutes
+        if ratio <= 0:
+            continue
+        if heap and ratio < -heap[0][0]:
+            heapq.heappush(heap, (-ratio, i))
+            continue
+        session = schedule.find(drill)
+        if session < 0:
+            continue
+        schedule.add(drill, session)
+        used[i] += 1
+        for a in drill.attrs:
+            trained[a] += 1
+        if used[i] < max_repeats:
+            heapq.heappush(heap, (-ratio, i))
+
+    value = sum(weights[a] * min(t, repetitions) for a, t in enumerate(trained) if t)
+    # NOTE: Greedy by ratio can miss a single long drill worth more than the whole plan.
+    untrained = [0] * len(weights)
+    best = max(
+        candidates,
+        key=lambda d: _gain(d, untrained, weights, repetitions),
+        default=None,
+    )
+    if best is not None and _gain(best, untrained, weights, repetitions) > value:
+        schedule = _Schedule(sessions, session_minutes)
+        schedule.add(best, 0)
+    return schedule.get_plan()
+
+
+def _solve_exact(
+    candidates: List[_Drill],
+    weights: List[float],
+    sessions: int,
+    session_minutes: int,
+    max_repeats: int,
+    repetitions: int,
+) -> WeeklyPlan:
+    """Dynamic programming over the number of times each attribute is trained (capped at repetitions). Each drill is put in up to max_repeats different sessions, so every state is a plan that fits. A state keeps the minutes left in each session of every plan not dominated by another, sorted so plans filling the sessions alike are kept once.
+
+    The states that cannot beat the best plan found so far are dropped, see `_upper_bound`.
+    """
+    Front = List[Tuple[Tuple[int, ...], Tuple[Tuple[int, ...], ...]]]
+    states: Dict[Tuple[int, ...], Front] = {
+        (0,) * len(weights): [((session_minutes,) * sessions, ((),) * sessions)]
+    }
+
+    def value(trained):
+        return sum(w * t for w, t in zip(weights, trained))
+
+    gains = [sum(weights[a] for a in drill.attrs) for drill in candidates]
+    # NOTE: The best drills per minute first, good plans are found early and prune the others.
+    order = sorted(
+        range(len(candidates)), key=lambda i: -gains[i] / candidates[i].minutes
+    )
+    # NOTE: The greedy plan is a first plan to beat.
+    greedy = _solve_greedy(
+        candidates, weights, sessions, session_minutes, max_repeats, repetitions
+    )
+    drills = {drill.info.name: drill for drill in candidates}
+    trained = [0] * len(weights)
+    for session in greedy.sessions:
+        for info in session:
+            for a in drills[info.name].attrs:
+                trained[a] = min(trained[a] + 1, repetitions)
+    best_value = value(trained)
+    for step, i in enumerate(order):
+        drill = candidates[i]
+        new_states = {trained: list(front) for trained, front in states.items()}
+        for trained, front in states.items():
+            for remaining, plan in front:
+                fits = [s for s, r in enumerate(remaining) if r >= drill.minutes]
+                for k in range(1, min(max_repeats, len(fits)) + 1):
+                    new_trained = list(trained)
+                    for a in drill.attrs:
+                        new_trained[a] = min(new_trained[a] + k, repetitions)
+                    new_front = new_states.setdefault(tuple(new_trained), [])
+                    for chosen in itertools.combinations(fits, k):
+                        new_remaining = list(remaining)
+                        new_plan = list(plan)
+                        for s in chosen:
+                            new_remaining[s] -= drill.minutes
+                            new_plan[s] += (i,)
+                        by_remaining = sorted(
+                            range(sessions), key=lambda s: -new_remaining[s]
+                        )
+                        _add_to_front(
+                            new_front,
+                            tuple(new_remaining[s] for s in by_remaining),
+                            tuple(new_plan[s] for s in by_remaining),
+                        )
+
+        best_value = max(best_value, max(value(t) for t in new_states))
+        rest = [
+            (gains[j], candidates[j].minutes) for j in order[step + 1 :] if gains[j]
+        ]
+        states = {}
+        for trained, front in new_states.items():
+            front = [
+                item
+                for item in front
+                # NOTE: A small tolerance so rounding never drops the optimum.
+                if _upper_bound(
+                    value(trained),
+                    weights,
+                    trained,
+                    repetitions,
+                    sum(item[0]),
+                    rest,
+                    max_repeats,
+                )
+                >= best_value - 1e-9
+            ]
+            if front:
+                states[trained] = front
+
+    best = max(states, key=value)
+    _, plan = max(states[best], key=lambda item: sum(item[0]))
+    schedule = _Schedule(sessions, session_minutes)
+    # NOTE: Fullest session first, like the first fit of the greedy search.
+    for s, drills in enumerate(reversed(plan)):
+        for i in drills:
+            schedule.add(candidates[i], s)
+    return schedule.get_plan()
+
+
+def _upper_bound(
+    value: float,
+    weights: List[float],
+    trained: Tuple[int, ...],
+    repetitions: int,
+    minutes: int,
+    rest: List[Tuple[float, int]],
+    max_repeats: int,
+) -> float:
+    """Bound the value a plan can reach: neither more than the deficit left, nor more than the remaining drills (gain, minutes), best ratio first, fill in the minutes left, the last one in part."""
+    missing = sum(w * (repetitions - t) for w, t in zip(weights, trained))
+    bound = 0.0
+    for gain, length in rest:
+        if bound >= missing or minutes <= 0:
+            break
+        used = min(max_repeats * length, minutes)
+        bound += gain * used / length
+        minutes -= used
+    return value + min(bound, missing)
+
+
+def _add_to_front(front: list, remaining: Tuple[int, ...], plan: Tuple[Any, ...]):
+    """Add a plan unless another leaves at least as many minutes in every session, and drop the plans it dominates."""
+    for other, _ in front:
+        if all(a >= b for a, b in zip(other, remaining)):
+            return
+    front[:] = [
+        item for item in front if not all(a >= b for a, b in zip(remaining, item[0]))
+    ]
+    front.append((remaining, plan))
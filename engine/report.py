@@ -0,0 +1,455 @@
+"""Printable player reports: the attribute sliders and meters of the result page, then the cards of the recommended trainings.
+
+The reports are drawn headless with `utils.render`, the same drawing code as `ui.widgets`, and
+rendered in parallel by a pool of processes. Each process loads the fonts and draws the empty
+meters and sliders once, and keeps the cards of the trainings it already drew, since most players
+of a squad share some of their recommended drills.
+"""
+
+import os
+import re
+import csv
+import json
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from PIL import Image, ImageDraw
+
+from utils import datahandler
+from utils import profiler
+from utils import render
+from utils import schema
+
+from .benchmark import get_engine
+
+FORMATS = ("pdf", "png")
+
+# NOTE: The page is A4 landscape in units of 1/100 inch, drawn at render.SCALE pixels per unit (300 dpi).
+PAGE_SIZE = (1169, 827)
+MARGIN = 50
+DPI = 100 * render.SCALE
+
+BACKGROUND_COLOR = "#221f1f"
+TITLE_COLOR = (255, 255, 0)
+TEXT_COLOR = "white"
+LOW_COLOR = "#eb1515"
+HIGH_COLOR = "#1afa12"
+
+TITLE_FONT = "assets/fonts/Anton-Regular.ttf"
+TEXT_FONT = "assets/fonts/PublicSans-Bold.ttf"
+SUBTEXT_FONT = "assets/fonts/HankenGrotesk-Medium.ttf"
+
+ATTRIBUTES_PER_COLUMN = 5
+COLUMN_WIDTH = 570
+ROW_HEIGHT = 120
+SLIDER_SIZE = (400, 50)
+METER_SIZE = 80
+
+CARD_SIZE = (220, 300)
+CARDS_PER_ROW = 4
+CARDS_PER_PAGE = 8
+CARD_PAD = 25
+
+
+@dataclass
+class PlayerReport:
+    """The content of a player report.
+
+    :param name: The player name.
+    :type name: str
+    :param position: Position of the player.
+    :type position: str
+    :param season: The benchmark season.
+    :type season: str
+    :param attributes: The (display name, value, threshold) of each attribute.
+    :type attributes: list[tuple[str, int, int]]
+    :param trainings: The (name, description) of each recommended training.
+    :type trainings: list[tuple[str, str]]
+    :param missing: The display name of the attributes without a value, which are not assessed.
+    :type missing: list[str]
+    """
+
+    name: str
+    position: str
+    season: str
+    attributes: List[Tuple[str, int, int]] = field(default_factory=list)
+    trainings: List[Tuple[str, str]] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+
+def load_players(filename: str) -> List[Dict]:
+    """Load the assessment results of the players.
+
+    A JSON file holds a list of {"name", "position", "data": {attribute: value}} objects, with an
+    optional "season", the same data as the result page. A csv file has the columns name, position,
+    optionally season, then one column per attribute. An attribute without a value, or with an
+    empty cell, is left out of the data and not assessed. A player with an unknown position or a
+    value that is not a number is skipped.
+
+    :param filename: The JSON or csv file.
+    :type filename: str
+    :return: The players, as {"name", "position", "season", "data"} dictionaries. The season is None if not given.
+    :rtype: list[dict]
+    """
+    if filename.lower().endswith(".json"):
+        with open(filename, "r") as file:
+            players = json.load(file)
+    else:
+        with open(filename, "r", newline="") as file:
+            players = []
+            for row in csv.DictReader(file):
+                name = row.pop("name", "")
+                position = row.pop("position", None)
+                season = row.pop("season", None) or None
+                players.append(
+                    {"name": name, "position": position, "season": season, "data": row}
+                )
+    result = []
+    for i, player in enumerate(players, 1):
+        try:
+            result.append(_parse_player(player))
+        except (AttributeError, KeyError, OverflowError, TypeError, ValueError) as e:
+            # NOTE: One bad row only skips this player, like a failed unit of the data pipeline.
+            name = player.get("name") if isinstance(player, dict) else None
+            print(f"[report]   Skipped {name or f'player {i}'}: {type(e).__name__} {e}")
+    return result
+
+
+def _parse_player(player: Dict) -> Dict:
+    """Validate a player of `load_players`."""
+    position = str(player.get("position")).lower()
+    if position not in schema.get_positions():
+        raise ValueError(f"Unknown position {player.get('position')!r}")
+    return {
+        "name": str(player.get("name", "")),
+        "position": position,
+        "season": player.get("season"),
+        "data": {
+            k: int(float(v)) for k, v in player["data"].items() if v not in ("", None)
+        },
+    }
+
+
+def get_thresholds(position: str, season: str) -> Dict[str, int]:
+    """Get the benchmark of a position, the average of the normalized data as on the result page.
+
+    :param position: Position of the player.
+    :type position: str
+    :param season: The benchmark season.
+    :type season: str
+    :return: The threshold of each attribute.
+    :rtype: dict[str, int]
+    """
+    data = datahandler.get_benchmark_store(position, season=season)
+    return data.get_normalized_data().mean().astype(int).to_dict()
+
+
+def get_scores(values: Dict[str, int], thresholds: Dict[str, int]) -> Dict[str, int]:
+    """Compare the attributes of a player with the benchmark.
+
+    :param values: The value of each attribute.
+    :type values: dict[str, int]
+    :param thresholds: The threshold of each attribute.
+    :type thresholds: dict[str, int]
+    :return: The difference between the player value and the threshold of each attribute with a value.
+    :rtype: dict[str, int]
+    """
+    return {
+        attr: int(values[attr]) - int(t)
+        for attr, t in thresholds.items()
+        if attr in values
+    }
+
+
+@profiler.profile()
+def assess_players(
+    players: List[Dict], handler, season: str = "data_new"
+) -> List[PlayerReport]:
+    """Assess the players against their benchmark and get their recommended trainings. The benchmark of each position is loaded once.
+
+    :param players: The players, see `load_players`.
+    :type players: list[dict]
+    :param handler: The training handler of the catalogue.
+    :type handler: TrainingHandler
+    :param season: The benchmark season of the players without one. If a position has no benchmark for it, the latest season that has one is used. Defaults to "data_new"
+    :type season: str, optional
+    :return: The report of each player, in the same order. The players of a position without benchmark are skipped.
+    :rtype: list[PlayerReport]
+    """
+    engine = get_engine()
+    thresholds = {}
+    reports = []
+    for player in players:
+        position = player["position"]
+        try:
+            key = (
+                position,
+                engine.resolve_season(position, player["season"] or season),
+            )
+        except ValueError as e:
+            print(f"[report]   Skipped {player['name'] or position}: {e}")
+            continue
+        if key not in thresholds:
+            thresholds[key] = get_thresholds(*key)
+        benchmark = thresholds[key]
+        scores = get_scores(player["data"], benchmark)
+
+        deficits = sorted((s, a) for a, s in scores.items() if s < 0)
+        trainings = handler.retrieve([a for _, a in deficits], position) or []
+        position_schema = schema.get_schema(position)
+        missing = [
+            position_schema.get_display_name(attr)
+            for attr in benchmark
+            if attr not in scores
+        ]
+        if missing:
+            print(
+                f"[report]   {player['name'] or position}: not assessed {', '.join(missing)}"
+            )
+        reports.append(
+            PlayerReport(
+                name=player["name"],
+                position=position,
+                season=key[1],
+                attributes=[
+                    (
+                        position_schema.get_display_name(attr),
+                        int(player["data"][attr]),
+                        int(threshold),
+                    )
+                    for attr, threshold in benchmark.items()
+                    if attr in scores
+                ],
+                trainings=[(t.name, t.description) for t in trainings],
+                missing=missing,
+            )
+        )
+    return reports
+
+
+@functools.lru_cache(maxsize=None)
+def _get_meter_base() -> Image.Image:
+    return render.render_meter_base(METER_SIZE)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_slider_base() -> Image.Image:
+    return render.render_slider_base(*SLIDER_SIZE, thickness=20, radius=90)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_card(name: str, description: str) -> Image.Image:
+    return render.render_card(
+        name,
+        size=CARD_SIZE,
+        subtext=description,
+        text_font=(TEXT_FONT, 18),
+        subtext_font=(SUBTEXT_FONT, 12),
+    )
+
+
+def _new_page() -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+    s = render.SCALE
+    page = Image.new("RGB", (PAGE_SIZE[0] * s, PAGE_SIZE[1] * s), BACKGROUND_COLOR)
+    return page, ImageDraw.Draw(page)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_trainings_page() -> Image.Image:
+    """The empty page of the recommended trainings, with its title."""
+    page, draw = _new_page()
+    _draw_title(draw, "RECOMMENDED TRAININGS", 35, anchor="ma")
+    return page
+
+
+def _paste(page: Image.Image, image: Image.Image, xy: Tuple[int, int]):
+    """Paste a render at a position in units."""
+    s = render.SCALE
+    page.paste(image, (int(xy[0] * s), int(xy[1] * s)), image)
+
+
+def _draw_title(draw: ImageDraw.ImageDraw, text: str, y: int, anchor: str = "la"):
+    s = render.SCALE
+    x = MARGIN if anchor[0] == "l" else PAGE_SIZE[0] // 2
+    font = render.get_font(TITLE_FONT, 60 * s)
+    draw.text((x * s, y * s), text, TITLE_COLOR, font, anchor=anchor)
+
+
+def render_attribute(name: str, value: int, threshold: int) -> Image.Image:
+    """Draw the label, the slider and the meter of an attribute, as on the result page.
+
+    :param name: The attribute display name.
+    :type name: str
+    :param value: The player value.
+    :type value: int
+    :param threshold: The benchmark value.
+    :type threshold: int
+    :return: The image, of (COLUMN_WIDTH, ROW_HEIGHT) units.
+    :rtype: Image
+    """
+    s = render.SCALE
+    score = value - threshold
+    color = LOW_COLOR if score < 0 else HIGH_COLOR
+    image = Image.new("RGBA", (COLUMN_WIDTH * s, ROW_HEIGHT * s))
+    draw = ImageDraw.Draw(image)
+    draw.text((0, 0), name, TEXT_COLOR, render.get_font(SUBTEXT_FONT, 22 * s))
+
+    slider = render.render_slider(
+        value,
+        *SLIDER_SIZE,
+        threshold=threshold if score != 0 else None,
+        thickness=20,
+        fill_color="#FFFF00",
+        under_threshold_color=LOW_COLOR,
+        over_threshold_color=HIGH_COLOR,
+        radius=90,
+        base=_get_slider_base(),
+    )
+    meter = render.render_meter(
+        abs(score),
+        meter_size=METER_SIZE,
+        fg_color=color,
+        prefix="-" if score < 0 else "",
+        suffix="%",
+        textfont=(SUBTEXT_FONT, 20),
+        text_color="white",
+        base=_get_meter_base(),
+    )
+    top = 35
+    _paste(image, slider, (0, top + (METER_SIZE - SLIDER_SIZE[1]) // 2))
+    _paste(image, meter, (SLIDER_SIZE[0] + 30, top))
+    return image
+
+
+@profiler.profile()
+def render_report(report: PlayerReport) -> List[Image.Image]:
+    """Draw the pages of a player report: the assessment, then the recommended trainings, CARDS_PER_PAGE per page.
+
+    :param report: The report content.
+    :type report: PlayerReport
+    :return: The RGB pages, of PAGE_SIZE units at render.SCALE pixels per unit.
+    :rtype: list[Image]
+    """
+    s = render.SCALE
+    page, draw = _new_page()
+    _draw_title(draw, report.name.upper() or "PLAYER", 35)
+    subtitle = f"{report.position.upper()}   |   Benchmark {report.season}"
+    font = render.get_font(SUBTEXT_FONT, 24 * s)
+    draw.text((MARGIN * s, 125 * s), subtitle, TEXT_COLOR, font)
+    if report.missing:
+        text = f"Not assessed: {', '.join(report.missing)}"
+        font = render.get_font(SUBTEXT_FONT, 16 * s)
+        draw.text((MARGIN * s, 160 * s), text, LOW_COLOR, font)
+    for i, attribute in enumerate(report.attributes):
+        x = MARGIN + i // ATTRIBUTES_PER_COLUMN * COLUMN_WIDTH
+        y = 190 + i % ATTRIBUTES_PER_COLUMN * ROW_HEIGHT
+        _paste(page, render_attribute(*attribute), (x, y))
+    pages = [page]
+
+    trainings = report.trainings
+    for start in range(0, max(len(trainings), 1), CARDS_PER_PAGE):
+        page = _get_trainings_page().copy()
+        if not trainings:
+            draw = ImageDraw.Draw(page)
+            font = render.get_font(SUBTEXT_FONT, 32 * s)
+            text = "There is no training recommended."
+            draw.text((PAGE_SIZE[0] * s // 2, 300 * s), text, TEXT_COLOR, font, "ma")
+        cards = trainings[start : start + CARDS_PER_PAGE]
+        row_width = CARDS_PER_ROW * (CARD_SIZE[0] + CARD_PAD) - CARD_PAD
+        for i, (name, description) in enumerate(cards):
+            x = (PAGE_SIZE[0] - row_width) // 2 + i % CARDS_PER_ROW * (
+                CARD_SIZE[0] + CARD_PAD
+            )
+            y = 150 + i // CARDS_PER_ROW * (CARD_SIZE[1] + CARD_PAD)
+            _paste(page, _get_card(name, description), (x, y))
+        pages.append(page)
+    return pages
+
+
+def get_report_filename(index: int, report: PlayerReport) -> str:
+    """Get the file name of a report, without extension. The index keeps players with the same name apart.
+
+    :param index: The index of the player.
+    :type index: int
+    :param report: The report.
+    :type report: PlayerReport
+    :return: The file name, e.g. "0001-john-smith".
+    :rtype: str
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", report.name.lower()).strip("-")
+    return f"{index:04d}-{slug or report.position}"
+
+
+def write_report(
+    report: PlayerReport, filename: str, format_: str = "pdf"
+) -> List[str]:
+    """Render a report and write it as one multi-page PDF file, or one PNG file per page.
+
+    :param report: The report.
+    :type report: PlayerReport
+    :param filename: The output file, without extension.
+    :type filename: str
+    :param format_: "pdf" or "png", defaults to "pdf"
+    :type format_: str, optional
+    :return: The written filenames.
+    :rtype: list[str]
+    """
+    pages = render_report(report)
+    if format_ == "pdf":
+        pages[0].save(
+            filename + ".pdf",
+            save_all=True,
+            append_images=pages[1:],
+            resolution=DPI,
+            title=report.name,
+        )
+        return [filename + ".pdf"]
+    written = []
+    for i, page in enumerate(pages, 1):
+        written.append(f"{filename}-{i}.png")
+        page.save(written[-1], dpi=(DPI, DPI), compress_level=1)
+    return written
+
+
+def _write_report(job: Tuple[PlayerReport, str, str]) -> List[str]:
+    return write_report(*job)
+
+
+@profiler.profile()
+def generate_reports(
+    reports: Iterable[PlayerReport],
+    directory: str,
+    format_: str = "pdf",
+    workers: int = None,
+) -> List[str]:
+    """Write the reports of many players in parallel.
+
+    :param reports: The reports, see `assess_players`.
+    :type reports: Iterable[PlayerReport]
+    :param directory: The output directory.
+    :type directory: str
+    :param format_: "pdf" for one multi-page PDF file per player or "png" for one PNG file per page, defaults to "pdf"
+    :type format_: str, optional
+    :param workers: The number of processes, defaults to the number of CPUs. With 1, the reports are written in this process.
+    :type workers: int, optional
+    :raises ValueError: If the format is not in FORMATS.
+    :return: The written filenames.
+    :rtype: list[str]
+    """
+    if format_ not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, not {format_!r}")
+    os.makedirs(directory, exist_ok=True)
+    jobs = [
+        (report, os.path.join(directory, get_report_filename(i, report)), format_)
+        for i, report in enumerate(reports, 1)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        results = map(_write_report, jobs)
+        return [f for written in results for f in written]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_write_report, jobs, chunksize=chunksize)
+        return [f for written in results for f in written]
@@ -0,0 +1,291 @@
+"""Forward chaining rule engine over the player facts.
+
+Rules are compiled into a Rete-style network. Every distinct condition becomes one shared alpha
+node indexed by the facts it reads, and every rule is a join node counting how many of its
+conditions hold. Asserting a fact only re-evaluates the alpha nodes reading that fact and only
+updates the rules below the alpha nodes whose result changed, so one slider change costs
+O(conditions on that attribute) instead of re-evaluating every rule.
+
+Example::
+
+    engine = RuleEngine()
+    engine.add_rule(
+        Rule(
+            "duels-defender",
+            [
+                Condition("duels", "<", Fact("benchmark:duels")),
+                Condition("position", "==", "defender"),
+            ],
+            action="Tackling drills",
+        )
+    )
+    engine.assert_facts({"position": "defender", "benchmark:duels": 25})
+    engine.assert_fact("duels", 10)
+    engine.get_recommendations()  # ["Tackling drills"]
+"""
+
+import operator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Set, Tuple, Union
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+BENCHMARK_PREFIX = "benchmark:"
+
+
+@dataclass(frozen=True)
+class Fact:
+    """A reference to another fact, used as the right-hand side of a condition."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Condition:
+    """A condition comparing a fact with a constant or another fact, e.g. duels < benchmark:duels.
+
+    :raises ValueError: If the operator is not supported.
+    """
+
+    fact: str
+    op: str
+    value: Union[Fact, Any]
+
+    def __post_init__(self):
+        if self.op not in _OPERATORS:
+            raise ValueError(
+                f"Invalid operator. Operator must be either {', '.join(_OPERATORS)}"
+            )
+
+    def get_facts(self) -> Tuple[str, ...]:
+        """Get the names of the facts read by the condition.
+
+        :return: A tuple of fact names.
+        :rtype: tuple[str, ...]
+        """
+        if isinstance(self.value, Fact):
+            return (self.fact, self.value.name)
+        return (self.fact,)
+
+    def evaluate(self, facts: Dict[str, Any]) -> bool:
+        """Evaluate the condition. A condition reading a missing fact does not hold.
+
+        :param facts: The working memory.
+        :type facts: dict[str, Any]
+        :return: True if the condition holds.
+        :rtype: bool
+        """
+        if self.fact not in facts:
+            return False
+        value = self.value
+        if isinstance(value, Fact):
+            if value.name not in facts:
+                return False
+            value = facts[value.name]
+        try:
+            return bool(_OPERATORS[self.op](facts[self.fact], value))
+        except TypeError:
+            return False
+
+
+@dataclass
+class Rule:
+    """A rule firing its action when all of its conditions hold.
+
+    :param name: A unique rule name.
+    :type name: Hashable
+    :param conditions: The conditions that must all hold.
+    :type conditions: list[Condition]
+    :param action: The recommendation of the rule, e.g. a TrainingInfo object.
+    :type action: Any
+    :param salience: Rules with higher salience are listed first, defaults to 0
+    :type salience: int, optional
+    """
+
+    name: Hashable
+    conditions: List[Condition]
+    action: Any = None
+    salience: int = 0
+    _satisfied: int = field(default=0, init=False, repr=False, compare=False)
+    _required: int = field(default=0, init=False, repr=False, compare=False)
+
+
+class _AlphaNode:
+    """A condition shared by every rule using it."""
+
+    __slots__ = ("condition", "satisfied", "rules")
+
+    def __init__(self, condition: Condition):
+        self.condition = condition
+        self.satisfied = False
+        self.rules: List[Rule] = []
+
+
+class RuleEngine:
+    """Incremental forward chaining engine. See the module docstring for an example."""
+
+    def __init__(self):
+        self.facts: Dict[str, Any] = {}
+        self.rules: Dict[Hashable, Rule] = {}
+        self._alpha_nodes: Dict[Condition, _AlphaNode] = {}
+        self._fact_index: Dict[str, List[_AlphaNode]] = {}
+        self._active: Dict[Hashable, Rule] = {}
+        self.evaluations = 0
+
+    def add_rule(self, rule: Rule):
+        """Compile a rule into the network and evaluate it against the current facts.
+
+        :param rule: The rule to add.
+        :type rule: Rule
+        :raises ValueError: If a rule with the same name exists.
+        """
+        if rule.name in self.rules:
+            raise ValueError(f"Rule {rule.name} already exists.")
+        self.rules[rule.name] = rule
+        conditions = set(rule.conditions)
+        rule._satisfied = 0
+        rule._required = len(conditions)
+        for condition in conditions:
+            node = self._alpha_nodes.get(condition)
+            if node is None:
+                node = self._alpha_nodes[condition] = _AlphaNode(condition)
+                for name in set(condition.get_facts()):
+                    self._fact_index.setdefault(name, []).append(node)
+                node.satisfied = condition.evaluate(self.facts)
+                self.evaluations += 1
+            node.rules.append(rule)
+            rule._satisfied += node.satisfied
+        self._update_activation(rule)
+
+    def add_rules(self, rules: List[Rule]):
+        """Compile several rules into the network.
+
+        :param rules: The rules to add.
+        :type rules: list[Rule]
+        """
+        for rule in rules:
+            self.add_rule(rule)
+
+    def assert_fact(self, name: str, value: Any) -> Set[Hashable]:
+        """Add or change a fact and propagate the change through the network.
+
+        :param name: The fact name.
+        :type name: str
+        :param value: The new value.
+        :type value: Any
+        :return: The names of the rules whose activation changed.
+        :rtype: set
+        """
+        if name in self.facts and self.facts[name] == value:
+            return set()
+        self.facts[name] = value
+        return self._propagate(name)
+
+    def assert_facts(self, facts: Dict[str, Any]) -> Set[Hashable]:
+        """Add or change several facts, see `assert_fact`.
+
+        :param facts: A dictionary of fact name and value.
+        :type facts: dict[str, Any]
+        :return: The names of the rules whose activation changed.
+        :rtype: set
+        """
+        changed = set()
+        for name, value in facts.items():
+            changed ^= self.assert_fact(name, value)
+        return changed
+
+    def retract_fact(self, name: str) -> Set[Hashable]:
+        """Remove a fact and propagate the change through the network.
+
+        :param name: The fact name.
+        :type name: str
+        :return: The names of the rules whose activation changed.
+        :rtype: set
+        """
+        if name not in self.facts:
+            return set()
+        del self.facts[name]
+        return self._propagate(name)
+
+    def get_active_rules(self) -> List[Rule]:
+        """Get the rules whose conditions all hold, highest salience first.
+
+        :return: A list of rules.
+        :rtype: list[Rule]
+        """
+        return sorted(self._active.values(), key=lambda r: -r.salience)
+
+    def get_recommendations(self) -> List[Any]:
+        """Get the actions of the active rules without duplicates, highest salience first.
+
+        :return: A list of actions.
+        :rtype: list
+        """
+        result = []
+        seen = set()
+        for rule in self.get_active_rules():
+            key = id(rule.action)
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(rule.action)
+        return result
+
+    def _propagate(self, name: str) -> Set[Hashable]:
+        """Re-evaluate the alpha nodes reading a fact and update the rules below the changed ones."""
+        changed = set()
+        for node in self._fact_index.get(name, []):
+            satisfied = node.condition.evaluate(self.facts)
+            self.evaluations += 1
+            if satisfied == node.satisfied:
+                continue
+            node.satisfied = satisfied
+            delta = 1 if satisfied else -1
+            for rule in node.rules:
+                rule._satisfied += delta
+                if self._update_activation(rule):
+                    changed ^= {rule.name}
+        return changed
+
+    def _update_activation(self, rule: Rule) -> bool:
+        """Update the agenda for a rule and return True if its activation changed."""
+        active = rule._satisfied == rule._required
+        if active == (rule.name in self._active):
+            return False
+        if active:
+            self._active[rule.name] = rule
+        else:
+            del self._active[rule.name]
+        return True
+
+
+def compile_training_rules(training_list: List[Any]) -> List[Rule]:
+    """Compile the training catalogue into rules: recommend a training if the player is below the benchmark in one of its attributes and plays its position.
+
+    The facts are the attribute values named in lower case, the benchmark values named
+    BENCHMARK_PREFIX + attribute and "position".
+
+    :param training_list: A list of TrainingInfo objects, e.g. `TrainingHandler.training_list`.
+    :type training_list: list[TrainingInfo]
+    :return: One rule per (training, attribute).
+    :rtype: list[Rule]
+    """
+    rules = []
+    for i, info in enumerate(training_list):
+        for attr in info.attributes:
+            attr = attr.strip().lower()
+            if not attr:
+                continue
+            conditions = [
+                Condition(attr, "<", Fact(BENCHMARK_PREFIX + attr)),
+                Condition("position", "==", info.position.lower()),
+            ]
+            rules.append(Rule((i, attr), conditions, action=info))
+    return rules
@@ -0,0 +1,193 @@
+"""In-process full-text search over the training names and descriptions.
+
+The index is an inverted index (term -> {document: term frequency}) ranked with BM25. The
+vocabulary is kept sorted so a prefix ("cross*", or the last word while typing) is expanded with a
+binary search. Documents are added incrementally and the index can be saved as JSON. The postings
+of a term are converted to arrays the first time it is searched, so scoring is vectorized.
+"""
+
+import re
+import json
+import math
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lower case words made of letters and digits, e.g. "1v1 Rondo" -> ["1v1", "rondo"].
+
+    :param text: The text to split.
+    :type text: str
+    :return: A list of tokens.
+    :rtype: list[str]
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted full-text index with BM25 ranking and prefix search.
+
+    :param k1: BM25 term frequency saturation, defaults to 1.2
+    :type k1: float, optional
+    :param b: BM25 document length normalization, defaults to 0.75
+    :type b: float, optional
+    """
+
+    VERSION = 1
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.keys: List[str] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocabulary: List[str] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._length_array = None
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, tokens: List[str], key: str = "") -> int:
+        """Add a document to the index.
+
+        :param tokens: The tokens of the document, see `tokenize`. Repeat tokens to give them more weight.
+        :type tokens: list[str]
+        :param key: A key identifying the document, e.g. the training name, defaults to ""
+        :type key: str, optional
+        :return: The document id, which is the number of documents added before it.
+        :rtype: int
+        """
+        doc_id = len(self._lengths)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+            self._arrays.pop(token, None)
+        self._length_array = None
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self.keys.append(key)
+        return doc_id
+
+    def expand(self, prefix: str) -> List[str]:
+        """Get the terms of the vocabulary starting with prefix.
+
+        :param prefix: The prefix.
+        :type prefix: str
+        :return: A list of terms in alphabetical order.
+        :rtype: list[str]
+        """
+        start = bisect_left(self._vocabulary, prefix)
+        end = start
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(prefix):
+            end += 1
+        return self._vocabulary[start:end]
+
+    def search(
+        self, query: str, k: int = 10, prefix: bool = True
+    ) -> List[Tuple[int, float]]:
+        """Search the documents matching any word of the query, best BM25 score first.
+
+        A word ending with "*" matches every term starting with it.
+
+        :param query: The query, e.g. "rondo", "crossing" or "1v1".
+        :type query: str
+        :param k: The maximum number of results, defaults to 10
+        :type k: int, optional
+        :param prefix: If True, the last word of the query is also a prefix, defaults to True
+        :type prefix: bool, optional
+        :return: A list of (document id, score).
+        :rtype: list[tuple[int, float]]
+        """
+        words = query.lower().split()
+        terms = set()
+        for i, word in enumerate(words):
+            is_prefix = word.endswith("*") or (prefix and i == len(words) - 1)
+            for token in tokenize(word):
+                terms.add(token)
+                if is_prefix:
+                    terms.update(self.expand(token))
+
+        n_docs = len(self._lengths)
+        if n_docs == 0:
+            return []
+        if self._length_array is None:
+            self._length_array = np.asarray(self._lengths, dtype=np.float64)
+        norms = self.k1 * (
+            1 - self.b + self.b * self._length_array / (self._total_length / n_docs)
+        )
+        scores = np.zeros(n_docs)
+        for term in terms:
+            if term not in self._postings:
+                continue
+            doc_ids, tfs = self._get_arrays(term)
+            df = len(doc_ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + norms[doc_ids])
+
+        matches = np.flatnonzero(scores)
+        if k < len(matches):
+            matches = matches[np.argpartition(-scores[matches], k - 1)[:k]]
+        # NOTE: lexsort keeps the lowest document id first among equal scores.
+        matches = matches[np.lexsort((matches, -scores[matches]))]
+        return [(int(i), float(scores[i])) for i in matches]
+
+    def _get_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (document ids, term frequencies) arrays of a term."""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            doc_ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            tfs = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            arrays = self._arrays[term] = (doc_ids, tfs)
+        return arrays
+
+    def save(self, filename: str):
+        """Save the index as a JSON file.
+
+        :param filename: The index filename.
+        :type filename: str
+        """
+        data = {
+            "version": self.VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "keys": self.keys,
+            "lengths": self._lengths,
+            "postings": {term: list(p.items()) for term, p in self._postings.items()},
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filename: str) -> "SearchIndex":
+        """Load an index saved by `save`.
+
+        :param filename: The index filename.
+        :type filename: str
+        :raises ValueError: If the file has an unsupported version.
+        :return: The index.
+        :rtype: SearchIndex
+        """
+        with open(filename, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"{filename} has an unsupported search index version.")
+        index = cls(data["k1"], data["b"])
+        index.keys = data["keys"]
+        index._lengths = data["lengths"]
+        index._total_length = sum(index._lengths)
+        index._postings = {
+            term: {doc_id: tf for doc_id, tf in postings}
+            for term, postings in data["postings"].items()
+        }
+        index._vocabulary = sorted(index._postings)
+        return index
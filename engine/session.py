@@ -0,0 +1,115 @@
+from typing import Any, Dict, List
+
+from . import rules
+
+
+class AssessmentSession:
+    """The state of one player assessment: the attribute values, the benchmark, the deficits and the recommended trainings.
+
+    Every update only touches the changed attribute: its deficit, the rules reading it (see
+    `engine.rules.RuleEngine`) and the score of the trainings covering it. This keeps a slider
+    event cheap enough to refresh a live preview.
+
+    :param position: Position of the player.
+    :type position: str
+    :param thresholds: The benchmark value of each attribute, e.g. the average of the normalized data.
+    :type thresholds: dict[str, float]
+    :param training_list: A list of TrainingInfo objects, e.g. `TrainingHandler.training_list`.
+    :type training_list: list[TrainingInfo]
+    :param values: The initial attribute values, defaults to 0 for each attribute of thresholds.
+    :type values: dict[str, float], optional
+    """
+
+    def __init__(
+        self,
+        position: str,
+        thresholds: Dict[str, float],
+        training_list: List[Any],
+        values: Dict[str, float] = None,
+    ):
+        self.position = position.lower()
+        self.thresholds = dict(thresholds)
+        self.values = {attr: 0 for attr in self.thresholds}
+        self.deficits = {attr: 0.0 for attr in self.thresholds}
+        self._keys = {attr: attr.lower() for attr in self.thresholds}
+
+        self._training_list = list(training_list)
+        self._scores = [0.0] * len(self._training_list)
+        self._coverage: Dict[str, List[int]] = {}
+        for i, info in enumerate(self._training_list):
+            for attr in set(a.strip().lower() for a in info.attributes):
+                if attr:
+                    self._coverage.setdefault(attr, []).append(i)
+
+        self._engine = rules.RuleEngine()
+        self._engine.add_rules(rules.compile_training_rules(self._training_list))
+        facts = {
+            rules.BENCHMARK_PREFIX + self._keys[attr]: value
+            for attr, value in self.thresholds.items()
+        }
+        facts["position"] = self.position
+        self._engine.assert_facts(facts)
+
+        for attr, value in (values or self.values).items():
+            self.update(attr, value)
+
+    def update(self, attr: str, value: float) -> bool:
+        """Change the value of an attribute.
+
+        :param attr: The attribute name.
+        :type attr: str
+        :param value: The new value.
+        :type value: float
+        :return: True if the set of recommended trainings changed.
+        :rtype: bool
+        """
+        self.values[attr] = value
+        old_deficit = self.deficits.get(attr, 0.0)
+        new_deficit = max(self.thresholds.get(attr, value) - value, 0)
+        self.deficits[attr] = new_deficit
+
+        key = self._keys.get(attr, attr.lower())
+        delta = new_deficit - old_deficit
+        if delta:
+            for i in self._coverage.get(key, []):
+                self._scores[i] += delta
+        return bool(self._engine.assert_fact(key, value))
+
+    def get_data(self) -> Dict[str, float]:
+        """Get the attribute values.
+
+        :return: A dictionary of attribute name and value.
+        :rtype: dict[str, float]
+        """
+        return dict(self.values)
+
+    def get_attributes_to_train(self) -> List[str]:
+        """Get the attributes below the benchmark, largest deficit first.
+
+        :return: A list of attributes name.
+        :rtype: list[str]
+        """
+        attrs = [attr for attr, deficit in self.deficits.items() if deficit > 0]
+        return sorted(attrs, key=lambda attr: -self.deficits[attr])
+
+    def get_recommendations(self, k: int = None) -> List[Any]:
+        """Get the recommended trainings, the ones covering the largest total deficit first. Trainings with the same name are listed once.
+
+        :param k: The maximum number of trainings, defaults to None for all of them.
+        :type k: int, optional
+        :return: A list of TrainingInfo objects.
+        :rtype: list[TrainingInfo]
+        """
+        active = {rule.name[0] for rule in self._engine.get_active_rules()}
+        candidates = sorted(((self._scores[i], -i) for i in active), reverse=True)
+        result = []
+        done = set()
+        for _, i in candidates:
+            info = self._training_list[-i]
+            if info.name in done:
+                continue
+            done.add(info.name)
+            result.append(info)
+            if k is not None and len(result) >= k:
+                break
+        return result
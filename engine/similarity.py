@@ -0,0 +1,244 @@
+import os
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from utils import columnar
+from utils import datahandler
+
+Vector = Union[Dict[str, float], List[float], np.ndarray]
+Match = Tuple[str, float]
+
+_indexes: Dict[Tuple[str, str, str, str], Tuple[Any, "PlayerIndex"]] = {}
+
+
+class KDTree:
+    """A static KD-tree over the rows of a matrix for k nearest neighbour queries (euclidean distance).
+
+    The tree is stored in flat arrays. Each leaf holds up to `leaf_size` points, which are compared
+    with one vectorized distance computation.
+
+    :param points: A (rows, dimensions) matrix.
+    :type points: np.ndarray
+    :param leaf_size: The maximum number of points in a leaf, defaults to 256
+    :type leaf_size: int, optional
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 256):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = max(1, leaf_size)
+        self.order = np.arange(len(self.points))
+        self._dim: List[int] = []
+        self._split: List[float] = []
+        self._children: List[Tuple[int, int]] = []
+        self._range: List[Tuple[int, int]] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+        self._sorted_points = self.points[self.order]
+
+    def query(self, point: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the k nearest points of a single point.
+
+        :param point: A vector with one value per dimension.
+        :type point: np.ndarray
+        :param k: The number of neighbours, defaults to 1
+        :type k: int, optional
+        :return: The (distances, row indexes) of the neighbours, nearest first.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self.points))
+        best_dists = np.empty(0)
+        best_rows = np.empty(0, dtype=np.int64)
+        bound = np.inf  # squared distance of the current k-th neighbour
+        # Each entry keeps the squared distance to the node cell and the per dimension offsets it is made of.
+        stack = [(0, 0.0, np.zeros(self.points.shape[1]))] if k > 0 else []
+        while stack:
+            node, cell_dist, offsets = stack.pop()
+            if cell_dist >= bound:
+                continue
+            left, right = self._children[node]
+            if left < 0:
+                start, end = self._range[node]
+                dists = ((self._sorted_points[start:end] - point) ** 2).sum(axis=1)
+                best_dists = np.concatenate((best_dists, dists))
+                best_rows = np.concatenate((best_rows, np.arange(start, end)))
+                if len(best_dists) > k:
+                    keep = np.argpartition(best_dists, k - 1)[:k]
+                    best_dists, best_rows = best_dists[keep], best_rows[keep]
+                if len(best_dists) == k:
+                    bound = best_dists.max()
+                continue
+            dim = self._dim[node]
+            diff = point[dim] - self._split[node]
+            near, far = (left, right) if diff < 0 else (right, left)
+            far_offsets = offsets.copy()
+            far_offsets[dim] = diff * diff
+            far_dist = cell_dist - offsets[dim] + far_offsets[dim]
+            stack.append((far, far_dist, far_offsets))
+            stack.append((near, cell_dist, offsets))
+
+        order = np.argsort(best_dists)
+        return np.sqrt(best_dists[order]), self.order[best_rows[order]]
+
+    def _build(self, start: int, end: int) -> int:
+        """Build the subtree of the points order[start:end] and return its node id."""
+        node = len(self._dim)
+        self._dim.append(-1)
+        self._split.append(0.0)
+        self._children.append((-1, -1))
+        self._range.append((start, end))
+        if end - start <= self.leaf_size:
+            return node
+
+        rows = self.order[start:end]
+        block = self.points[rows]
+        dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+        mid = (end - start) // 2
+        part = np.argpartition(block[:, dim], mid)
+        self.order[start:end] = rows[part]
+        self._dim[node] = dim
+        self._split[node] = float(self.points[self.order[start + mid], dim])
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self._children[node] = (left, right)
+        return node
+
+
+class PlayerIndex:
+    """Nearest neighbour search over the player attribute vectors of a position dataset.
+
+    Queries use a KD-tree when the dataset is large and a brute-force vectorized search otherwise
+    (or when forced with `method`). Batch queries, e.g. a whole squad, always use the brute-force
+    search which compares every query with every player in one matrix operation per chunk.
+
+    :param vectors: A (players, attributes) matrix, e.g. the output of `DataHandler.get_normalized_data`.
+    :type vectors: np.ndarray
+    :param names: The name of each player.
+    :type names: list[str]
+    :param attributes: The attribute name of each column.
+    :type attributes: list[str]
+    :param method: "auto", "kdtree" or "brute", defaults to "auto"
+    :type method: str, optional
+    :raises ValueError: If method is invalid.
+    """
+
+    BRUTE_FORCE_LIMIT = 4096
+    CHUNK_SIZE = 1024
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        names: List[str],
+        attributes: List[str],
+        method: str = "auto",
+    ):
+        if method not in ["auto", "kdtree", "brute"]:
+            raise ValueError("method must be either auto, kdtree or brute")
+        self.vectors = np.nan_to_num(np.asarray(vectors, dtype=np.float64))
+        self.names = list(names)
+        self.attributes = list(attributes)
+        if method == "auto":
+            method = (
+                "brute" if len(self.vectors) <= self.BRUTE_FORCE_LIMIT else "kdtree"
+            )
+        self.method = method
+        self._tree = KDTree(self.vectors) if method == "kdtree" else None
+        self._sq_norms = (self.vectors**2).sum(axis=1)
+
+    def query(self, vector: Vector, k: int = 5) -> List[Match]:
+        """Find the k players most similar to a vector.
+
+        :param vector: A dictionary of attribute values, e.g. the slider values of `DataInputPage`, or a vector in the order of `attributes`.
+        :type vector: dict[str, float] | list[float] | np.ndarray
+        :param k: The number of players, defaults to 5
+        :type k: int, optional
+        :return: A list of (player name, distance), most similar first.
+        :rtype: list[tuple[str, float]]
+        """
+        if self._tree is None:
+            return self.query_batch([vector], k)[0]
+        dists, rows = self._tree.query(self._to_matrix([vector])[0], k)
+        return [(self.names[r], float(d)) for d, r in zip(dists, rows)]
+
+    def query_batch(self, vectors: List[Vector], k: int = 5) -> List[List[Match]]:
+        """Find the k players most similar to each vector.
+
+        :param vectors: A list of vectors, see `query`, or a (queries, attributes) matrix.
+        :type vectors: list[dict[str, float] | list[float] | np.ndarray] | np.ndarray
+        :param k: The number of players per vector, defaults to 5
+        :type k: int, optional
+        :return: One list of (player name, distance) per vector, most similar first.
+        :rtype: list[list[tuple[str, float]]]
+        """
+        matrix = self._to_matrix(vectors)
+        k = min(k, len(self.vectors))
+        results = []
+        for start in range(0, len(matrix), self.CHUNK_SIZE):
+            chunk = matrix[start : start + self.CHUNK_SIZE]
+            sq_dists = (
+                (chunk**2).sum(axis=1)[:, None]
+                - 2 * chunk @ self.vectors.T
+                + self._sq_norms[None, :]
+            )
+            if k < len(self.vectors):
+                rows = np.argpartition(sq_dists, k - 1, axis=1)[:, :k]
+            else:
+                rows = np.tile(np.arange(len(self.vectors)), (len(chunk), 1))
+            top = np.take_along_axis(sq_dists, rows, axis=1)
+            order = np.argsort(top, axis=1)
+            rows = np.take_along_axis(rows, order, axis=1)
+            dists = np.sqrt(np.maximum(np.take_along_axis(top, order, axis=1), 0))
+            for row_ids, row_dists in zip(rows.tolist(), dists.tolist()):
+                results.append([(self.names[r], d) for r, d in zip(row_ids, row_dists)])
+        return results
+
+    def _to_matrix(self, vectors: List[Vector]) -> np.ndarray:
+        """Convert the query vectors into a (queries, attributes) matrix."""
+        rows = [
+            (
+                [float(v.get(attr, 0)) for attr in self.attributes]
+                if isinstance(v, dict)
+                else v
+            )
+            for v in vectors
+        ]
+        matrix = np.asarray(rows, dtype=np.float64).reshape(-1, len(self.attributes))
+        return np.nan_to_num(matrix)
+
+
+def get_index(
+    position: str, season: str = "2022-23", method: str = "auto", root: str = "data"
+) -> PlayerIndex:
+    """Get the player index of a position and season, from the normalized data of its benchmark store (see `utils.datahandler.get_benchmark_store`). The index is built once per process and rebuilt only if the store changes.
+
+    :param position: Position of the player.
+    :type position: str
+    :param season: The season, defaults to "2022-23"
+    :type season: str, optional
+    :param method: See `PlayerIndex`, defaults to "auto"
+    :type method: str, optional
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :raises FileNotFoundError: If there is no data for position in season.
+    :return: The player index.
+    :rtype: PlayerIndex
+    """
+    position = position.lower()
+    source = os.path.join(root, season, f"{position}_raw_data.csv")
+    sources = [source, columnar.get_columnar_location(source)]
+    if not any(os.path.exists(f) for f in sources):
+        raise FileNotFoundError(f"{source} does not exist.")
+    data = datahandler.get_benchmark_store(position, season=season, root=root)
+    key = (root, position, season, method)
+    cached = _indexes.get(key)
+    # NOTE: Stores are reopened only when their file changes, see `utils.store.open_store`.
+    if cached is not None and cached[0] is data:
+        return cached[1]
+
+    normalized = data.get_normalized_data()
+    index = PlayerIndex(
+        normalized.to_numpy(), data.get_names(), data.get_attributes(), method
+    )
+    _indexes[key] = (data, index)
+    return index
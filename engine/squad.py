@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class SquadRecommendation:
+    """The trainings recommended to a squad.
+
+    :param group_sessions: The drills done by the whole group, each with the players it helps.
+    :type group_sessions: list[tuple[TrainingInfo, list[str]]]
+    :param additions: The drills added for each player, for the deficits the group sessions do not cover.
+    :type additions: dict[str, list[TrainingInfo]]
+    :param coverage: The (players, drills) deficit covered by each drill for each player, before any session.
+    :type coverage: np.ndarray
+    """
+
+    group_sessions: List[Tuple[Any, List[str]]] = field(default_factory=list)
+    additions: Dict[str, List[Any]] = field(default_factory=dict)
+    coverage: np.ndarray = None
+
+
+def get_coverage_matrix(
+    training_list: List[Any], attributes: List[str], by_position: bool = False
+) -> Tuple[List[Any], np.ndarray]:
+    """Get the drills of a catalogue and the attributes they train. Trainings with the same name (and position if by_position) are one drill training the attributes of all of them.
+
+    :param training_list: A list of TrainingInfo objects.
+    :type training_list: list[TrainingInfo]
+    :param attributes: The attribute name of each column, case insensitive.
+    :type attributes: list[str]
+    :param by_position: If True, trainings with the same name for different positions are different drills, defaults to False
+    :type by_position: bool, optional
+    :return: The drills (the first TrainingInfo of each name) and a (drills, attributes) matrix of 0 and 1.
+    :rtype: tuple[list[TrainingInfo], np.ndarray]
+    """
+    columns = {attr.strip().lower(): j for j, attr in enumerate(attributes)}
+    rows: Dict[Any, int] = {}
+    drills = []
+    cells = []
+    for info in training_list:
+        key = (info.name, info.position) if by_position else info.name
+        i = rows.get(key)
+        if i is None:
+            i = rows[key] = len(drills)
+            drills.append(info)
+        for attr in info.attributes:
+            j = columns.get(attr.strip().lower())
+            if j is not None:
+                cells.append((i, j))
+    matrix = np.zeros((len(drills), len(attributes)))
+    if cells:
+        matrix[tuple(np.array(cells).T)] = 1
+    return drills, matrix
+
+
+def recommend_squad(
+    training_list: List[Any],
+    deficits: np.ndarray,
+    attributes: List[str],
+    players: List[str] = None,
+    positions: List[str] = None,
+    group_sessions: int = 3,
+    per_player: int = 2,
+) -> SquadRecommendation:
+    """Recommend trainings to a squad in one pass over the (players, attributes, drills) coverage.
+
+    The group sessions are chosen greedily: each one is the drill helping the most players on
+    deficits not covered yet (ties broken by the deficit covered). The additions of a player are
+    the drills covering the largest remaining deficit of that player.
+
+    :param training_list: A list of TrainingInfo objects, e.g. `TrainingHandler.training_list`.
+    :type training_list: list[TrainingInfo]
+    :param deficits: A (players, attributes) matrix of deficits, e.g. benchmark minus player value. Values below 0 are ignored.
+    :type deficits: np.ndarray
+    :param attributes: The attribute name of each column.
+    :type attributes: list[str]
+    :param players: The name of each player, defaults to "Player 1", "Player 2", ...
+    :type players: list[str], optional
+    :param positions: The position of each player. A player only gets drills of the position, defaults to None for every drill.
+    :type positions: list[str], optional
+    :param group_sessions: The maximum number of group sessions, defaults to 3
+    :type group_sessions: int, optional
+    :param per_player: The maximum number of drills added per player, defaults to 2
+    :type per_player: int, optional
+    :raises ValueError: If the shape of deficits does not match players or attributes.
+    :return: The recommendation.
+    :rtype: SquadRecommendation
+    """
+    residual = np.clip(np.nan_to_num(np.asarray(deficits, dtype=np.float64)), 0, None)
+    residual = residual.reshape(-1, len(attributes))
+    if players is None:
+        players = [f"Player {i + 1}" for i in range(len(residual))]
+    if len(players) != len(residual):
+        raise ValueError("deficits must have one row per player")
+
+    drills, matrix = get_coverage_matrix(
+        training_list, attributes, positions is not None
+    )
+    allowed = np.ones((len(players), len(drills)), dtype=bool)
+    if positions is not None:
+        drill_positions = np.array([info.position.lower() for info in drills])
+        player_positions = np.array([p.lower() for p in positions])
+        allowed = player_positions[:, None] == drill_positions[None, :]
+
+    # NOTE: coverage[p, d] = sum over attributes of deficit[p, a] * trains[d, a]
+    coverage = np.where(allowed, residual @ matrix.T, 0)
+    result = SquadRecommendation(coverage=coverage)
+
+    current = coverage.copy()
+    chosen = np.zeros(len(drills), dtype=bool)
+    for _ in range(group_sessions):
+        helped = current > 0
+        counts = np.where(chosen, -1, helped.sum(axis=0))
+        if not len(drills) or counts.max() <= 0:
+            break
+        best = counts.max()
+        d = int(np.argmax(np.where(counts == best, current.sum(axis=0), -np.inf)))
+        chosen[d] = True
+        members = np.flatnonzero(helped[:, d])
+        result.group_sessions.append((drills[d], [players[p] for p in members]))
+        trained = matrix[d] > 0
+        residual[np.ix_(members, np.flatnonzero(trained))] = 0
+        current = np.where(allowed, residual @ matrix.T, 0)
+
+    current[:, chosen] = 0
+    if per_player > 0 and len(drills):
+        k = min(per_player, len(drills))
+        top = np.argsort(-current, axis=1, kind="stable")[:, :k]
+        for p, row in enumerate(top):
+            result.additions[players[p]] = [drills[d] for d in row if current[p, d] > 0]
+    return result
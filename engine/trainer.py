@@ -1,26 +1,100 @@
 import os
 import csv
-from typing import Union, List, Tuple, Dict
-from dataclasses import dataclass, field, asdict
+import sys
+from typing import Union, List, Tuple, Dict, Iterable
+from dataclasses import dataclass, field, fields
 
+import numpy as np
 
-@dataclass
+from utils import profiler
+
+from . import planner
+from . import squad
+from .search import SearchIndex, tokenize
+
+SQLITE_EXTS = (".db", ".sqlite", ".sqlite3")
+_STRIP_TABLE = str.maketrans("", "", "[]\"'")
+
+_attribute_ids: Dict[str, int] = {}
+_attribute_names: List[str] = []
+_position_ids: Dict[str, int] = {}
+
+
+def get_attribute_id(attribute: str) -> int:
+    """Get the small integer id of an attribute. Attributes are case insensitive and get a new id the first time they are seen.
+
+    :param attribute: The attribute name.
+    :type attribute: str
+    :return: The attribute id, which is also its bit in an attribute mask.
+    :rtype: int
+    """
+    key = attribute.strip().lower()
+    attr_id = _attribute_ids.get(key)
+    if attr_id is None:
+        attr_id = _attribute_ids[sys.intern(key)] = len(_attribute_names)
+        _attribute_names.append(key)
+    return attr_id
+
+
+def get_attribute_mask(attributes: Iterable[str]) -> int:
+    """Get the bitset of a list of attributes. Empty attribute names are ignored.
+
+    :param attributes: A list of attribute names.
+    :type attributes: Iterable[str]
+    :return: An int with the bit of each attribute id set.
+    :rtype: int
+    """
+    mask = 0
+    for attr in attributes:
+        if attr.strip():
+            mask |= 1 << get_attribute_id(attr)
+    return mask
+
+
+def get_attribute_names(mask: int) -> List[str]:
+    """Get the lower case attribute names of a bitset.
+
+    :param mask: A bitset from `get_attribute_mask`.
+    :type mask: int
+    :return: The attribute names in id order.
+    :rtype: list[str]
+    """
+    return [name for i, name in enumerate(_attribute_names) if mask >> i & 1]
+
+
+def get_position_id(position: str) -> int:
+    """Get the small integer id of a position.
+
+    :param position: The position name.
+    :type position: str
+    :return: The position id.
+    :rtype: int
+    """
+    key = position.lower()
+    position_id = _position_ids.get(key)
+    if position_id is None:
+        position_id = _position_ids[sys.intern(key)] = len(_position_ids)
+    return position_id
+
+
+@dataclass(slots=True)
 class TrainingInfo:
     name: str
     description: str = field(repr=False)
     position: str
     attributes: List[str]
+    attribute_mask: int = field(default=0, init=False, repr=False, compare=False)
+    position_id: int = field(default=0, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.description = self.description.replace("|n|", "\n")
-        self.position = self.position.lower()
+        self.position = sys.intern(self.position.lower())
 
         if type(self.attributes) == str:
-            _to_remove = "[]\"'"
-            for c in _to_remove:
-                self.attributes = self.attributes.replace(c, "")
-            self.attributes = self.attributes.split(",")
-            self.attributes = list(map(str.strip, self.attributes))
+            self.attributes = self.attributes.translate(_STRIP_TABLE).split(",")
+        self.attributes = [sys.intern(attr.strip()) for attr in self.attributes]
+        self.attribute_mask = get_attribute_mask(self.attributes)
+        self.position_id = get_position_id(self.position)
 
     def get(self) -> Dict[str, str]:
         """Get the dictionary version of the data.
@@ -36,20 +110,80 @@ class TrainingInfo:
             "attributes": self.attributes,
         }
 
+    def covers(self, mask: int) -> bool:
+        """Check if the training trains any of the attributes of a bitset.
+
+        :param mask: A bitset from `get_attribute_mask`.
+        :type mask: int
+        :return: True if at least one attribute is shared.
+        :rtype: bool
+        """
+        return bool(self.attribute_mask & mask)
+
+    def overlap(self, mask: int) -> int:
+        """Count the attributes of a bitset trained by the training.
+
+        :param mask: A bitset from `get_attribute_mask`.
+        :type mask: int
+        :return: The number of shared attributes.
+        :rtype: int
+        """
+        return (self.attribute_mask & mask).bit_count()
+
+
+def get_input_fields() -> List[str]:
+    """Get the names of the TrainingInfo fields given by the user, in order.
+
+    :return: A list of field names.
+    :rtype: list[str]
+    """
+    return [f.name for f in fields(TrainingInfo) if f.init]
+
 
 class TrainingHandler:
-    """This class handles the training information."""
+    """This class handles the training information.
+
+    In journal mode, `add_training_info(save=True)` appends the new training to a journal file next
+    to the csv file instead of rewriting the csv file. The journal is merged into the csv file by
+    `save` (or `compact`), and automatically once it holds COMPACT_THRESHOLD trainings.
+    """
 
-    def __init__(self, filename: str = None):
+    JOURNAL_EXT = ".journal"
+    SEARCH_EXT = ".index.json"
+    COMPACT_THRESHOLD = 256
+    NAME_WEIGHT = 2
+
+    def __init__(self, filename: str = None, journal: bool = False):
         """Initialize the TrainingHandler.
 
         :param filename: A csv file, defaults to None
         :type filename: str, optional
+        :param journal: If True, use the append-only journal mode, defaults to False
+        :type journal: bool, optional
         """
         self.training_list: List[TrainingInfo] = []
+        self.filename = None
+        self.journal = journal
+        self._journal_size = 0
+        self._search_index = None
         if filename is not None:
             self.load(filename)
 
+    @property
+    def journal_filename(self) -> Union[str, None]:
+        """The journal file of the loaded csv file."""
+        if self.filename is None:
+            return None
+        return self.filename + self.JOURNAL_EXT
+
+    @property
+    def search_filename(self) -> Union[str, None]:
+        """The full-text search index file of the loaded catalogue."""
+        if self.filename is None:
+            return None
+        return self.filename + self.SEARCH_EXT
+
+    @profiler.profile()
     def load(self, filename: str):
         """Load the training information from a csv file.
 
@@ -65,10 +199,22 @@ class TrainingHandler:
                 pass
         with open(self.filename, "r") as file:
             reader = csv.DictReader(file)
-            self._load_data(list(reader))
+            data = list(reader)
+
+        # NOTE: Trainings appended since the last compaction. They are always read, even outside journal mode.
+        self._journal_size = 0
+        if os.path.exists(self.journal_filename):
+            with open(self.journal_filename, "r", newline="") as file:
+                reader = csv.DictReader(file, fieldnames=get_input_fields())
+                journal = list(reader)
+            data.extend(journal)
+            self._journal_size = len(journal)
+        self._search_index = None
+        self._load_data(data)
 
+    @profiler.profile()
     def save(self):
-        """Save the data into the loaded csv file.
+        """Save the data into the loaded csv file. Any journal is merged into the csv file and removed.
 
         :raises Exception: If no file is loaded, raises an exception.
         """
@@ -76,26 +222,64 @@ class TrainingHandler:
             raise Exception(
                 "Could not save because TrainingHandler does not load any file yet."
             )
-        with open(self.filename, "w", newline="") as file:
-            writer = csv.DictWriter(file, self.training_list[0].get().keys())
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, get_input_fields())
             writer.writeheader()
             writer.writerows([training.get() for training in self.training_list])
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_filename, self.filename)
+        if os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
+        self._journal_size = 0
+        self._save_search_index()
         print(
             f"[TrainingHandler]   Successfully save all {len(self.training_list)} training info"
         )
 
+    def compact(self):
+        """Merge the journal into the csv file. This is the same as `save`."""
+        self.save()
+
     def add_training_info(self, new_training: TrainingInfo, save=False):
         """Add training information into the training list handler.
 
         :param new_training: A TrainingInfo object.
         :type new_training: TrainingInfo
-        :param save: If true, this method will automatically call the save method, defaults to False
+        :param save: If true, this method will automatically call the save method, or append to the journal in journal mode, defaults to False
         :type save: bool, optional
         """
         self.training_list.append(new_training)
-        if save:
+        self._index_training(new_training)
+        if not save:
+            return
+        if self.journal:
+            self._append_journal(new_training)
+        else:
             self.save()
 
+    def _append_journal(self, training: TrainingInfo):
+        """Append a training to the journal file and flush it to disk. Compact the journal when it is too long.
+
+        :param training: A TrainingInfo object.
+        :type training: TrainingInfo
+        :raises Exception: If no file is loaded, raises an exception.
+        """
+        if self.filename is None:
+            raise Exception(
+                "Could not save because TrainingHandler does not load any file yet."
+            )
+        with open(self.journal_filename, "a", newline="") as file:
+            writer = csv.DictWriter(file, get_input_fields())
+            writer.writerow(training.get())
+            file.flush()
+            os.fsync(file.fileno())
+        self._journal_size += 1
+        if self._journal_size >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    @profiler.profile()
     def retrieve(
         self,
         attributes: Union[str, List[str], Tuple[str]],
@@ -123,13 +307,13 @@ class TrainingHandler:
         filtered_info = []
         # NOTE: The done set can be remove and replace with positions filter
         done = set()
-        attributes = list(map(str.lower, attributes))
+        position_id = None if position is None else get_position_id(position)
         for attrs in attributes:
+            mask = get_attribute_mask([attrs])
             for info in self.training_list:
-                if position is not None and position.lower() != info.position.lower():
+                if position_id is not None and position_id != info.position_id:
                     continue
-                info_attribute = list(map(str.lower, info.attributes))
-                if attrs in info_attribute:
+                if info.attribute_mask & mask:
                     if info.name in done:
                         continue
                     done.add(info.name)
@@ -137,6 +321,132 @@ class TrainingHandler:
 
         return filtered_info
 
+    @profiler.profile()
+    def search(
+        self, query: str, k: int = 10, position: str = None
+    ) -> List[TrainingInfo]:
+        """Search the trainings by keywords in their name and description, e.g. "rondo", "crossing" or "1v1". See `engine.search.SearchIndex.search`.
+
+        :param query: The keywords. The last one also matches as a prefix.
+        :type query: str
+        :param k: The maximum number of trainings, defaults to 10
+        :type k: int, optional
+        :param position: Optional filter to search the trainings, defaults to None
+        :type position: str, optional
+        :return: A list of TrainingInfo objects, best match first.
+        :rtype: list[TrainingInfo]
+        """
+        index = self._get_search_index()
+        training_list = self.training_list
+        if position is None:
+            return [training_list[i] for i, _ in index.search(query, k)]
+
+        position_id = get_position_id(position)
+        result = []
+        for i, _ in index.search(query, len(index)):
+            if training_list[i].position_id == position_id:
+                result.append(training_list[i])
+                if len(result) >= k:
+                    break
+        return result
+
+    def plan_week(
+        self,
+        deficits: planner.Deficits,
+        position: str = None,
+        session_minutes: int = 90,
+        sessions: int = 3,
+        **kwargs,
+    ) -> planner.WeeklyPlan:
+        """Build the weekly plan covering the largest deficit of a player or squad. See `engine.planner.plan_week`.
+
+        :param deficits: A dictionary of attribute name and deficit, or a list of them for a squad.
+        :type deficits: dict[str, float] | list[dict[str, float]]
+        :param position: Optional filter on the trainings, defaults to None
+        :type position: str, optional
+        :param session_minutes: The length of a session, defaults to 90
+        :type session_minutes: int, optional
+        :param sessions: The number of sessions in the week, defaults to 3
+        :type sessions: int, optional
+        :return: The plan.
+        :rtype: WeeklyPlan
+        """
+        training_list = self.training_list
+        if position is not None:
+            position_id = get_position_id(position)
+            training_list = [t for t in training_list if t.position_id == position_id]
+        return planner.plan_week(
+            training_list, deficits, session_minutes, sessions, **kwargs
+        )
+
+    def recommend_squad(
+        self,
+        deficits: np.ndarray,
+        attributes: List[str],
+        players: List[str] = None,
+        positions: List[str] = None,
+        **kwargs,
+    ) -> squad.SquadRecommendation:
+        """Recommend group sessions and per-player drills to a whole squad at once, instead of calling `retrieve` for each player. See `engine.squad.recommend_squad`.
+
+        :param deficits: A (players, attributes) matrix of deficits.
+        :type deficits: np.ndarray
+        :param attributes: The attribute name of each column.
+        :type attributes: list[str]
+        :param players: The name of each player, defaults to None
+        :type players: list[str], optional
+        :param positions: The position of each player, defaults to None
+        :type positions: list[str], optional
+        :return: The recommendation.
+        :rtype: SquadRecommendation
+        """
+        return squad.recommend_squad(
+            self.training_list, deficits, attributes, players, positions, **kwargs
+        )
+
+    def _get_search_index(self) -> SearchIndex:
+        """Get the search index, loading it from search_filename if it matches the catalogue and adding the missing trainings."""
+        if self._search_index is not None:
+            return self._search_index
+
+        training_list = self.training_list
+        index = None
+        filename = self.search_filename
+        if filename is not None and os.path.exists(filename):
+            try:
+                index = SearchIndex.load(filename)
+            except ValueError:
+                index = None
+            # NOTE: The journal does not touch the catalogue file, trainings appended to it are indexed below.
+            if index is not None and (
+                os.path.getmtime(filename) < os.path.getmtime(self.filename)
+                or len(index) > len(training_list)
+                or index.keys != [info.name for info in training_list[: len(index)]]
+            ):
+                index = None
+        self._search_index = SearchIndex() if index is None else index
+        for info in training_list[len(self._search_index) :]:
+            self._index_training(info)
+        if len(self._search_index) != (len(index) if index is not None else -1):
+            self._save_search_index()
+        return self._search_index
+
+    def _index_training(self, training: TrainingInfo):
+        """Add a training to the search index if it is built. Name words weigh NAME_WEIGHT times more than description words."""
+        if self._search_index is None:
+            return
+        tokens = tokenize(training.name) * self.NAME_WEIGHT
+        tokens += tokenize(training.description)
+        self._search_index.add(tokens, training.name)
+
+    def _save_search_index(self):
+        """Save the search index next to the catalogue if it is built."""
+        if self._search_index is None or self.filename is None:
+            return
+        tmp_filename = self.search_filename + ".tmp"
+        self._search_index.save(tmp_filename)
+        os.replace(tmp_filename, self.search_filename)
+
     def _load_data(self, data: List[Dict]):
         """Load the data into the training list from the reader as a list of TrainingInfo objects.
 
@@ -147,4 +457,19 @@ class TrainingHandler:
         print("[TrainingHandler]   Data Loaded")
 
 
+def open_handler(filename: str, **kwargs) -> TrainingHandler:
+    """Open a training catalogue with the handler matching its file extension: SQLite databases (see SQLITE_EXTS) use `engine.database.SQLiteTrainingHandler`, anything else is a csv file.
+
+    :param filename: The catalogue file.
+    :type filename: str
+    :return: The training handler with the catalogue loaded.
+    :rtype: TrainingHandler
+    """
+    if filename.lower().endswith(SQLITE_EXTS):
+        from .database import SQLiteTrainingHandler
+
+        return SQLiteTrainingHandler(filename)
+    return TrainingHandler(filename, **kwargs)
+
+
 Trainer = TrainingHandler
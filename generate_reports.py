@@ -0,0 +1,59 @@
+"""Write the printable reports of many players, see `engine.report`.
+
+Usage::
+
+    python generate_reports.py players.json [--output reports] [--format pdf] [--workers 8]
+
+The players file is a JSON or csv file of assessment results, see `engine.report.load_players`.
+Each report has the attribute sliders and meters of the result page, then the cards of the
+recommended trainings.
+"""
+
+import os
+import time
+import argparse
+
+from engine import report
+from engine import trainer
+
+DEFAULT_OUTPUT = "reports"
+DEFAULT_SEASON = "data_new"
+DEFAULT_TRAINING_FILE = os.path.join("data", "training", "training_01.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("players", help="The JSON or csv file of the players.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--format", choices=report.FORMATS, default="pdf")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of processes, defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--season",
+        default=DEFAULT_SEASON,
+        help="The benchmark season of the players without one.",
+    )
+    parser.add_argument(
+        "--training", default=DEFAULT_TRAINING_FILE, help="The training catalogue."
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    players = report.load_players(args.players)
+    handler = trainer.open_handler(args.training)
+    reports = report.assess_players(players, handler, season=args.season)
+    written = report.generate_reports(
+        reports, args.output, format_=args.format, workers=args.workers
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"[report]   Written {len(written)} files for {len(reports)} players to {args.output} in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import os
+
 import customtkinter as ctk
 
 import ui
+from utils import profiler
 
 
 class MainApplication(ctk.CTkFrame):
@@ -10,6 +13,8 @@ class MainApplication(ctk.CTkFrame):
         self.parent.update()
         self.size = (self.parent.winfo_width(), self.parent.winfo_height())
         self.active_page = None
+        self._overlay = None
+        self._build_times = {}
         self.change_page(ui.WelcomePage)
 
     def change_page(self, page: ui.Page, **kwargs):
@@ -18,11 +23,33 @@ class MainApplication(ctk.CTkFrame):
         :param page: Page object to change into.
         :type page: Page
         """
-        new_page = page(self, **kwargs)
-        if self.active_page is not None:
-            self.active_page.destroy()
-        self.active_page = new_page
-        self.active_page.pack(fill="both", expand=True)
+        with profiler.span("change_page", "ui", page=page.__name__) as span:
+            new_page = page(self, **kwargs)
+            if self.active_page is not None:
+                self.active_page.destroy()
+            self.active_page = new_page
+            self.active_page.pack(fill="both", expand=True)
+        if profiler.OVERLAY:
+            self._show_build_time(page.__name__, span.duration / 1000)
+
+    def _show_build_time(self, name: str, duration: float):
+        """Show the last build time of every page visited on top of the active page.
+
+        :param name: The page name.
+        :type name: str
+        :param duration: The build time in milliseconds.
+        :type duration: float
+        """
+        self._build_times[name] = duration
+        if self._overlay is None:
+            self._overlay = ctk.CTkLabel(
+                self, fg_color="black", text_color="#4cec1b", justify="left"
+            )
+        self._overlay.configure(
+            text="\n".join(f"{k}: {v:.1f} ms" for k, v in self._build_times.items())
+        )
+        self._overlay.place(relx=1.0, rely=0.0, anchor="ne")
+        self._overlay.lift()
 
 
 def main():
@@ -31,6 +58,9 @@ def main():
     app.title("Personalized Coaching Assistant")
     app.after(1, app.state, "zoomed")
     MainApplication(app).pack(fill="both", expand=True)
+    if os.environ.get("PCA_EXIT_ON_IDLE"):
+        # NOTE: Used to time the startup, see benchmarks/bench_startup.py
+        app.after_idle(app.destroy)
     app.mainloop()
 
 
@@ -0,0 +1,82 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized build. Run `python prepare_bundle.py` first, then `pyinstaller pca_v0.2_startup.spec`.
+# Compared with pca_v0.2.spec:
+#   - the data is the prepared bundle (columnar files and benchmark stores) instead of the raw CSV files,
+#   - the page backgrounds and titles are pre-rendered, see utils/prebuilt.py,
+#   - the scrapper and its dependencies are excluded, the app never collects data at runtime,
+#   - no UPX, which is decompressed on every launch.
+import os
+
+from PyInstaller.utils.hooks import collect_data_files
+
+block_cipher = None
+
+_root = SPECPATH
+_bundle = os.path.join(_root, 'build', 'bundle')
+if not os.path.isdir(_bundle):
+    raise SystemExit('build/bundle does not exist, run `python prepare_bundle.py` first.')
+
+_data = collect_data_files('customtkinter') + [
+	(os.path.join(_root, 'assets', 'fonts'), os.path.join('assets', 'fonts')),
+	(os.path.join(_root, 'assets', '*.png'), 'assets'),
+	(os.path.join(_bundle, 'assets', 'prebuilt'), os.path.join('assets', 'prebuilt')),
+	(os.path.join(_bundle, 'data'), 'data'),
+]
+
+_excludes = [
+	'selenium',
+	'webdriver_manager',
+	'rich',
+	'requests',
+	'data_collection.scrapper',
+	'data_collection.collect_data',
+	'benchmarks',
+	'IPython',
+	'matplotlib',
+	'pytest',
+]
+
+a = Analysis(
+    ['main.py'],
+    pathex=[_root],
+    binaries=[],
+    datas=_data,
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=_excludes,
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='pca_v0.2.1_startup',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='pca_v0.2.1_startup',
+)
@@ -0,0 +1,120 @@
+"""Prepare the data and assets of the startup-optimized build, see `pca_v0.2_startup.spec`.
+
+Usage::
+
+    python prepare_bundle.py [--output build/bundle] [--sizes 1350x800 1920x1080]
+    pyinstaller pca_v0.2_startup.spec
+
+The bundle ships, instead of the raw CSV files:
+
+* the columnar file (.npy) of each season and position, loaded without parsing,
+* the benchmark store (.bench) of each season and position, so nothing is processed at startup,
+* the pre-rendered page backgrounds and titles, see `utils.prebuilt`.
+"""
+
+import os
+import shutil
+import argparse
+from typing import List, Tuple
+
+import pandas as pd
+
+from engine import benchmark
+from utils import columnar
+from utils import datahandler
+from utils import prebuilt
+from utils import schema
+from utils import store
+
+DEFAULT_OUTPUT = os.path.join("build", "bundle")
+
+
+def build_data(root: str, output: str) -> List[str]:
+    """Write the columnar file and the benchmark store of every season and position.
+
+    :param root: The data directory.
+    :type root: str
+    :param output: The data directory of the bundle.
+    :type output: str
+    :return: The written filenames.
+    :rtype: list[str]
+    """
+    written = []
+    for season in sorted(os.listdir(root), key=benchmark.season_key):
+        for position in schema.get_positions():
+            source = os.path.join(root, season, f"{position}_raw_data.csv")
+            if not (os.path.exists(source) or columnar.is_up_to_date(source)):
+                continue
+            handler = datahandler.DataHandler(
+                datahandler.get_processor(position), source
+            )
+            try:
+                data = handler.get_pd_data()
+            except (KeyError, ValueError, ZeroDivisionError) as e:
+                print(
+                    f"[bundle]   Skipped {position} in {season}: {type(e).__name__} {e}"
+                )
+                continue
+
+            os.makedirs(os.path.join(output, season), exist_ok=True)
+            target = columnar.get_columnar_location(
+                os.path.join(output, season, os.path.basename(source))
+            )
+            if columnar.is_up_to_date(source):
+                shutil.copyfile(columnar.get_columnar_location(source), target)
+            else:
+                raw = pd.read_csv(source, dtype=str, keep_default_na=False)
+                columnar.write_columnar(raw, target)
+            # NOTE: Written after the columnar file, so the store is never seen as out of date.
+            bench = store.get_store_location(position, season, root=output)
+            store.write_store(
+                data,
+                bench,
+                names=handler.get_names(),
+                season=season,
+                position=position,
+            )
+            written.extend([target, bench])
+    return written
+
+
+def build_training(root: str, output: str) -> List[str]:
+    """Copy the training catalogues."""
+    source = os.path.join(root, "training")
+    if not os.path.isdir(source):
+        return []
+    target = os.path.join(output, "training")
+    shutil.copytree(source, target, dirs_exist_ok=True)
+    return [os.path.join(target, f) for f in os.listdir(target)]
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default="data", help="The data directory.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--sizes",
+        type=parse_size,
+        nargs="+",
+        default=prebuilt.SIZES,
+        help="The window sizes of the pre-rendered backgrounds, e.g. 1920x1080.",
+    )
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        shutil.rmtree(args.output)
+    data = os.path.join(args.output, "data")
+    written = build_data(args.root, data) + build_training(args.root, data)
+    written += prebuilt.build(
+        os.path.join(args.output, "assets", "prebuilt"), args.sizes
+    )
+    print(f"[bundle]   Written {len(written)} files to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Headless tests of the background resize state machine of `ui.page.Page`.
+
+Tk is never started: `after`/`after_cancel` are replaced by a fake clock and the worker thread by
+futures completed by hand.
+"""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from ui import page as upage
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.jobs.append((future, fn, args))
+        return future
+
+    def finish(self, index: int = 0):
+        future, fn, args = self.jobs.pop(index)
+        future.set_result(fn(*args))
+
+
+class FakePage(upage.Page):
+    """A Page without Tk: the `after` callbacks run when the fake clock advances."""
+
+    def __init__(self, size):
+        self.now = 0
+        self.timers = {}
+        self._next_id = 0
+        self._bg_builder = lambda size: Image.new("RGB", size)
+        self._bg_key = object()
+        self._bg_size = size
+        self._pending_size = None
+        self._resize_job = None
+        self._render_id = 0
+
+    def after(self, delay, callback, *args):
+        self._next_id += 1
+        self.timers[self._next_id] = (self.now + delay, callback, args)
+        return self._next_id
+
+    def after_cancel(self, job):
+        self.timers.pop(job, None)
+
+    def winfo_exists(self):
+        return True
+
+    def _set_bg_image(self, image):
+        self._bg_size = image.size
+
+    def advance(self, ms: int):
+        end = self.now + ms
+        while True:
+            due = [(t, i) for i, (t, _, _) in self.timers.items() if t <= end]
+            if not due:
+                break
+            t, i = min(due)
+            self.now = t
+            _, callback, args = self.timers.pop(i)
+            callback(*args)
+        self.now = end
+
+    def resize(self, size):
+        self._resize_bg_image(SimpleNamespace(width=size[0], height=size[1]))
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = FakeExecutor()
+    monkeypatch.setattr(upage, "_executor", executor)
+    monkeypatch.setattr(upage, "_backgrounds", upage.OrderedDict())
+    return executor
+
+
+def test_resize_is_debounced(executor):
+    page = FakePage((800, 600))
+    for width in range(900, 1200, 50):
+        page.resize((width, 700))
+        page.advance(50)
+    assert executor.jobs == []
+    page.advance(page.RESIZE_DELAY)
+    assert len(executor.jobs) == 1
+    executor.finish()
+    page.advance(page.POLL_DELAY)
+    assert page._bg_size == (1150, 700)
+
+
+def test_resize_back_to_current_size_cancels_pending_resize(executor):
+    page = FakePage((800, 600))
+    page.resize((1200, 900))
+    page.advance(50)
+    page.resize((800, 600))
+    page.advance(1000)
+    assert executor.jobs == []
+    assert page._bg_size == (800, 600)
+
+
+def test_resize_back_to_current_size_drops_render_in_flight(executor):
+    page = FakePage((800, 600))
+    page.resize((1200, 900))
+    page.advance(page.RESIZE_DELAY)
+    page.resize((800, 600))
+    executor.finish()
+    page.advance(1000)
+    assert page._bg_size == (800, 600)
+
+
+def test_cached_background_is_not_overwritten_by_render_in_flight(executor):
+    page = FakePage((800, 600))
+    upage._backgrounds[(page._bg_key, (1000, 700))] = Image.new("RGB", (1000, 700))
+    page.resize((1300, 950))
+    page.advance(page.RESIZE_DELAY)
+    assert len(executor.jobs) == 1
+    page.resize((1000, 700))
+    page.advance(page.RESIZE_DELAY)
+    assert page._bg_size == (1000, 700)
+    executor.finish()
+    page.advance(1000)
+    assert page._bg_size == (1000, 700)
+    assert (page._bg_key, (1300, 950)) in upage._backgrounds
@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import pytest
+
+from engine import planner
+from engine.trainer import TrainingInfo
+
+ATTRIBUTES = list("abcde")
+
+
+def make_catalogue(attributes):
+    return [
+        TrainingInfo(f"d{i}", "", "defender", attrs)
+        for i, attrs in enumerate(attributes)
+    ]
+
+
+def brute_force(catalogue, deficits, minutes, sessions, session_minutes, **options):
+    """The best plan value over every way to put each drill in sessions."""
+    max_repeats = min(options.get("max_repeats", 1), sessions)
+    repetitions = options.get("repetitions", 1)
+    weights = {
+        attr: deficit / repetitions
+        for attr, deficit in planner.get_total_deficits(deficits).items()
+    }
+    choices = [
+        [
+            c
+            for k in range(max_repeats + 1)
+            for c in itertools.combinations(range(sessions), k)
+        ]
+        for _ in catalogue
+    ]
+    best = 0.0
+    for assignment in itertools.product(*choices):
+        used = [0] * sessions
+        trained = dict.fromkeys(weights, 0)
+        for info, chosen in zip(catalogue, assignment):
+            for s in chosen:
+                used[s] += minutes[info.name]
+            for attr in info.attributes:
+                trained[attr] += len(chosen)
+        if max(used) <= session_minutes:
+            value = sum(w * min(trained[a], repetitions) for a, w in weights.items())
+            best = max(best, value)
+    return best
+
+
+def check_plan(plan, catalogue, minutes, session_minutes, max_repeats):
+    repeats = {}
+    for session in plan.sessions:
+        names = [info.name for info in session]
+        assert len(names) == len(set(names))
+        assert sum(minutes[name] for name in names) <= session_minutes
+        for name in names:
+            repeats[name] = repeats.get(name, 0) + 1
+    assert max(repeats.values(), default=0) <= max_repeats
+
+
+def test_exact_plan_fits_the_sessions():
+    catalogue = make_catalogue([["d", "e"], ["d"], ["b", "d"], ["a"], ["c"]])
+    minutes = {"d0": 25, "d1": 20, "d2": 40, "d3": 25, "d4": 30}
+    deficits = {"a": 9, "b": 17, "c": 10, "d": 14, "e": 9}
+    plan = planner.plan_week(
+        catalogue, deficits, 45, 2, minutes=minutes, method="exact"
+    )
+    assert plan.method == "exact"
+    assert plan.value == pytest.approx(41)
+    check_plan(plan, catalogue, minutes, 45, 1)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_exact_plan_matches_brute_force(seed):
+    rng = random.Random(seed)
+    catalogue = make_catalogue(
+        [rng.sample(ATTRIBUTES, rng.randint(1, 2)) for _ in range(rng.randint(3, 5))]
+    )
+    minutes = {info.name: rng.choice([10, 15, 20, 25, 30, 40]) for info in catalogue}
+    deficits = {attr: rng.randint(1, 20) for attr in ATTRIBUTES}
+    sessions = rng.randint(1, 3)
+    session_minutes = rng.choice([30, 45, 60])
+    options = dict(max_repeats=rng.randint(1, 2), repetitions=rng.randint(1, 2))
+
+    plan = planner.plan_week(
+        catalogue,
+        deficits,
+        session_minutes,
+        sessions,
+        minutes=minutes,
+        method="exact",
+        **options,
+    )
+    assert plan.method == "exact"
+    assert plan.value == pytest.approx(
+        brute_force(catalogue, deficits, minutes, sessions, session_minutes, **options)
+    )
+    check_plan(
+        plan, catalogue, minutes, session_minutes, min(options["max_repeats"], sessions)
+    )
@@ -0,0 +1,35 @@
+import json
+
+from engine import report
+
+
+def test_load_players_skips_invalid_rows(tmp_path):
+    filename = tmp_path / "players.csv"
+    filename.write_text(
+        "name,position,Tackles,Interceptions\n"
+        "A,Defender,3,4\n"
+        "B,keeper,1,2\n"
+        "C,defender,x,2\n"
+        "D,,1,1\n"
+        "E,defender,,7\n"
+    )
+    players = report.load_players(str(filename))
+    assert [p["name"] for p in players] == ["A", "E"]
+    assert players[0]["position"] == "defender"
+    assert players[1]["data"] == {"Interceptions": 7}
+
+
+def test_load_players_skips_invalid_objects(tmp_path):
+    filename = tmp_path / "players.json"
+    filename.write_text(
+        json.dumps(
+            [
+                {"name": "A", "position": "forward", "data": {"Goals": 3}},
+                {"name": "B", "data": {}},
+                {"name": "C", "position": "midfielder", "data": {"Goals": "nan"}},
+                "D",
+            ]
+        )
+    )
+    players = report.load_players(str(filename))
+    assert [p["name"] for p in players] == ["A"]
@@ -0,0 +1,12 @@
+import os
+
+from utils import schema
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_attributes_file_is_generated_from_the_schema():
+    with open(os.path.join(ROOT, schema.ATTRIBUTES_FILE)) as file:
+        assert (
+            file.read() == schema.format_attributes()
+        ), "data/attributes.txt is out of date, run `python -m utils.schema`"
@@ -1,4 +1,5 @@
 import tkinter as tk
+import numpy as np
 import customtkinter as ctk
 from typing import List, Dict
 
@@ -6,11 +7,35 @@ from . import buttons
 from .page import Page
 from .widgets import Meter, SilderMeter, CardButton
 from engine import trainer
+from engine import benchmark
+from engine import similarity
+from engine import session
 from utils import datahandler
+from utils import schema
 from utils import font as ufont
 from utils import image as uimage
 
+# NOTE: The preferred benchmark season. If it has no benchmark for a position, the latest season that has one is used.
 _SEASON = "data_new"
+# NOTE: How the player is scored against the benchmark. "mean" compares against the average of the normalized data, "percentile" uses the percentile rank against the median.
+_SCORING = "mean"
+# NOTE: The training catalogue, either a csv file or a SQLite database (see engine.database).
+_TRAINING_FILE = "data/training/training_01.csv"
+_PREVIEW_SIZE = 3
+
+_training_handler = None
+
+
+def _get_training_handler() -> trainer.TrainingHandler:
+    """Get the training handler of the training file. The file is loaded once and shared by every page.
+
+    :return: The training handler.
+    :rtype: trainer.TrainingHandler
+    """
+    global _training_handler
+    if _training_handler is None:
+        _training_handler = trainer.open_handler(_TRAINING_FILE)
+    return _training_handler
 
 
 class WelcomePage(Page):
@@ -38,8 +63,7 @@ class PositionSelectPage(Page):
         self._init_widget()
 
     def _add_bg(self):
-        image = uimage.text_bg_builder("Select Position", self.parent.size)
-        self.add_background(image)
+        self.add_text_background("Select Position")
 
     def _init_widget(self):
         f = ufont.RenderFont("assets/fonts/Anton-Regular.ttf")
@@ -63,7 +87,7 @@ class PositionSelectPage(Page):
         self.button_images = {
             pos: self._load_button_image(pos, button_size) for pos in positions
         }
-        buttons = {
+        self._buttons = buttons = {
             pos: ctk.CTkButton(
                 button_frame,
                 text="",
@@ -95,28 +119,35 @@ class PositionSelectPage(Page):
         :param event: Button id. This is related to the available positions name.
         :type event: str
         """
-        self.parent.change_page(DataInputPage, position=event)
+        try:
+            season = benchmark.get_engine().resolve_season(event, _SEASON)
+        except ValueError as e:
+            # NOTE: There is no data to assess this position against.
+            print(f"[PositionSelectPage]   {e}")
+            self._buttons[event].configure(state="disabled")
+            return
+        self.parent.change_page(DataInputPage, position=event, season=season)
 
 
 class DataInputPage(Page):
-    def __init__(self, parent, position=None, **kwargs):
+    def __init__(self, parent, position=None, season=_SEASON, **kwargs):
         super().__init__(parent, **kwargs)
         if type(position) is not str:
             raise ValueError("Position must be a str")
 
         self._data = {}
         self._position = position.lower()
-        self._processor = datahandler.PROCESSOR[self._position]
-        self._data_handler = datahandler.DataHandler(
-            self._processor,
-            datahandler.get_file_location(self._position, season=_SEASON),
+        self._schema = schema.get_schema(self._position)
+        self._season = season
+        self._benchmark = datahandler.get_benchmark_store(
+            self._position, season=self._season
         )
+        self._init_session()
         self._add_bg()
         self._init_widget()
 
     def _add_bg(self):
-        image = uimage.text_bg_builder(self._position, self.parent.size)
-        self.add_background(image)
+        self.add_text_background(self._position)
 
     def _init_widget(self):
         _container = ctk.CTkFrame(self, fg_color=self.fg_color1)
@@ -126,6 +157,9 @@ class DataInputPage(Page):
             self, lambda: self._callback("proceed")
         )
         _back_button = buttons.create_back_button(self, lambda: self._callback("back"))
+        self._preview_label = ctk.CTkLabel(
+            self, text="", font=("arial", 22), fg_color=self.fg_color1
+        )
 
         _item_per_column = 6
         for i, attr in enumerate(self._load_data_model()):
@@ -143,8 +177,31 @@ class DataInputPage(Page):
         _container.place(relx=0.5, rely=0.5, anchor="c")
         _inputs_frame.pack(side="left", expand=True, anchor="e")
         _position_label.pack(side="left", anchor="w", padx=25)
+        self._preview_label.place(relx=0.5, rely=0.95, anchor="s")
         _proceed_button.place(relx=0.95, rely=0.95, anchor="e")
         _back_button.place(relx=0.05, rely=0.05, anchor="nw")
+        self._refresh_preview()
+
+    def _init_session(self):
+        """Create the assessment session holding the benchmark, the deficits and the recommended trainings.
+        The slider events then only update the attribute that changed.
+        """
+        thresholds = self._benchmark.get_normalized_data().mean().astype(int)
+        self._session = session.AssessmentSession(
+            self._position,
+            thresholds.to_dict(),
+            _get_training_handler().training_list,
+        )
+
+    def _refresh_preview(self):
+        """Show the top recommended trainings of the current slider values."""
+        trainings = self._session.get_recommendations(_PREVIEW_SIZE)
+        if trainings:
+            names = ", ".join(training.name for training in trainings)
+            text = f"Recommended trainings: {names}"
+        else:
+            text = "There is no training recomended."
+        self._preview_label.configure(text=text)
 
     def _load_data_model(self) -> List[str]:
         """
@@ -153,7 +210,7 @@ class DataInputPage(Page):
         :return: A list of attributes name for each position
         :rtype: list
         """
-        return self._data_handler.get_attributes()
+        return self._schema.get_attributes()
 
     def _create_input_field(self, parent, name: str) -> ctk.CTkFrame:
         """Create a new input field consist of label, slider and meter.
@@ -168,7 +225,7 @@ class DataInputPage(Page):
         _frame = ctk.CTkFrame(parent, fg_color="transparent")
         _label = ctk.CTkLabel(
             _frame,
-            text=name.capitalize(),
+            text=self._schema.get_display_name(name),
             justify="left",
             anchor="w",
             font=("arial", 30),
@@ -200,6 +257,7 @@ class DataInputPage(Page):
         _meter.grid(row=1, column=1)
 
         self._data[name] = _var
+        self._session.update(name, _var.get())
         return _frame
 
     def _slider_event(self, val, id_):
@@ -211,6 +269,8 @@ class DataInputPage(Page):
         :type id_: str
         """
         self._data[id_].set(str(int(val)))
+        self._session.update(id_, int(val))
+        self._refresh_preview()
 
     def _callback(self, event):
         """Callback when the proceed button is clicked."""
@@ -228,7 +288,7 @@ class DataInputPage(Page):
         """
         data = self._data.copy()
         data = {k: v.get() for k, v in data.items()}
-        return {"position": self._position, "data": data}
+        return {"position": self._position, "season": self._season, "data": data}
 
 
 class ResultPage(Page):
@@ -236,19 +296,19 @@ class ResultPage(Page):
         super().__init__(parent, **kwargs)
         self._data = data
         self._position = self._data["position"]
-        self._processor = datahandler.PROCESSOR[self._position]
-        self._data_handler = datahandler.DataHandler(
-            self._processor,
-            datahandler.get_file_location(self._position, season=_SEASON),
+        self._schema = schema.get_schema(self._position)
+        self._season = self._data.get("season", _SEASON)
+        self._benchmark = datahandler.get_benchmark_store(
+            self._position, season=self._season
         )
+        self._scores = None
 
         self._load_threshold()
         self._add_bg()
         self._init_widgets()
 
     def _add_bg(self):
-        image = uimage.text_bg_builder("RESULT", self.parent.size)
-        self.add_background(image)
+        self.add_text_background("RESULT")
 
     def _init_widgets(self):
         """Initialize the widgets."""
@@ -260,6 +320,7 @@ class ResultPage(Page):
             self, lambda: self._callback("proceed")
         )
         _back_button = buttons.create_back_button(self, lambda: self._callback("back"))
+        _similar_label = self._create_similarity_widget(self)
 
         for i, attr_name in enumerate(self._data["data"].keys()):
             _attr_frame = self._create_attribute_widget(_result_frame, attr_name)
@@ -268,6 +329,7 @@ class ResultPage(Page):
         _container.place(relx=0.5, rely=0.5, anchor="c")
         _result_frame.pack(side="left", anchor="e")
         _label.pack(side="left", anchor="w", expand=True)
+        _similar_label.place(relx=0.5, rely=0.95, anchor="s")
         _proceed_button.place(relx=0.95, rely=0.95, anchor="e")
         _back_button.place(relx=0.05, rely=0.05, anchor="nw")
 
@@ -284,17 +346,45 @@ class ResultPage(Page):
         _label = ctk.CTkLabel(parent, text="", image=_text_image)
         return _label
 
-    def _access_attributes(self) -> Dict[str, bool]:
-        """Compare the attributes of player and average top 10 scores.
+    def _create_similarity_widget(self, parent) -> ctk.CTkLabel:
+        """Create CTkLabel widget listing the professional players most similar to the player.
 
-        :returns: A dictionary of attributes difference between player attrubutes and average top 10 league attributes.
+        :return: Similar players label
+        :rtype: ctk.CTkLabel
+        """
+        index = similarity.get_index(self._position, season=self._season)
+        matches = index.query(self._data["data"], k=3)
+        names = ", ".join(name for name, _ in matches)
+        return ctk.CTkLabel(
+            parent,
+            text=f"Most similar players: {names}",
+            font=("arial", 24),
+            fg_color=self.fg_color1,
+        )
+
+    def _access_attributes(self) -> Dict[str, int]:
+        """Compare the attributes of player and average top 10 scores. The result is computed once per page.
+
+        :returns: A dictionary of attributes difference between player attrubutes and average top 10 league attributes. With percentile scoring, it is the difference between the player percentile rank and the median.
         :rtype: dict[str, int]
         """
+        if self._scores is not None:
+            return self._scores
+
         result = {}
         player_attrs = self._data["data"]
-        sample_attrs = self._sample_average
-        for pk, pv in player_attrs.items():
-            result[pk] = int(player_attrs[pk]) - int(sample_attrs[pk])
+        if _SCORING == "percentile":
+            ecdf = self._benchmark.get_ecdf()
+            span = ecdf.high - ecdf.low
+            values = np.array([float(player_attrs[a]) for a in ecdf.attributes])
+            ranks = ecdf.percentiles(ecdf.low + values / 100 * span)
+            for attr, rank in zip(ecdf.attributes, np.nan_to_num(ranks, nan=50)):
+                result[attr] = int(rank) - 50
+        else:
+            sample_attrs = self._sample_average
+            for pk, pv in player_attrs.items():
+                result[pk] = int(player_attrs[pk]) - int(sample_attrs[pk])
+        self._scores = result
         return result
 
     def _create_attribute_widget(self, parent, name: str) -> ctk.CTkFrame:
@@ -314,7 +404,7 @@ class ResultPage(Page):
         _frame = ctk.CTkFrame(parent, fg_color="transparent")
         _label = ctk.CTkLabel(
             _frame,
-            text=name.capitalize(),
+            text=self._schema.get_display_name(name),
             justify="left",
             anchor="w",
             font=("arial", 30),
@@ -350,7 +440,15 @@ class ResultPage(Page):
 
     def _load_threshold(self):
         """Load the threshold data"""
-        sample_data = self._data_handler.get_normalized_data()
+        if _SCORING == "percentile":
+            ecdf = self._benchmark.get_ecdf()
+            span = ecdf.high - ecdf.low
+            medians = np.array([ecdf.quantile(a, 0.5) for a in ecdf.attributes])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                threshold = np.nan_to_num((medians - ecdf.low) / span * 100)
+            self._sample_average = dict(zip(ecdf.attributes, threshold.astype(int)))
+            return
+        sample_data = self._benchmark.get_normalized_data()
         self._sample_average = sample_data.mean().astype(int)
 
     def _callback(self, event: str):
@@ -389,13 +487,12 @@ class TrainingRecommendationPage(Page):
         self._attributes = attributes
         # NOTE: This position is used to filter the training info. Use none to use all regardless of position.
         self._position = position
-        self._training_handler = trainer.Trainer("data/training/training_01.csv")
+        self._training_handler = _get_training_handler()
         self._add_bg()
         self._init_widget()
 
     def _add_bg(self):
-        image = uimage.text_bg_builder("TRAININGS", self.parent.size)
-        self.add_background(image)
+        self.add_text_background("TRAININGS")
 
     def _init_widget(self):
         """Initialize the widget."""
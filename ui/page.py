@@ -1,15 +1,46 @@
 import tkinter as tk
 import customtkinter as ctk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Tuple, Union
 from PIL import Image, ImageTk
 
+from utils import image as uimage
+
+BackgroundBuilder = Callable[[Tuple[int, int]], Image.Image]
+
+# NOTE: One worker, so a burst of resizes never renders several backgrounds at once.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+_backgrounds: "OrderedDict[Tuple[Hashable, Tuple[int, int]], Image.Image]" = (
+    OrderedDict()
+)
+
 
 class Page(ctk.CTkFrame):
+    """A page of the app, with an optional background.
+
+    When the window is resized, the background is not rescaled on every `<Configure>` event. Once
+    the events stop for RESIZE_DELAY milliseconds, a background of the new size is generated in a
+    worker thread and swapped in. The last BACKGROUND_CACHE_SIZE backgrounds are kept, so going
+    back to a common window size swaps the background immediately.
+    """
+
     fg_color1 = "#221f1f"
     fg_color2 = "#252323"
 
+    RESIZE_DELAY = 150
+    POLL_DELAY = 20
+    BACKGROUND_CACHE_SIZE = 6
+
     def __init__(self, parent, bg_image=None, **kwargs):
         super().__init__(parent)
         self.parent = parent
+        self._bg_builder: Union[BackgroundBuilder, None] = None
+        self._bg_key: Hashable = None
+        self._bg_size: Tuple[int, int] = None
+        self._pending_size: Tuple[int, int] = None
+        self._resize_job = None
+        self._render_id = 0
         if bg_image is not None:
             if type(bg_image) == str:
                 self.add_background_from_file(bg_image)
@@ -18,9 +49,68 @@ class Page(ctk.CTkFrame):
         self._set_data(**kwargs)
 
     def _resize_bg_image(self, event):
-        nw = event.width
-        nh = event.height
-        self.bg_image.configure(size=(nw, nh))
+        """Debounce the `<Configure>` events of the background."""
+        size = (event.width, event.height)
+        if size[0] <= 1 or size[1] <= 1:
+            return
+        if size == self._bg_size:
+            # NOTE: Back to the size of the current background, drop the pending resize and any render in flight.
+            if self._resize_job is not None:
+                self.after_cancel(self._resize_job)
+                self._resize_job = None
+            self._pending_size = None
+            self._render_id += 1
+            return
+        self._pending_size = size
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(self.RESIZE_DELAY, self._render_bg_image)
+
+    def _render_bg_image(self):
+        """Swap in a cached background of the pending size, or generate it in the worker."""
+        self._resize_job = None
+        # NOTE: Every render in flight is outdated, even when the new background is cached.
+        self._render_id += 1
+        size = self._pending_size
+        cached = _backgrounds.get((self._bg_key, size))
+        if cached is not None:
+            _backgrounds.move_to_end((self._bg_key, size))
+            self._set_bg_image(cached)
+            return
+        future = _executor.submit(self._bg_builder, size)
+        self.after(self.POLL_DELAY, self._poll_bg_image, future, self._render_id, size)
+
+    def _poll_bg_image(self, future: Future, render_id: int, size: Tuple[int, int]):
+        """Wait for the worker without blocking the event loop. Tk is only used from this thread."""
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(self.POLL_DELAY, self._poll_bg_image, future, render_id, size)
+            return
+        try:
+            image = future.result()
+        except Exception as e:
+            print(f"[Page]   Could not render the background: {type(e).__name__} {e}")
+            return
+        _backgrounds[(self._bg_key, size)] = image
+        while len(_backgrounds) > self.BACKGROUND_CACHE_SIZE:
+            _backgrounds.popitem(last=False)
+        # NOTE: A newer resize is pending or rendering, this background is already outdated.
+        if render_id != self._render_id or self._resize_job is not None:
+            return
+        self._set_bg_image(image)
+
+    def _set_bg_image(self, image: Image.Image):
+        """Replace the background image, at its own size."""
+        self._bg_size = image.size
+        self.bg_image = ctk.CTkImage(dark_image=image, size=image.size)
+        self.bg.configure(image=self.bg_image)
+
+    def destroy(self):
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+            self._resize_job = None
+        super().destroy()
 
     def _set_data(self, **kwargs):
         for k, v in kwargs.items():
@@ -28,9 +118,45 @@ class Page(ctk.CTkFrame):
 
     def add_background_from_file(self, bg_image):
         self.image = Image.open(bg_image)
-        self.add_background(self.image)
+        self.add_background(
+            self.image,
+            lambda size: self.image.resize(size, Image.LANCZOS),
+            key=("file", bg_image),
+        )
+
+    def add_text_background(self, text: str):
+        """Add a background of the text repeated diagonally, see `utils.image.text_bg_builder`.
+
+        :param text: Text to be repeated.
+        :type text: str
+        """
+        image = uimage.text_bg_builder(text, self.parent.size)
+        self.add_background(
+            image,
+            lambda size: uimage.text_bg_builder(text, size),
+            key=("text", text),
+        )
+
+    def add_background(
+        self,
+        bg_image: Image.Image,
+        builder: BackgroundBuilder = None,
+        key: Hashable = None,
+    ):
+        """Add a background image.
 
-    def add_background(self, bg_image):
+        :param bg_image: The background image.
+        :type bg_image: Image
+        :param builder: A function generating the background for a (width, height), called in a worker thread when the page is resized. Defaults to rescaling bg_image.
+        :type builder: Callable[[tuple[int, int]], Image], optional
+        :param key: Identifies the backgrounds of builder, to reuse them across pages, defaults to None to not share them.
+        :type key: Hashable, optional
+        """
+        if builder is None:
+            builder = lambda size: bg_image.resize(size, Image.LANCZOS)
+        self._bg_builder = builder
+        self._bg_key = key if key is not None else object()
+        self._bg_size = bg_image.size
         self.bg_image = ctk.CTkImage(dark_image=bg_image, size=bg_image.size)
         self.bg = ctk.CTkLabel(self, text="", image=self.bg_image)
         self.bg.place(x=0, y=0, relwidth=1, relheight=1)
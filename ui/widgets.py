@@ -1,8 +1,10 @@
 import tkinter as tk
 import customtkinter as ctk
-from PIL import Image, ImageDraw, ImageTk, ImageFont, ImageColor
+from PIL import Image
 
-from utils import font as ufont
+from utils import profiler
+from utils import render
+from utils import render_cache
 
 
 class Meter(ctk.CTkFrame):
@@ -39,7 +41,7 @@ class Meter(ctk.CTkFrame):
     :raises TypeError: If variable is not a tk.IntVar or None object, raise TypeError
     """
 
-    M = 3
+    M = render.SCALE
 
     def __init__(
         self,
@@ -90,94 +92,43 @@ class Meter(ctk.CTkFrame):
 
         self._setup_widget()
 
+    @profiler.profile()
     def _draw_meter(self, *_):
-        """Draw a complete meter"""
-        img = self._base_image.copy()
-        draw = ImageDraw.Draw(img, mode="RGBA")
-        self._draw_solid_meter(draw)
-        if self._showtext:
-            self._draw_meter_label(draw)
+        """Draw a complete meter, see `utils.render.render_meter`."""
+        img = render.render_meter(
+            self.current_value.get(),
+            max_value=self.max_value,
+            meter_size=self._metersize,
+            meter_thickness=self._meterthickness,
+            trough_color=self._metertrough,
+            wedge_size=self._wedgesize,
+            fg_color=self._meterforeground,
+            prefix=self._prefixtext,
+            suffix=self._suffixtext,
+            showtext=self._showtext,
+            textfont=self._textfont,
+            text_color=self._fontcolor,
+            arc_offset=self._arcoffset,
+            arc_range=self._arcrange,
+            scale=self.M,
+            base=self._base_image,
+        )
         self._meterimage = ctk.CTkImage(img, size=(self._metersize, self._metersize))
         self.indicator.configure(image=self._meterimage)
 
     def _draw_meter_base(self):
-        """Draw meter base image"""
-        self._base_image = Image.new(
-            mode="RGBA",
-            size=(self._metersize * self.M, self._metersize * self.M),
-            color=(0, 0, 0, 0),
-        )
-        draw = ImageDraw.Draw(self._base_image, mode="RGBA")
-
-        x1 = y1 = self._metersize * self.M - 20
-        width = self._meterthickness * self.M
-
-        draw.arc(
-            xy=(0, 0, x1, y1),
-            start=self._arcoffset,
-            end=self._arcrange + self._arcoffset,
-            fill=self._metertrough,
-            width=width,
-        )
-
-    def _draw_solid_meter(self, draw: ImageDraw.Draw):
-        """Draw the meter progress bar
-
-        :param draw: Meter draw object
-        :type draw: ImageDraw.Draw
-        """
-        x1 = y1 = self._metersize * self.M - 20
-        width = self._meterthickness * self.M
-
-        if self._wedgesize > 0:
-            value = self._get_meter_value()
-            draw.arc(
-                xy=(0, 0, x1, y1),
-                start=value - self._wedgesize,
-                end=value + self._wedgesize,
-                fill=self._meterforeground,
-                width=width,
-            )
-        else:
-            draw.arc(
-                xy=(0, 0, x1, y1),
-                start=self._arcoffset,
-                end=self._get_meter_value(),
-                fill=self._meterforeground,
-                width=width,
-            )
-
-    def _draw_meter_label(self, draw: ImageDraw.Draw):
-        """Draw the label on meter image. This label is the text in the middle of the meter image
-
-        :param draw: Meter drawer object
-        :type draw: ImageDraw.Draw
-        """
-        x1 = y1 = self._metersize * self.M - 20
-        font_size = self._textfont[1] * self.M - 3
-        text = str(self.current_value.get())
-
-        if self._prefixtext:
-            text = str(self._prefixtext) + text
-        if self._suffixtext:
-            text = text + str(self._suffixtext)
-
-        font = ImageFont.truetype(self._textfont[0], font_size)
-        draw.text(
-            (x1 // 2, y1 // 2), text, self._fontcolor, font, anchor="mm", stroke_width=2
-        )
-
-    def _get_meter_value(self) -> int:
-        """Return the meter value to be used to draw the arc of the meter progress."
-
-        :return: The arc of the meter progress
-        :rtype: int
-        """
-        value = (
-            int(self.current_value.get() / self.max_value * self._arcrange)
-            + self._arcoffset
+        """Draw meter base image. It is kept in the render cache, see `utils.render_cache`."""
+        params = [
+            self._metersize,
+            self._meterthickness,
+            self._metertrough,
+            self._arcoffset,
+            self._arcrange,
+            self.M,
+        ]
+        self._base_image = render_cache.get_or_render(
+            "meter_base", params, lambda: render.render_meter_base(*params)
         )
-        return value
 
     def _setup_widget(self):
         """Setup the widget"""
@@ -220,7 +171,7 @@ class SilderMeter(ctk.CTkFrame):
     :type radius: int, optional
     """
 
-    M = 3
+    M = render.SCALE
 
     def __init__(
         self,
@@ -258,105 +209,40 @@ class SilderMeter(ctk.CTkFrame):
 
         self._setup_widget()
 
+    @profiler.profile()
     def _draw_slider(self, *_):
-        img = self._base_image.copy()
-        draw = ImageDraw.Draw(img, mode="RGBA")
-
-        if self._threshold is not None and self.value < self._threshold:
-            self._draw_slider_threshold(draw)
-        self._draw_slider_progress(draw)
-        self._draw_circle(draw)
-        if self._threshold is not None:
-            self._draw_threshold_divider(draw)
-            if self.value >= self._threshold:
-                self._draw_slider_threshold(draw)
-
+        """Draw the slider, see `utils.render.render_slider`."""
         w = self.cget("width")
         h = self.cget("height")
+        img = render.render_slider(
+            self.value,
+            w,
+            h,
+            from_=self._from,
+            to=self._to,
+            threshold=self._threshold,
+            thickness=self._thickness,
+            fill_color=self._fill_color,
+            trough_color=self._trough_color,
+            under_threshold_color=self._under_threshold_color,
+            over_threshold_color=self._over_threshold_color,
+            radius=self._radius,
+            scale=self.M,
+            base=self._base_image,
+        )
         self._slider_image = ctk.CTkImage(img, size=(w, h))
         self.slider.configure(image=self._slider_image)
 
     def _draw_slider_base(self):
-        w = self.cget("width") * self.M
-        h = self.cget("height") * self.M
-        thickness = self._thickness * self.M
-
-        self._base_image = Image.new(mode="RGBA", size=(w, h))
-        draw = ImageDraw.Draw(self._base_image, mode="RGBA")
-
-        start = (h - thickness) // 2
-        draw.rounded_rectangle(
-            (0, start, w, start + thickness),
-            fill=self._trough_color,
-            radius=self._radius,
-        )
-
-    def _draw_slider_progress(self, draw: ImageDraw.Draw):
-        h = self.cget("height") * self.M
-        x1 = self._cal_fill(self.value) * self.M
-        thickness = self._thickness * self.M
-        y0 = (h - thickness) // 2
-        draw.rounded_rectangle(
-            xy=(0, y0, x1, y0 + thickness),
-            radius=self._radius,
-            fill=self._fill_color,
-        )
-
-    def _draw_slider_threshold(self, draw: ImageDraw.Draw):
-        """Draw the threshold indicator.
-
-        :param draw: Drawer object that will draw the threshold indicator.
-        :type draw: ImageDraw.Draw
-        """
-        color = self._under_threshold_color
-        if self.value >= self._threshold:
-            color = self._over_threshold_color
-        h = self.cget("height") * self.M
-        thickness = self._thickness * self.M
-        x1 = self._cal_fill(self._threshold) * self.M
-        y0 = (h - thickness) // 2
-        draw.rounded_rectangle((0, y0, x1, y0 + thickness), self._radius, fill=color)
-
-    def _draw_threshold_divider(self, draw: ImageDraw.Draw):
-        """Draw threshold divider. The square thinging shows where the threshold is.
-
-        :param draw: Drawer object that will draw the threshold divider.
-        :type draw: ImageDraw.Draw
-        """
-        indicator_thickness = 10 * self.M
-        x = self._cal_fill(self._threshold) * self.M
-
-        if self._threshold < indicator_thickness // 2:
-            x0 = 0
-        else:
-            x0 = x - indicator_thickness // 2
-
-        x1 = x + indicator_thickness // 2
-
-        if self.value < self._threshold:
-            color = self._under_threshold_color
-        else:
-            color = self._over_threshold_color
-
-        y_offset = 7
-        draw.rectangle(
-            (x0, y_offset, x1, self.cget("height") * self.M - y_offset), fill=color
+        self._base_image = render.render_slider_base(
+            self.cget("width"),
+            self.cget("height"),
+            self._thickness,
+            self._trough_color,
+            self._radius,
+            self.M,
         )
 
-    def _draw_circle(self, draw: ImageDraw.Draw):
-        """Draw the slider cirlce.
-
-        :param draw: Draw object
-        :type draw: ImageDraw.Draw
-        """
-        x = self._cal_fill(self.value) * self.M
-        y_offset = 25
-        y1 = self.cget("height") * self.M - y_offset
-        radius = (y1 - y_offset) // 2
-        x0 = x - radius
-        x1 = x + radius
-        draw.ellipse((x0, y_offset, x1, y1), fill=self._fill_color)
-
     def _setup_widget(self):
         """Setup the widget"""
         self.slider = ctk.CTkLabel(self, text="", fg_color="transparent")
@@ -364,21 +250,9 @@ class SilderMeter(ctk.CTkFrame):
         self._draw_slider()
         self.slider.pack()
 
-    def _cal_fill(self, value):
-        """Calculate the fill area of the slider
-
-        :param value: The slider value / current value
-        :type value: float
-        :return: The normalized value of the fill area
-        :rtype: float
-        """
-        _range = abs(self._from - value)
-        _total = abs(self._from - self._to)
-        return (_range / _total) * self.cget("width")
-
 
 class CardButton(ctk.CTkFrame):
-    M = 3
+    M = render.SCALE
 
     def __init__(
         self,
@@ -421,109 +295,52 @@ class CardButton(ctk.CTkFrame):
 
         self._init_widget()
 
-    def _draw_base(self):
-        """Draw base image"""
-        w = self._size[0] * self.M
-        h = self._size[1] * self.M
-        self.base_image = Image.new("RGBA", (w, h))
-
-    def _set_image(self):
-        """Set image to CardButton"""
-        w, h = self.base_image.size
-        h = int(h * (1 - self._textbox_size_pct))
-        image = Image.open(self._image_name)
-        image = image.resize(w, h)
-        self.base_image.paste(image, (0, 0))
-
-    def _draw_textbox(self):
-        """Draw the textbox."""
-        w, h = self.base_image.size
-        th = int(h * self._textbox_size_pct)
-        textbox_image = Image.new("RGBA", size=(w, th), color=self._textbox_color)
-        draw = ImageDraw.Draw(textbox_image, "RGBA")
-        self._draw_text(draw)
-        self._draw_subtext(draw)
-        self.base_image.paste(textbox_image, (0, h - th))
-
-    def _draw_text(self, draw: ImageDraw.Draw):
-        """Draw the text in the textbox"""
-        x = (self._size[0] * self.M) // 2
-        y = 15 * self.M
-        anchor = "ma"
-        font = ImageFont.truetype(self._textfont[0], self._textfont[1] * self.M - 3)
-        text = self._get_wrapepd_text(self.text, font, offset=25)
-        draw.text(
-            xy=(x, y),
-            text=text,
-            fill=self._text_color,
-            font=font,
-            anchor=anchor,
-            align="center",
-            stroke_width=1,
-        )
-        self.__bbox = draw.textbbox(
-            xy=(x, y),
-            text=text,
-            font=font,
-            anchor=anchor,
-            align="center",
-            stroke_width=1,
-        )
-
-    def _draw_subtext(self, draw: ImageDraw.Draw):
-        """Draw the subtext in the textbox"""
-        font = ImageFont.truetype(self._textfont[0], self._textfont[1] * self.M - 3)
-
-        _, _, _, offset_y = self.__bbox
-        actual_y = offset_y + 45
-        subtextfont = ImageFont.truetype(
-            self._subtextfont[0],
-            self._subtextfont[1] * self.M - 3,
-        )
-        subtext = self._get_wrapepd_text(self.subtext, subtextfont, offset=25)
-        draw.multiline_text(
-            xy=(20, actual_y),
-            text=subtext,
-            fill=self._subtext_color,
-            font=subtextfont,
-            align="left",
-        )
-
-    def _get_wrapepd_text(
-        self,
-        text: str,
-        font: ImageFont.FreeTypeFont,
-        offset: int = 0,
-    ) -> str:
-        """Wrap the given text base on the font given. This will make sure the text never go past the width of the base image.
-
-        :param text: Text to wrap.
-        :type text: str
-        :param font: The font object for custom font.
-        :type font: ImageFont.FreeTypeFont
-        :param offset: The x offset, defaults to 0
-        :type offset: int, optional
-        :return: A new fromatted string.
-        :rtype: str
-        """
-        pixel = self.base_image.size[0] - offset
-        lines = text.split("\n")
-        new_text = [
-            ufont.wrap_text(t, pixel, font=font, font_factor=0.97) for t in lines
-        ]
-        return "\n".join(new_text)
-
+    @profiler.profile()
     def _init_widget(self):
         """Initialize the widget by drawing the items in correct order."""
-        self._draw_base()
-        if self._image_name is not None:
-            self._set_image()
-        self._draw_textbox()
+        self._draw_face()
         image = ctk.CTkImage(self.base_image, size=self._size)
         label = ctk.CTkLabel(self, text="", image=image)
         label.pack()
         label.bind("<Button-1>", self._callback)
 
+    def _draw_face(self):
+        """Draw the image of the card. It is kept in the render cache, see `utils.render_cache`."""
+        params = [
+            self.text,
+            self.subtext,
+            self._size,
+            self._text_color,
+            self._textfont,
+            self._subtext_color,
+            self._subtextfont,
+            self._textbox_color,
+            self._textbox_size_pct,
+            self.M,
+        ]
+        files = [self._textfont[0], self._subtextfont[0]]
+        if self._image_name is not None:
+            files.append(self._image_name)
+        self.base_image = render_cache.get_or_render(
+            "card_button", params, self._render_face, files
+        )
+
+    def _render_face(self) -> Image.Image:
+        """Render the image of the card, see `utils.render.render_card`."""
+        return render.render_card(
+            self.text,
+            size=self._size,
+            subtext=self.subtext,
+            image_name=self._image_name,
+            text_color=self._text_color,
+            text_font=self._textfont,
+            subtext_font=self._subtextfont,
+            subtext_color=self._subtext_color,
+            textbox_color=self._textbox_color,
+            textbox_size_pct=self._textbox_size_pct,
+            scale=self.M,
+        )
+
     def _callback(self, event):
         """Callback function when the widget is clicked."""
         if self._command is None:
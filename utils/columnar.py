@@ -0,0 +1,166 @@
+"""Cleaned, typed binary storage for the scraped player season data.
+
+The raw CSV files store values such as "2,396" or "63%" which need to be cleaned on every read.
+This module writes the cleaned values once into a NumPy structured array (.npy) next to the CSV
+file. The array can be memory-mapped, so loading a season does no parsing at all.
+"""
+
+from __future__ import annotations
+
+import os
+import argparse
+from typing import Dict, List, Union
+
+import numpy as np
+
+from . import lazy
+from . import parser
+
+pd = lazy.lazy_import("pandas")
+
+COLUMNAR_EXT = ".npy"
+TEXT_COLUMNS = ["name"]
+
+
+def get_columnar_location(filename: str) -> str:
+    """Get the location of the columnar file belonging to a raw CSV file.
+
+    :param filename: The raw CSV filename, e.g. 'data/2022-23/defender_raw_data.csv'
+    :type filename: str
+    :return: String to the columnar file location.
+    :rtype: str
+    """
+    return os.path.splitext(filename)[0] + COLUMNAR_EXT
+
+
+def clean_column(column: pd.Series) -> np.ndarray:
+    """Clean a raw column into floats, see `utils.parser.parse_values`.
+
+    Missing values ("", "-", "N/A", ...) and values that are not a valid number become NaN.
+
+    :param column: The raw column.
+    :type column: pd.Series
+    :return: A float64 array.
+    :rtype: np.ndarray
+    """
+    return parser.parse_values(column, column.name)[0]
+
+
+def to_columnar(
+    df: pd.DataFrame, reports: Dict[str, parser.ColumnReport] = None
+) -> np.ndarray:
+    """Convert a raw DataFrame into a cleaned structured array.
+
+    Text columns (see TEXT_COLUMNS) are stored as fixed width unicode and every other column as float64.
+
+    :param df: The raw data, one row per player.
+    :type df: pd.DataFrame
+    :param reports: If given, filled with the validation report of each numeric column, defaults to None
+    :type reports: dict[str, ColumnReport], optional
+    :return: A structured array with one field per column.
+    :rtype: np.ndarray
+    """
+    dtype = []
+    columns = {}
+    for name in df.columns:
+        if name in TEXT_COLUMNS:
+            values = df[name].fillna("").astype(str).to_numpy()
+            width = max((len(v) for v in values), default=1) or 1
+            dtype.append((name, f"U{width}"))
+        else:
+            values, report = parser.parse_values(df[name], name)
+            if reports is not None:
+                reports[name] = report
+            dtype.append((name, np.float64))
+        columns[name] = values
+
+    array = np.empty(len(df), dtype=dtype)
+    for name, values in columns.items():
+        array[name] = values
+    return array
+
+
+def write_columnar(
+    df: pd.DataFrame, filename: str, reports: Dict[str, parser.ColumnReport] = None
+) -> str:
+    """Clean the raw DataFrame and write it as a columnar file.
+
+    :param df: The raw data, one row per player.
+    :type df: pd.DataFrame
+    :param filename: The columnar filename.
+    :type filename: str
+    :param reports: If given, filled with the validation report of each numeric column, defaults to None
+    :type reports: dict[str, ColumnReport], optional
+    :return: The written filename.
+    :rtype: str
+    """
+    np.save(filename, to_columnar(df, reports), allow_pickle=False)
+    return filename
+
+
+def read_columnar(filename: str, mmap: bool = True) -> np.ndarray:
+    """Read a columnar file.
+
+    :param filename: The columnar filename.
+    :type filename: str
+    :param mmap: If True, memory-map the file instead of reading it, defaults to True
+    :type mmap: bool, optional
+    :return: A structured array with one field per column.
+    :rtype: np.ndarray
+    """
+    return np.load(filename, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+def is_up_to_date(filename: str) -> bool:
+    """Check if the columnar file of a raw CSV file exists and is not older than the CSV file.
+
+    :param filename: The raw CSV filename.
+    :type filename: str
+    :return: True if the columnar file can be used instead of the CSV file.
+    :rtype: bool
+    """
+    columnar = get_columnar_location(filename)
+    if not os.path.exists(columnar):
+        return False
+    if not os.path.exists(filename):
+        return True
+    return os.path.getmtime(columnar) >= os.path.getmtime(filename)
+
+
+def convert_csv(filenames: Union[str, List[str]]) -> List[str]:
+    """Convert raw CSV files into columnar files. A directory converts every raw CSV file inside it. Columns with invalid values are reported.
+
+    :param filenames: A filename, a directory or a list of them.
+    :type filenames: str | list[str]
+    :return: The written filenames.
+    :rtype: list[str]
+    """
+    if type(filenames) == str:
+        filenames = [filenames]
+
+    written = []
+    for filename in filenames:
+        if os.path.isdir(filename):
+            inner = sorted(
+                os.path.join(filename, f)
+                for f in os.listdir(filename)
+                if f.endswith("_raw_data.csv")
+            )
+            written.extend(convert_csv(inner))
+            continue
+        df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+        reports = {}
+        written.append(write_columnar(df, get_columnar_location(filename), reports))
+        for line in parser.format_report(reports).splitlines():
+            print(f"[columnar]   {filename}: {line}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert raw season CSV files into columnar files."
+    )
+    parser.add_argument("paths", nargs="+", help="CSV files or season directories")
+    args = parser.parse_args()
+    for filename in convert_csv(args.paths):
+        print(f"[columnar]   Written {filename}")
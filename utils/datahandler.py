@@ -1,13 +1,21 @@
+from __future__ import annotations
+
 import os
 import csv
 import datetime
 import numpy as np
-import pandas as pd
-from typing import Union, List, Dict
-
-from data_collection.collect_data import collect_data
+from typing import Union, List, Dict, Iterator
 
+from . import columnar
+from . import lazy
+from . import profiler
+from . import store
 from ._processor import *
+from .stats import BenchmarkAggregator
+
+pd = lazy.lazy_import("pandas")
+
+DEFAULT_CHUNKSIZE = 10_000
 
 
 def get_past_season(npast=1):
@@ -36,15 +44,14 @@ def get_file_location(position, season="2022-23") -> str:
     :return: String to the file location.
     :rtype: str
     """
-    position = position.lower()
-    valid = ["midfielder", "goalkeeper", "forward", "defender"]
-    if position not in valid:
-        vstr = ", ".join(valid)
-        raise ValueError(f"Invalid position. Position must be either {vstr}")
+    position = schema.get_schema(position).position.lower()
     filepath = f"data/{season}/{position.lower()}_raw_data.csv"
-    if os.path.exists(filepath):
+    if os.path.exists(filepath) or columnar.is_up_to_date(filepath):
         return filepath
 
+    # NOTE: Imported here, the scrapper pulls in selenium and rich which most runs never use.
+    from data_collection.collect_data import collect_data
+
     collect_data(season.replace("-", "/"), position=position)
 
 
@@ -84,6 +91,57 @@ def get_data(filename: str = None, position: str = None) -> pd.DataFrame:
         raise FileNotFoundError(f"{filename} does not exist.")
 
 
+def get_benchmark_store(
+    position: str, season: str = "2022-23", rebuild: bool = False, root: str = "data"
+) -> store.BenchmarkStore:
+    """Get the shared read-only benchmark store of the position and season, building it first if it is missing or older than the season data.
+
+    :param position: Position of the player.
+    :type position: str
+    :param season: The season, defaults to "2022-23"
+    :type season: str, optional
+    :param rebuild: If True, always rebuild the store, defaults to False
+    :type rebuild: bool, optional
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :return: The memory-mapped store.
+    :rtype: store.BenchmarkStore
+    """
+    position = position.lower()
+    filename = store.get_store_location(position, season, root=root)
+    source = os.path.join(root, season, f"{position}_raw_data.csv")
+    if not (os.path.exists(source) or columnar.is_up_to_date(source)):
+        from data_collection.collect_data import collect_data
+
+        collect_data(
+            season.replace("-", "/"),
+            save_to=os.path.join(root, season),
+            position=position,
+        )
+    sources = [source, columnar.get_columnar_location(source)]
+    source_mtime = max(os.path.getmtime(f) for f in sources if os.path.exists(f))
+    up_to_date = os.path.exists(filename) and (
+        os.path.getmtime(filename) >= source_mtime
+        # NOTE: Without the csv file, the data is a packaged snapshot whose copies do not keep their modification time, see prepare_bundle.py
+        or not os.path.exists(source)
+    )
+    if rebuild or not up_to_date:
+        handler = DataHandler(get_processor(position), source)
+        store.write_store(
+            handler.get_pd_data(),
+            filename,
+            names=handler.get_names(),
+            season=season,
+            position=position,
+        )
+    try:
+        return store.open_store(filename)
+    except ValueError:
+        if rebuild:
+            raise
+        return get_benchmark_store(position, season=season, rebuild=True, root=root)
+
+
 def read_data_list(filename: str) -> List[Dict]:
     """Read data from filename.
 
@@ -92,51 +150,168 @@ def read_data_list(filename: str) -> List[Dict]:
     :return: A list of dict containing the attributes and values
     :rtype: list[dict]
     """
-    reader = csv.DictReader(open(filename, "r"))
-    return list(reader)
+    with open(filename, "r", newline="") as file:
+        reader = csv.DictReader(file)
+        return list(reader)
+
+
+def read_data_chunks(
+    filename: str, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[List[Dict]]:
+    """Read data from filename in chunks of at most `chunksize` rows, so the file never has to fit in memory.
+
+    Every column is read as a raw string, the same as `read_data_list`, because the scraped values
+    such as "2,396" or "63%" are cleaned by the processor.
+
+    :param filename: Filename to read data from.
+    :type filename: str
+    :param chunksize: The maximum number of rows per chunk, defaults to DEFAULT_CHUNKSIZE
+    :type chunksize: int, optional
+    :return: An iterator of lists of dict containing the attributes and values
+    :rtype: Iterator[list[dict]]
+    """
+    with pd.read_csv(
+        filename, chunksize=chunksize, dtype=str, keep_default_na=False
+    ) as reader:
+        for chunk in reader:
+            yield chunk.to_dict("records")
+
+
+def stream_processed_data(
+    processor: BaseDataProcessor, filename: str, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[List[Dict]]:
+    """Read and process the data from filename chunk by chunk. Each chunk is processed at once by the evaluation plan of the processor.
+
+    :param processor: The processor class of the position.
+    :type processor: BaseDataProcessor
+    :param filename: Filename to read data from.
+    :type filename: str
+    :param chunksize: The maximum number of rows per chunk, defaults to DEFAULT_CHUNKSIZE
+    :type chunksize: int, optional
+    :return: An iterator of lists of processed data, see `DataHandler.get_data`.
+    :rtype: Iterator[list[dict]]
+    """
+    for chunk in read_data_chunks(filename, chunksize):
+        yield processor.process(chunk)
+
+
+def stream_benchmark(
+    processor: BaseDataProcessor,
+    filenames: Union[str, List[str]],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> BenchmarkAggregator:
+    """Build the benchmark of one or more data files without loading them into memory.
+
+    Rows are read in chunks, processed and pushed into online mean/min/max/quantile summaries,
+    so the memory used depends on `chunksize` and not on the size of the files.
+
+    :param processor: The processor class of the position.
+    :type processor: BaseDataProcessor
+    :param filenames: A filename or a list of filenames, e.g. several seasons or leagues.
+    :type filenames: str | list[str]
+    :param chunksize: The maximum number of rows per chunk, defaults to DEFAULT_CHUNKSIZE
+    :type chunksize: int, optional
+    :return: The aggregated benchmark.
+    :rtype: BenchmarkAggregator
+    """
+    if type(filenames) == str:
+        filenames = [filenames]
+
+    aggregator = BenchmarkAggregator()
+    for filename in filenames:
+        for records in stream_processed_data(processor, filename, chunksize):
+            aggregator.push_records(records)
+    return aggregator
 
 
 class DataHandler:
     """Handles data processing from given filename. If filename is None, then the data must be loaded before trying getting the data, otherwise None will be given.
 
-    To load data after the handler initialization, use `load_data_from_csv' method to load new data from csv file.
+    To load data after the handler initialization, use `load_data' method which prefers the cleaned columnar file next to the csv file and falls back to the csv file.
 
     :param filename: Filename to retrieve the data, defaults to None
     :type filename: str | None, optional
     """
 
     def __init__(self, processor: BaseDataProcessor, filename: Union[str, None] = None):
-        self._df = None
-        self._data_list = None
+        self._columns = None
         self._processor = processor
         if filename is not None:
+            self.load_data(filename)
+
+    @profiler.profile()
+    def load_data(self, filename: str, mmap: bool = True):
+        """Load data from filename. If an up to date columnar file exists for it, load that one instead of parsing the CSV file.
+
+        :param filename: The raw CSV filename to read from.
+        :type filename: str
+        :param mmap: If True, memory-map the columnar file, defaults to True
+        :type mmap: bool, optional
+        """
+        if columnar.is_up_to_date(filename):
+            self.load_data_from_columnar(columnar.get_columnar_location(filename), mmap)
+        else:
             self.load_data_from_csv(filename)
 
+    @profiler.profile()
+    def load_data_from_columnar(self, filename: str, mmap: bool = True):
+        """Load data from a columnar file, see `utils.columnar`.
+
+        :param filename: Filename to read from.
+        :type filename: str
+        :param mmap: If True, memory-map the file instead of reading it, defaults to True
+        :type mmap: bool, optional
+        """
+        self._columns = columnar.read_columnar(filename, mmap)
+
+    @profiler.profile()
     def load_data_from_csv(self, filename: str):
         """Load data from CSV file.
 
         :param filename: Filename to read from.
         :type filename: str
         """
-        self._data_list = read_data_list(filename)
+        self._columns = pd.read_csv(filename, dtype=str, keep_default_na=False)
+
+    @profiler.profile()
+    def get_benchmark(self) -> BenchmarkAggregator:
+        """Aggregate the processed data into per-attribute benchmark summaries.
+
+        :return: The aggregated benchmark.
+        :rtype: BenchmarkAggregator
+        """
+        aggregator = BenchmarkAggregator()
+        aggregator.push_records(self.get_data())
+        return aggregator
 
+    @profiler.profile()
     def get_data(self) -> List[Dict]:
         """Retrive processed data.
 
         :return: A list of dictionary consist of attribute name as keys and processed data as values.
         :rtype: list[dict]
         """
-        data_list = [self._processor(data).data for data in self._data_list]
-        return data_list
+        return self.get_pd_data().to_dict("records")
+
+    def get_names(self) -> List[str]:
+        """Get the player names in the same order as the processed data.
+
+        :return: List of player names
+        :rtype: list[str]
+        """
+        if "name" not in self._get_column_names():
+            return [""] * len(self._columns)
+        return [str(name) for name in self._columns["name"]]
 
+    @profiler.profile()
     def get_pd_data(self) -> pd.DataFrame:
         """Retieve processed data as pandas.DataFrame.
 
         :return: pandas dataframe object containing processed data.
         :rtype: pd.DataFrame
         """
-        data_list = self.get_data()
-        return pd.DataFrame(data_list)
+        profiler.count("players processed", len(self._columns))
+        return self._processor.get_plan().evaluate_frame(self._columns)
 
     def get_attributes(self) -> Union[List[str], None]:
         """Get the attributes after the data been processed.
@@ -144,9 +319,9 @@ class DataHandler:
         :return: List of attributes
         :rtype: list[str]
         """
-        data = self.get_data()
-        return list(data[0].keys())
+        return self._processor.get_schema().get_attributes()
 
+    @profiler.profile()
     def get_normalized_data(self) -> pd.DataFrame:
         """Return the normalized DataFrame
 
@@ -161,3 +336,9 @@ class DataHandler:
                 * 100
             )
         return data
+
+    def _get_column_names(self) -> List[str]:
+        """Get the raw column names of the loaded data."""
+        if isinstance(self._columns, np.ndarray):
+            return list(self._columns.dtype.names)
+        return list(self._columns.columns)
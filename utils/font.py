@@ -2,7 +2,12 @@ import math
 import textwrap
 from PIL import Image, ImageDraw, ImageFont
 
+from . import prebuilt
+from . import profiler
+from . import render_cache
 
+
+@profiler.profile()
 def wrap_text(
     text: str,
     pixel: int,
@@ -41,11 +46,12 @@ class RenderFont:
         self._file = filename
         self._image = None
 
+    @profiler.profile()
     def get_render(
         self, text, font_size=18, fill=(0, 0, 0), type_="normal", align="left"
     ) -> Image.Image:
         """
-        Create transparent PIL image that contains the text
+        Create transparent PIL image that contains the text. Pre-rendered images are used if any, see `utils.prebuilt`, then the render cache, see `utils.render_cache`.
 
         :param text: Text to be render as PIL Image
         :type text: str
@@ -58,6 +64,23 @@ class RenderFont:
         :return: A PIL.Image consist of rendered text on transparent background
         :rtype: PIL.Image
         """
+        image = prebuilt.load(
+            "get_render", self._file, text, font_size, fill, type_, align
+        )
+        if image is None:
+            image = render_cache.get_or_render(
+                "get_render",
+                [text, font_size, fill, type_, align],
+                lambda: self.render(text, font_size, fill, type_, align),
+                files=[self._file],
+            )
+        self._image = image
+        return image
+
+    def render(
+        self, text, font_size=18, fill=(0, 0, 0), type_="normal", align="left"
+    ) -> Image.Image:
+        """Render the text without looking for a pre-rendered image, see `get_render`."""
         font = ImageFont.truetype(font=self._file, size=font_size)
         mx_txt_len = max(text.split("\n"), key=len)
         width = int(font.getlength(mx_txt_len)) + 15
@@ -1,7 +1,14 @@
 import math
 from PIL import Image, ImageFont, ImageDraw
 
+from . import prebuilt
+from . import profiler
+from . import render_cache
 
+BACKGROUND_FONT = "assets/fonts/PublicSans-Bold.ttf"
+
+
+@profiler.profile()
 def load_image(filename, size=None):
     """
     Load an image from filename str
@@ -16,6 +23,7 @@ def load_image(filename, size=None):
     return img
 
 
+@profiler.profile()
 def generate_text_background(
     text,
     size,
@@ -80,10 +88,33 @@ def cal_square_bg_size(size):
     return t, t
 
 
+@profiler.profile()
 def text_bg_builder(text, original_size):
+    """Build the background of a page: the text repeated diagonally. Pre-rendered backgrounds are used if any, see `utils.prebuilt`, then the render cache, see `utils.render_cache`.
+
+    :param text: Text to be repeated.
+    :type text: str
+    :param original_size: A tuple of width and height of the background image.
+    :type original_size: tuple[int, int]
+    :return: An image.
+    :rtype: Image
+    """
+    image = prebuilt.load("text_bg_builder", text, original_size)
+    if image is not None:
+        return image
+    return render_cache.get_or_render(
+        "text_bg_builder",
+        [text, original_size],
+        lambda: render_text_bg(text, original_size),
+        files=[BACKGROUND_FONT],
+    )
+
+
+def render_text_bg(text, original_size):
+    """Render the background of a page, see `text_bg_builder`."""
     text = text.upper()
     size = cal_square_bg_size(original_size)
-    font_family = "assets/fonts/PublicSans-Bold.ttf"
+    font_family = BACKGROUND_FONT
     font_size = 90
     font_color = "#c7c71922"
     bg_color = "#151515"
@@ -0,0 +1,79 @@
+"""Deferred imports of the heavy modules, so the window shows before they are loaded.
+
+`lazy_import` returns a stand-in module which imports the real one the first time one of its
+attributes is read::
+
+    pd = lazy.lazy_import("pandas")   # nothing imported yet
+    pd.read_csv(...)                  # pandas is imported here
+
+The modules using it need `from __future__ import annotations`, otherwise an annotation such as
+`-> pd.DataFrame` reads an attribute when the function is defined. The time taken by each deferred
+import is kept in IMPORT_TIMES, see `get_import_times`.
+"""
+
+import sys
+import time
+import types
+import importlib
+from typing import Dict
+
+from . import profiler
+
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+class LazyModule(types.ModuleType):
+    """A module imported on first attribute access, see `lazy_import`.
+
+    :param name: The module name.
+    :type name: str
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        """Import the real module, once."""
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            loaded = self.__name__ in sys.modules
+            start = time.perf_counter()
+            with profiler.span(f"import {self.__name__}", "import"):
+                module = importlib.import_module(self.__name__)
+            if not loaded:
+                IMPORT_TIMES[self.__name__] = time.perf_counter() - start
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        # NOTE: Kept so the next reads do not go through __getattr__.
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Get a module without importing it yet. If it is already imported, it is returned as is.
+
+    :param name: The module name, e.g. "pandas".
+    :type name: str
+    :return: The module, or a `LazyModule` importing it on first use.
+    :rtype: ModuleType
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def get_import_times() -> Dict[str, float]:
+    """Get the time taken by each deferred import done so far.
+
+    :return: A dictionary of module name and import time in seconds.
+    :rtype: dict[str, float]
+    """
+    return dict(IMPORT_TIMES)
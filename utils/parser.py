@@ -0,0 +1,195 @@
+"""Vectorized parser for the scraped stat strings.
+
+The scraped values look like "2,396", "63%", "0.77" or "-" when a stat is missing. Whole columns
+are parsed at once instead of cell by cell:
+
+* thousands separators (",", spaces) and "%" signs are removed,
+* missing markers (see MISSING_VALUES) become NaN and are counted as missing,
+* anything else that is not a plain number, e.g. "1.2.3", becomes NaN and is counted as invalid.
+
+Each column gets a `ColumnReport` so bad exports are noticed instead of silently turned into numbers.
+"""
+
+from __future__ import annotations
+
+import io
+import csv
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from . import lazy
+
+pd = lazy.lazy_import("pandas")
+
+MISSING_VALUES = ["", "-", "--", "n/a", "na", "nan", "none", "null"]
+EXAMPLES = 5
+
+_NA_VALUES = sorted({v for m in MISSING_VALUES for v in (m, m.upper(), m.title())})
+# NOTE: Thousands separators, percent signs, spaces and quotes.
+_STRIP_TABLE = str.maketrans("", "", ",'% \t\u00a0\u202f\"")
+
+
+@dataclass
+class ColumnReport:
+    """The validation report of a parsed column.
+
+    :param name: The column name.
+    :type name: str
+    :param count: The number of values.
+    :type count: int
+    :param missing: The number of missing markers, see MISSING_VALUES.
+    :type missing: int
+    :param invalid: The number of values which are not a number.
+    :type invalid: int
+    :param percent: The number of "%" signs.
+    :type percent: int
+    :param examples: Up to EXAMPLES invalid values.
+    :type examples: list[str]
+    """
+
+    name: str = ""
+    count: int = 0
+    missing: int = 0
+    invalid: int = 0
+    percent: int = 0
+    examples: List[str] = field(default_factory=list)
+
+    @property
+    def parsed(self) -> int:
+        """The number of values parsed into a number."""
+        return self.count - self.missing - self.invalid
+
+    @property
+    def ok(self) -> bool:
+        """True if there is no invalid value."""
+        return self.invalid == 0
+
+    def __str__(self) -> str:
+        text = f"{self.name}: {self.parsed}/{self.count} parsed, {self.missing} missing, {self.invalid} invalid"
+        if self.examples:
+            text += f" (e.g. {', '.join(repr(e) for e in self.examples)})"
+        return text
+
+
+def parse_values(values: Any, name: str = "") -> Tuple[np.ndarray, ColumnReport]:
+    """Parse a column of scraped values into floats.
+
+    The column is joined into a single text and parsed by the C parser of `pd.read_csv`. If it
+    holds invalid values, they are found with a slower pass over the values.
+
+    :param values: A list, array or Series of raw values. Numeric input is only converted to float.
+    :type values: Any
+    :param name: The column name used in the report, defaults to ""
+    :type name: str, optional
+    :return: A float64 array with NaN for missing and invalid values, and the report of the column.
+    :rtype: tuple[np.ndarray, ColumnReport]
+    """
+    array = np.asarray(values).reshape(-1)
+    if array.dtype.kind in "fiub":
+        result = array.astype(np.float64, copy=False)
+        missing = int(np.isnan(result).sum())
+        return result, ColumnReport(name, len(result), missing=missing)
+    if len(array) == 0:
+        return np.empty(0), ColumnReport(name)
+
+    raw = array.astype(str)
+    text = "\n".join(raw.tolist())
+    percent = text.count("%")
+    cleaned = None
+    if "\r" not in text and text.count("\n") == len(raw) - 1:
+        try:
+            parsed = pd.read_csv(
+                io.StringIO(text.translate(_STRIP_TABLE)),
+                header=None,
+                names=["value"],
+                na_values=_NA_VALUES,
+                keep_default_na=False,
+                skip_blank_lines=False,
+                quoting=csv.QUOTE_NONE,
+                float_precision="round_trip",
+                low_memory=False,
+            )["value"]
+        except pd.errors.EmptyDataError:
+            parsed = pd.Series([np.nan])
+        if len(parsed) == len(raw):
+            if parsed.dtype.kind in "fi":
+                result = parsed.to_numpy(dtype=np.float64)
+                missing = int(np.isnan(result).sum())
+                return result, ColumnReport(name, len(raw), missing, percent=percent)
+            cleaned = parsed
+
+    # NOTE: The column holds invalid values, or values with line breaks which cannot be parsed as a single text.
+    if cleaned is None:
+        cleaned = pd.Series(raw, dtype=object).str.translate(_STRIP_TABLE)
+        cleaned[cleaned.str.lower().isin(MISSING_VALUES)] = np.nan
+    missing = cleaned.isna().to_numpy()
+    result = pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=np.float64)
+    invalid = np.isnan(result) & ~missing
+    report = ColumnReport(
+        name,
+        len(raw),
+        missing=int(missing.sum()),
+        invalid=int(invalid.sum()),
+        percent=percent,
+        examples=raw[invalid][:EXAMPLES].tolist(),
+    )
+    return result, report
+
+
+def parse_value(value: Any) -> float:
+    """Parse a single scraped value with the same rules as `parse_values`, without the column machinery.
+
+    :param value: A raw value.
+    :type value: Any
+    :return: The float value, NaN if it is missing or invalid.
+    :rtype: float
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).translate(_STRIP_TABLE)
+    if text.lower() in MISSING_VALUES or "_" in text:
+        return np.nan
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def parse_frame(
+    df: pd.DataFrame, text_columns: List[str] = None
+) -> Tuple[Dict[str, np.ndarray], Dict[str, ColumnReport]]:
+    """Parse every column of a raw DataFrame, except the text columns which are kept as is.
+
+    :param df: The raw data.
+    :type df: pd.DataFrame
+    :param text_columns: The columns not to parse, defaults to None
+    :type text_columns: list[str], optional
+    :return: A dictionary of column name and values, and the report of each parsed column.
+    :rtype: tuple[dict[str, np.ndarray], dict[str, ColumnReport]]
+    """
+    text_columns = text_columns or []
+    columns = {}
+    reports = {}
+    for name in df.columns:
+        if name in text_columns:
+            columns[name] = df[name].to_numpy()
+            continue
+        columns[name], reports[name] = parse_values(df[name], name)
+    return columns, reports
+
+
+def format_report(reports: Dict[str, ColumnReport], only_invalid: bool = True) -> str:
+    """Format the reports of a file, one column per line.
+
+    :param reports: The reports, e.g. from `parse_frame`.
+    :type reports: dict[str, ColumnReport]
+    :param only_invalid: If True, only list the columns with invalid values, defaults to True
+    :type only_invalid: bool, optional
+    :return: The text of the report.
+    :rtype: str
+    """
+    return "\n".join(
+        str(report) for report in reports.values() if not (only_invalid and report.ok)
+    )
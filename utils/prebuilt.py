@@ -0,0 +1,159 @@
+"""Pre-rendered backgrounds and title bitmaps shipped with the packaged app.
+
+Rendering the page backgrounds and titles takes a large part of the startup. `prepare_bundle.py`
+renders the ones the app uses ahead of time into PREBUILT_DIR, and `utils.image.text_bg_builder`
+and `utils.font.RenderFont.get_render` load them from there instead of rendering them again.
+
+Each render is keyed by its function and arguments. The manifest also keeps a fingerprint of the
+fonts, so renders made with other fonts are never used.
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from PIL import Image
+
+PREBUILT_DIR = os.path.join("assets", "prebuilt")
+MANIFEST = "manifest.json"
+FONT_DIR = os.path.join("assets", "fonts")
+VERSION = 1
+
+_TITLE_FONT = "assets/fonts/Anton-Regular.ttf"
+
+# NOTE: The renders of the pages, see `ui`. The backgrounds depend on the window size.
+BACKGROUND_TEXTS = [
+    "Select Position",
+    "defender",
+    "forward",
+    "midfielder",
+    "goalkeeper",
+    "RESULT",
+    "TRAININGS",
+]
+# NOTE: The arguments of `RenderFont`, then of `RenderFont.get_render`.
+TITLES = [
+    (_TITLE_FONT, "CHOOSE YOUR POSITION", 100, (255, 255, 0), "normal", "left"),
+    (_TITLE_FONT, "RESULT", 112, (255, 255, 0), "normal", "center"),
+    (_TITLE_FONT, "RECOMMENDED TRAININGS", 100, "yellow", "normal", "center"),
+] + [
+    (
+        _TITLE_FONT,
+        f"Fill in data for\n{p.upper()}",
+        100,
+        (255, 255, 0),
+        "normal",
+        "center",
+    )
+    for p in ["defender", "forward", "midfielder", "goalkeeper"]
+]
+SIZES = [(1350, 800), (1920, 1009), (1920, 1080)]
+
+_manifest: Union[Dict[str, str], None] = None
+
+
+def get_key(kind: str, *args: Any) -> str:
+    """Get the key of a render.
+
+    :param kind: The render function, e.g. "text_bg_builder".
+    :type kind: str
+    :param args: The arguments of the render. Tuples and lists are the same.
+    :return: A hexadecimal key.
+    :rtype: str
+    """
+    raw = json.dumps([kind, *args], separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_fingerprint(font_dir: str = FONT_DIR) -> str:
+    """Get the fingerprint of the fonts the renders are made with.
+
+    :param font_dir: The font directory, defaults to FONT_DIR
+    :type font_dir: str, optional
+    :return: A hexadecimal digest of VERSION and every font file.
+    :rtype: str
+    """
+    digest = hashlib.sha1(str(VERSION).encode())
+    if os.path.isdir(font_dir):
+        for name in sorted(os.listdir(font_dir)):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(font_dir, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _get_manifest() -> Dict[str, str]:
+    """Read the manifest once. It is empty if there is none or if the fonts changed."""
+    global _manifest
+    if _manifest is None:
+        _manifest = {}
+        filename = os.path.join(PREBUILT_DIR, MANIFEST)
+        if os.path.exists(filename):
+            with open(filename, "r") as file:
+                manifest = json.load(file)
+            if manifest.get("fingerprint") == get_fingerprint():
+                _manifest = manifest["renders"]
+    return _manifest
+
+
+def load(kind: str, *args: Any) -> Union[Image.Image, None]:
+    """Load a pre-rendered image.
+
+    :param kind: The render function.
+    :type kind: str
+    :param args: The arguments of the render.
+    :return: The image, or None if it was not pre-rendered.
+    :rtype: Image | None
+    """
+    manifest = _get_manifest()
+    if not manifest:
+        return None
+    name = manifest.get(get_key(kind, *args))
+    if name is None:
+        return None
+    image = Image.open(os.path.join(PREBUILT_DIR, name))
+    image.load()
+    return image
+
+
+def build(
+    directory: str = PREBUILT_DIR, sizes: Iterable[Tuple[int, int]] = SIZES
+) -> List[str]:
+    """Render BACKGROUND_TEXTS for every size and TITLES into a directory with its manifest.
+
+    :param directory: The output directory, defaults to PREBUILT_DIR
+    :type directory: str, optional
+    :param sizes: The window sizes, defaults to SIZES
+    :type sizes: Iterable[tuple[int, int]], optional
+    :return: The written image filenames.
+    :rtype: list[str]
+    """
+    from . import image as uimage
+    from .font import RenderFont
+
+    os.makedirs(directory, exist_ok=True)
+    renders = {}
+    written = []
+
+    def save(image: Image.Image, kind: str, *args: Any):
+        key = get_key(kind, *args)
+        name = f"{kind}-{key[:16]}.png"
+        image.save(os.path.join(directory, name), optimize=False, compress_level=1)
+        renders[key] = name
+        written.append(os.path.join(directory, name))
+
+    for size in sizes:
+        for text in BACKGROUND_TEXTS:
+            save(
+                uimage.render_text_bg(text, tuple(size)), "text_bg_builder", text, size
+            )
+    for filename, text, font_size, fill, type_, align in TITLES:
+        image = RenderFont(filename).render(text, font_size, fill, type_, align)
+        save(image, "get_render", filename, text, font_size, fill, type_, align)
+
+    with open(os.path.join(directory, MANIFEST), "w") as file:
+        json.dump(
+            {"fingerprint": get_fingerprint(), "renders": renders}, file, indent=2
+        )
+    return written
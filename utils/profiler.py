@@ -0,0 +1,230 @@
+"""Timing spans and counters around the hot paths of the app.
+
+The profiler is off unless the PCA_PROFILE environment variable is set before the app starts::
+
+    PCA_PROFILE=1 python main.py
+
+When it is off, `profile` returns the decorated function itself and `span` returns a shared no-op
+context, so the instrumented code runs as if it was not instrumented. When it is on:
+
+* every span and counter is recorded with its thread and time,
+* the timeline is written at exit to PCA_PROFILE_TRACE (defaults to "profile_trace.json") in the
+  Chrome trace format, which opens in chrome://tracing or https://ui.perfetto.dev,
+* with PCA_PROFILE_OVERLAY=1, the app shows the build time of each page, see `main.py`.
+"""
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+from typing import Any, Callable, Dict, List, Union
+
+ENABLED = os.environ.get("PCA_PROFILE", "") not in ("", "0")
+OVERLAY = ENABLED and os.environ.get("PCA_PROFILE_OVERLAY", "") not in ("", "0")
+TRACE_FILENAME = os.environ.get("PCA_PROFILE_TRACE", "profile_trace.json")
+
+_lock = threading.Lock()
+_events: List[Dict[str, Any]] = []
+_counters: Dict[str, float] = {}
+_origin = time.perf_counter()
+
+
+def _now() -> float:
+    """The time since the profiler was imported, in microseconds."""
+    return (time.perf_counter() - _origin) * 1e6
+
+
+class Span:
+    """A timed section of code, see `span`.
+
+    :param name: The span name.
+    :type name: str
+    :param category: The span category, e.g. the module name.
+    :type category: str
+    :param args: Extra values shown with the span in the trace.
+    :type args: dict
+    """
+
+    __slots__ = ("name", "category", "args", "start", "duration")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+        self.duration = None
+
+    def __enter__(self) -> "Span":
+        self.start = _now()
+        return self
+
+    def __exit__(self, *_):
+        self.duration = _now() - self.start
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start,
+            "dur": self.duration,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+
+class _NullSpan:
+    """The span used when the profiler is off. It records nothing."""
+
+    __slots__ = ()
+    name = category = start = duration = None
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str = "app", **args) -> Union[Span, _NullSpan]:
+    """Time a section of code::
+
+        with profiler.span("build page", page="ResultPage") as s:
+            ...
+        s.duration  # microseconds, None if the profiler is off
+
+    :param name: The span name.
+    :type name: str
+    :param category: The span category, defaults to "app"
+    :type category: str, optional
+    :return: A context manager.
+    :rtype: Span
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def profile(name: str = None, category: str = None) -> Callable:
+    """Decorate a function to time every call in a span. If the profiler is off, the function is returned as is.
+
+    :param name: The span name, defaults to the qualified name of the function.
+    :type name: str, optional
+    :param category: The span category, defaults to the module of the function.
+    :type category: str, optional
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+        span_name = name or fn.__qualname__
+        span_category = category or fn.__module__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(span_name, span_category, None):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    """Add value to a counter. Counters are shown as a graph over time in the trace.
+
+    :param name: The counter name.
+    :type name: str
+    :param value: The value to add, defaults to 1
+    :type value: float, optional
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        total = _counters[name] = _counters.get(name, 0) + value
+    _events.append(
+        {
+            "name": name,
+            "ph": "C",
+            "ts": _now(),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {name: total},
+        }
+    )
+
+
+def get_counters() -> Dict[str, float]:
+    """Get the current value of every counter.
+
+    :return: A dictionary of counter name and value.
+    :rtype: dict[str, float]
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def get_summary() -> Dict[str, Dict[str, float]]:
+    """Get the number of calls and the total, mean and max duration of every span name.
+
+    :return: A dictionary of span name and its summary in milliseconds, slowest total first.
+    :rtype: dict[str, dict[str, float]]
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+    for event in list(_events):
+        if event["ph"] != "X":
+            continue
+        item = summary.setdefault(event["name"], {"calls": 0, "total": 0.0, "max": 0.0})
+        item["calls"] += 1
+        item["total"] += event["dur"] / 1000
+        item["max"] = max(item["max"], event["dur"] / 1000)
+    for item in summary.values():
+        item["mean"] = item["total"] / item["calls"]
+    return dict(sorted(summary.items(), key=lambda i: -i[1]["total"]))
+
+
+def export_trace(filename: str = None) -> str:
+    """Write the recorded spans and counters as a Chrome trace.
+
+    :param filename: The JSON file, defaults to TRACE_FILENAME
+    :type filename: str, optional
+    :return: The filename.
+    :rtype: str
+    """
+    filename = filename or TRACE_FILENAME
+    events = list(_events)
+    events.append(
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": "Personalized Coaching Assistant"},
+        }
+    )
+    with open(filename, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+    return filename
+
+
+def reset():
+    """Remove the recorded spans and counters."""
+    with _lock:
+        _events.clear()
+        _counters.clear()
+
+
+def _export_at_exit():
+    if _events:
+        filename = export_trace()
+        print(f"[profiler]   {len(_events)} events saved to {filename}")
+
+
+if ENABLED:
+    atexit.register(_export_at_exit)
@@ -0,0 +1,318 @@
+"""Pure PIL drawing of the widgets of `ui.widgets`.
+
+Each function draws an image from its parameters only, without Tk, so the widgets, the reports,
+the benchmarks and worker processes all share the same drawing code. The images are drawn SCALE
+times larger than shown, the widgets then display them at their size for smooth edges.
+"""
+
+import functools
+from typing import Tuple, Union
+
+from PIL import Image, ImageDraw, ImageFont
+
+from . import font as ufont
+
+SCALE = 3
+
+Color = Union[str, Tuple[int, ...]]
+Font = Tuple[str, int]
+
+
+@functools.lru_cache(maxsize=64)
+def get_font(name: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font once per process, every render with the same font and size reuses it.
+
+    :param name: The font file or system font name.
+    :type name: str
+    :param size: The font size in pixels.
+    :type size: int
+    :return: The font.
+    :rtype: ImageFont.FreeTypeFont
+    """
+    return ImageFont.truetype(name, size)
+
+
+def get_meter_angle(
+    value: float, max_value: float = 100, arc_offset: int = -90, arc_range: int = 360
+) -> int:
+    """Get the angle of the end of the meter progress.
+
+    :param value: The meter value.
+    :type value: float
+    :param max_value: The upper limit of the meter's value, defaults to 100
+    :type max_value: float, optional
+    :param arc_offset: The angle of the start of the meter, defaults to -90
+    :type arc_offset: int, optional
+    :param arc_range: The angle of a full meter, defaults to 360
+    :type arc_range: int, optional
+    :return: The angle in degrees.
+    :rtype: int
+    """
+    return int(value / max_value * arc_range) + arc_offset
+
+
+def render_meter_base(
+    meter_size: int = 100,
+    meter_thickness: int = 10,
+    trough_color: Color = "#494747",
+    arc_offset: int = -90,
+    arc_range: int = 360,
+    scale: int = SCALE,
+) -> Image.Image:
+    """Draw the empty meter, see `render_meter`.
+
+    :return: The image, of (meter_size * scale) pixels square.
+    :rtype: Image
+    """
+    image = Image.new(
+        mode="RGBA", size=(meter_size * scale, meter_size * scale), color=(0, 0, 0, 0)
+    )
+    draw = ImageDraw.Draw(image, mode="RGBA")
+    x1 = y1 = meter_size * scale - 20
+    draw.arc(
+        xy=(0, 0, x1, y1),
+        start=arc_offset,
+        end=arc_range + arc_offset,
+        fill=trough_color,
+        width=meter_thickness * scale,
+    )
+    return image
+
+
+def render_meter(
+    value: float,
+    max_value: float = 100,
+    meter_size: int = 100,
+    meter_thickness: int = 10,
+    trough_color: Color = "#494747",
+    wedge_size: int = 0,
+    fg_color: Color = "#ff1e00",
+    prefix: str = "",
+    suffix: str = "",
+    showtext: bool = True,
+    textfont: Font = ("arial", 25),
+    text_color: Color = "black",
+    arc_offset: int = -90,
+    arc_range: int = 360,
+    scale: int = SCALE,
+    base: Image.Image = None,
+) -> Image.Image:
+    """Draw a circular meter, see `ui.widgets.Meter` for the parameters.
+
+    :param base: The empty meter from `render_meter_base` with the same parameters, drawn if None, defaults to None
+    :type base: Image, optional
+    :return: The image, of (meter_size * scale) pixels square.
+    :rtype: Image
+    """
+    if base is None:
+        base = render_meter_base(
+            meter_size, meter_thickness, trough_color, arc_offset, arc_range, scale
+        )
+    image = base.copy()
+    draw = ImageDraw.Draw(image, mode="RGBA")
+    x1 = y1 = meter_size * scale - 20
+    width = meter_thickness * scale
+    angle = get_meter_angle(value, max_value, arc_offset, arc_range)
+
+    if wedge_size > 0:
+        start, end = angle - wedge_size, angle + wedge_size
+    else:
+        start, end = arc_offset, angle
+    draw.arc(xy=(0, 0, x1, y1), start=start, end=end, fill=fg_color, width=width)
+
+    if showtext:
+        text = str(value)
+        if prefix:
+            text = str(prefix) + text
+        if suffix:
+            text = text + str(suffix)
+        font = get_font(textfont[0], textfont[1] * scale - 3)
+        draw.text(
+            (x1 // 2, y1 // 2), text, text_color, font, anchor="mm", stroke_width=2
+        )
+    return image
+
+
+def get_slider_fill(
+    value: float, width: int, from_: float = 0, to: float = 100
+) -> float:
+    """Get the width of the filled part of a slider.
+
+    :param value: The slider value.
+    :type value: float
+    :param width: The slider width.
+    :type width: int
+    :param from_: The minimum value, defaults to 0
+    :type from_: float, optional
+    :param to: The maximum value, defaults to 100
+    :type to: float, optional
+    :return: The filled width.
+    :rtype: float
+    """
+    return abs(from_ - value) / abs(from_ - to) * width
+
+
+def render_slider_base(
+    width: int,
+    height: int,
+    thickness: int = 30,
+    trough_color: Color = "#a9a9a9",
+    radius: int = 0,
+    scale: int = SCALE,
+) -> Image.Image:
+    """Draw the empty slider, see `render_slider`.
+
+    :return: The image, of (width * scale, height * scale) pixels.
+    :rtype: Image
+    """
+    w, h = width * scale, height * scale
+    thickness = thickness * scale
+    image = Image.new(mode="RGBA", size=(w, h))
+    draw = ImageDraw.Draw(image, mode="RGBA")
+    start = (h - thickness) // 2
+    draw.rounded_rectangle(
+        (0, start, w, start + thickness), fill=trough_color, radius=radius
+    )
+    return image
+
+
+def render_slider(
+    value: float,
+    width: int,
+    height: int,
+    from_: float = 0,
+    to: float = 100,
+    threshold: float = None,
+    thickness: int = 30,
+    fill_color: Color = "#1212ff",
+    trough_color: Color = "#a9a9a9",
+    under_threshold_color: Color = "#e81313",
+    over_threshold_color: Color = "#4cec1b",
+    radius: int = 0,
+    scale: int = SCALE,
+    base: Image.Image = None,
+) -> Image.Image:
+    """Draw a slider with an optional threshold, see `ui.widgets.SilderMeter` for the parameters.
+
+    :param base: The empty slider from `render_slider_base` with the same parameters, drawn if None, defaults to None
+    :type base: Image, optional
+    :return: The image, of (width * scale, height * scale) pixels.
+    :rtype: Image
+    """
+    if base is None:
+        base = render_slider_base(width, height, thickness, trough_color, radius, scale)
+    image = base.copy()
+    draw = ImageDraw.Draw(image, mode="RGBA")
+    h = height * scale
+    y0 = (h - thickness * scale) // 2
+    y1 = y0 + thickness * scale
+    x = get_slider_fill(value, width, from_, to) * scale
+
+    threshold_color = None
+    if threshold is not None:
+        threshold_x = get_slider_fill(threshold, width, from_, to) * scale
+        if value < threshold:
+            threshold_color = under_threshold_color
+            draw.rounded_rectangle(
+                (0, y0, threshold_x, y1), radius, fill=threshold_color
+            )
+        else:
+            threshold_color = over_threshold_color
+
+    draw.rounded_rectangle(xy=(0, y0, x, y1), radius=radius, fill=fill_color)
+
+    # NOTE: The circle of the current value.
+    y_offset = 25
+    circle_radius = (h - 2 * y_offset) // 2
+    draw.ellipse(
+        (x - circle_radius, y_offset, x + circle_radius, h - y_offset), fill=fill_color
+    )
+
+    if threshold is not None:
+        # NOTE: The divider showing where the threshold is.
+        indicator_thickness = 10 * scale
+        if threshold < indicator_thickness // 2:
+            x0 = 0
+        else:
+            x0 = threshold_x - indicator_thickness // 2
+        x1 = threshold_x + indicator_thickness // 2
+        draw.rectangle((x0, 7, x1, h - 7), fill=threshold_color)
+        if value >= threshold:
+            draw.rounded_rectangle(
+                (0, y0, threshold_x, y1), radius, fill=threshold_color
+            )
+    return image
+
+
+def wrap_card_text(
+    text: str, font: ImageFont.FreeTypeFont, width: int, offset: int = 0
+) -> str:
+    """Wrap each line of a text so it never goes past width, see `utils.font.wrap_text`.
+
+    :param text: Text to wrap.
+    :type text: str
+    :param font: The font of the text.
+    :type font: ImageFont.FreeTypeFont
+    :param width: The width of the image.
+    :type width: int
+    :param offset: The x offset, defaults to 0
+    :type offset: int, optional
+    :return: The wrapped text.
+    :rtype: str
+    """
+    pixel = width - offset
+    lines = text.split("\n")
+    return "\n".join(
+        ufont.wrap_text(t, pixel, font=font, font_factor=0.97) for t in lines
+    )
+
+
+def render_card(
+    text: str,
+    size: Tuple[int, int] = (250, 350),
+    subtext: str = "",
+    image_name: str = None,
+    text_color: Color = "black",
+    text_font: Font = ("arial", 18),
+    subtext_font: Font = ("arial", 16),
+    subtext_color: Color = "#181818",
+    textbox_color: Color = "yellow",
+    textbox_size_pct: float = 0.6,
+    scale: int = SCALE,
+) -> Image.Image:
+    """Draw the face of a card: an optional image above a textbox with a title and a description, see `ui.widgets.CardButton`.
+
+    :param textbox_size_pct: The height of the textbox relative to the card, 1.0 if there is no image, defaults to 0.6
+    :type textbox_size_pct: float, optional
+    :return: The image, of (size[0] * scale, size[1] * scale) pixels.
+    :rtype: Image
+    """
+    if image_name is None:
+        textbox_size_pct = 1.0
+    w, h = size[0] * scale, size[1] * scale
+    image = Image.new("RGBA", (w, h))
+    if image_name is not None:
+        picture = Image.open(image_name).resize((w, int(h * (1 - textbox_size_pct))))
+        image.paste(picture, (0, 0))
+
+    th = int(h * textbox_size_pct)
+    textbox = Image.new("RGBA", size=(w, th), color=textbox_color)
+    draw = ImageDraw.Draw(textbox, "RGBA")
+
+    x, y = w // 2, 15 * scale
+    font = get_font(text_font[0], text_font[1] * scale - 3)
+    wrapped = wrap_card_text(text, font, w, offset=25)
+    options = dict(font=font, anchor="ma", align="center", stroke_width=1)
+    draw.text(xy=(x, y), text=wrapped, fill=text_color, **options)
+    _, _, _, bottom = draw.textbbox(xy=(x, y), text=wrapped, **options)
+
+    font = get_font(subtext_font[0], subtext_font[1] * scale - 3)
+    draw.multiline_text(
+        xy=(20, bottom + 45),
+        text=wrap_card_text(subtext, font, w, offset=25),
+        fill=subtext_color,
+        font=font,
+        align="left",
+    )
+    image.paste(textbox, (0, h - th))
+    return image
@@ -0,0 +1,276 @@
+"""On-disk cache of the generated UI images, shared by every launch of the app.
+
+An image is stored under the hash of its render parameters and of the content of the files it is
+drawn from (fonts, source images), so a changed font or parameter never hits a stale image. Small
+images are stored as raw pixels, which load without decoding. Larger ones, the page backgrounds,
+are stored as PNG with the fastest compression.
+
+The cache lives in the user cache directory (see `get_cache_dir`) and is bounded: once it holds
+more than MAX_BYTES, the least recently used images are removed. It is configured with:
+
+* PCA_RENDER_CACHE=0 to disable it,
+* PCA_RENDER_CACHE_DIR to use another directory,
+* PCA_RENDER_CACHE_SIZE for the maximum size in bytes, defaults to 256 MB.
+"""
+
+import os
+import sys
+import json
+import struct
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+from PIL import Image
+
+from . import profiler
+
+VERSION = 1
+APP_NAME = "PersonalizedCoachingAssistant"
+ENABLED = os.environ.get("PCA_RENDER_CACHE", "1") != "0"
+MAX_BYTES = int(os.environ.get("PCA_RENDER_CACHE_SIZE", 256 * 1024 * 1024))
+# NOTE: Images up to this many bytes of pixels are stored raw, larger ones as PNG.
+RAW_LIMIT = 4 * 1024 * 1024
+RAW_EXT = ".rgba"
+PNG_EXT = ".png"
+
+_RAW_HEADER = struct.Struct("<4s4sII")
+_RAW_MAGIC = b"PCAR"
+
+_lock = threading.Lock()
+_digests: Dict[Tuple[str, int, int], str] = {}
+_size: Union[int, None] = None
+
+
+def get_cache_dir() -> str:
+    """Get the cache directory: PCA_RENDER_CACHE_DIR if set, otherwise the user cache directory of the platform.
+
+    :return: The directory, which may not exist yet.
+    :rtype: str
+    """
+    directory = os.environ.get("PCA_RENDER_CACHE_DIR")
+    if directory:
+        return directory
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+        return os.path.join(base, APP_NAME, "Cache", "renders")
+    if sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(base, APP_NAME, "renders")
+
+
+def get_file_digest(filename: str) -> str:
+    """Get the digest of a file content. It is computed once per file version.
+
+    :param filename: The file.
+    :type filename: str
+    :return: A hexadecimal digest, or the filename itself if it is not a file, e.g. a system font name.
+    :rtype: str
+    """
+    try:
+        stat = os.stat(filename)
+    except (OSError, TypeError):
+        return str(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        with open(filename, "rb") as file:
+            digest = _digests[key] = hashlib.sha1(file.read()).hexdigest()
+    return digest
+
+
+def get_key(kind: str, params: Any, files: Iterable[str] = ()) -> str:
+    """Get the content address of a render.
+
+    :param kind: The kind of render, e.g. "text_bg_builder".
+    :type kind: str
+    :param params: The JSON serializable render parameters.
+    :type params: Any
+    :param files: The files the image is drawn from, e.g. fonts, defaults to ()
+    :type files: Iterable[str], optional
+    :return: A hexadecimal key.
+    :rtype: str
+    """
+    raw = json.dumps(
+        [VERSION, kind, params, [get_file_digest(f) for f in files]],
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _get_filename(key: str, ext: str) -> str:
+    return os.path.join(get_cache_dir(), key[:2], key + ext)
+
+
+def _read_raw(filename: str) -> Image.Image:
+    with open(filename, "rb") as file:
+        data = file.read()
+    magic, mode, width, height = _RAW_HEADER.unpack_from(data)
+    if magic != _RAW_MAGIC:
+        raise ValueError(f"{filename} is not a raw image.")
+    return Image.frombytes(
+        mode.decode("ascii").strip(), (width, height), data[_RAW_HEADER.size :]
+    )
+
+
+def load(key: str) -> Union[Image.Image, None]:
+    """Load a cached image and mark it as recently used.
+
+    :param key: The key, see `get_key`.
+    :type key: str
+    :return: The image, or None if it is not cached.
+    :rtype: Image | None
+    """
+    for ext in (RAW_EXT, PNG_EXT):
+        filename = _get_filename(key, ext)
+        try:
+            if ext == RAW_EXT:
+                image = _read_raw(filename)
+            else:
+                image = Image.open(filename)
+                image.load()
+            os.utime(filename)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, struct.error):
+            # NOTE: A truncated or corrupted file, it is rendered again.
+            _remove(filename)
+            continue
+        profiler.count("render cache hits")
+        return image
+    profiler.count("render cache misses")
+    return None
+
+
+def save(key: str, image: Image.Image):
+    """Store an image, then evict the least recently used images if the cache is too large.
+
+    :param key: The key, see `get_key`.
+    :type key: str
+    :param image: The image.
+    :type image: Image
+    """
+    if image.mode not in ("RGBA", "RGB", "L"):
+        image = image.convert("RGBA")
+    raw = len(image.getbands()) * image.width * image.height <= RAW_LIMIT
+    filename = _get_filename(key, RAW_EXT if raw else PNG_EXT)
+    tmp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(tmp_filename, "wb") as file:
+            if raw:
+                mode = image.mode.ljust(4).encode("ascii")
+                file.write(_RAW_HEADER.pack(_RAW_MAGIC, mode, *image.size))
+                file.write(image.tobytes())
+            else:
+                image.save(file, format="PNG", compress_level=1)
+        os.replace(tmp_filename, filename)
+    except OSError as e:
+        _remove(tmp_filename)
+        print(f"[render_cache]   Could not cache {key}: {e}")
+        return
+    _add_size(os.path.getsize(filename))
+
+
+def get_or_render(
+    kind: str,
+    params: Any,
+    render: Callable[[], Image.Image],
+    files: Iterable[str] = (),
+) -> Image.Image:
+    """Get a cached image, or render and cache it.
+
+    :param kind: The kind of render.
+    :type kind: str
+    :param params: The JSON serializable render parameters. Everything the image depends on must be in params or files.
+    :type params: Any
+    :param render: The function drawing the image.
+    :type render: Callable[[], Image]
+    :param files: The files the image is drawn from, defaults to ()
+    :type files: Iterable[str], optional
+    :return: The image.
+    :rtype: Image
+    """
+    if not ENABLED:
+        return render()
+    key = get_key(kind, params, files)
+    image = load(key)
+    if image is None:
+        image = render()
+        save(key, image)
+    return image
+
+
+def get_size() -> int:
+    """Get the size of the cached files in bytes."""
+    total = 0
+    for directory, _, filenames in os.walk(get_cache_dir()):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+
+def evict(max_bytes: int = None) -> int:
+    """Remove the least recently used images until the cache holds at most max_bytes.
+
+    :param max_bytes: The maximum size, defaults to MAX_BYTES
+    :type max_bytes: int, optional
+    :return: The number of removed images.
+    :rtype: int
+    """
+    global _size
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for directory, _, filenames in os.walk(get_cache_dir()):
+        for name in filenames:
+            filename = os.path.join(directory, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, filename in sorted(entries):
+        if total <= max_bytes:
+            break
+        if _remove(filename):
+            total -= size
+            removed += 1
+    with _lock:
+        _size = total
+    return removed
+
+
+def clear():
+    """Remove every cached image."""
+    evict(0)
+
+
+def _add_size(size: int):
+    """Keep track of the cache size and evict when it goes over MAX_BYTES. The directory is only scanned once per process, and on eviction."""
+    global _size
+    with _lock:
+        if _size is not None:
+            _size += size
+        full = _size is None or _size > MAX_BYTES
+    if full:
+        evict()
+
+
+def _remove(filename: str) -> bool:
+    try:
+        os.remove(filename)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,398 @@
+"""Declarative schema of the player data of each position.
+
+A schema lists the metrics shown for a position and the formula computing each of them from the
+scraped columns. The columns to scrape are derived from the formulas, and the schema is compiled
+once into an `EvaluationPlan` which computes every metric for all the players at once with NumPy.
+
+A new position or metric only needs a new schema::
+
+    register_schema(
+        PositionSchema(
+            "wingback",
+            [value("Tackle success %"), per_match("Crosses per match", "Crosses")],
+        )
+    )
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from . import lazy
+from . import parser
+
+pd = lazy.lazy_import("pandas")
+
+APPEARANCE = "Appearance"
+ATTRIBUTES_FILE = os.path.join("data", "attributes.txt")
+
+Columns = Dict[str, np.ndarray]
+
+
+def _value(value: np.ndarray) -> np.ndarray:
+    return value
+
+
+def _pct(value: np.ndarray, total: np.ndarray) -> np.ndarray:
+    return np.round(value / total * 100, 2)
+
+
+def _cumulative_pct(won: np.ndarray, lost: np.ndarray) -> np.ndarray:
+    return np.round(won / (won + lost) * 100, 2)
+
+
+def _ratio(value: np.ndarray, total: np.ndarray) -> np.ndarray:
+    return value / total
+
+
+def _ceil_ratio(value: np.ndarray, total: np.ndarray) -> np.ndarray:
+    return np.ceil(value / total)
+
+
+FORMULAS: Dict[str, Callable[..., np.ndarray]] = {
+    "value": _value,
+    "pct": _pct,
+    "cumulative_pct": _cumulative_pct,
+    "ratio": _ratio,
+    "ceil_ratio": _ceil_ratio,
+}
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A metric computed from other columns, see the helpers `value`, `pct`, `cumulative_pct` and `per_match`.
+
+    :param name: The metric name.
+    :type name: str
+    :param formula: The name of the formula in FORMULAS.
+    :type formula: str
+    :param inputs: The columns given to the formula, defaults to (name,)
+    :type inputs: tuple[str, ...], optional
+    :param display_name: The name shown in the UI, defaults to the capitalized name.
+    :type display_name: str, optional
+    :raises ValueError: If the formula is not supported.
+    """
+
+    name: str
+    formula: str = "value"
+    inputs: Tuple[str, ...] = ()
+    display_name: str = None
+
+    def __post_init__(self):
+        if self.formula not in FORMULAS:
+            raise ValueError(
+                f"Invalid formula. Formula must be either {', '.join(FORMULAS)}"
+            )
+        if not self.inputs:
+            object.__setattr__(self, "inputs", (self.name,))
+        if self.display_name is None:
+            object.__setattr__(self, "display_name", self.name.capitalize())
+
+
+def value(name: str, **kwargs) -> Metric:
+    """The scraped value of a column."""
+    return Metric(name, "value", (name,), **kwargs)
+
+
+def pct(name: str, total: str, column: str = None, **kwargs) -> Metric:
+    """column / total * 100, rounded to 2 decimal places. column defaults to name."""
+    return Metric(name, "pct", (column or name, total), **kwargs)
+
+
+def cumulative_pct(name: str, won: str, lost: str, **kwargs) -> Metric:
+    """won / (won + lost) * 100, rounded to 2 decimal places."""
+    return Metric(name, "cumulative_pct", (won, lost), **kwargs)
+
+
+def per_match(name: str, column: str = None, **kwargs) -> Metric:
+    """column / APPEARANCE. column defaults to name."""
+    return Metric(name, "ratio", (column or name, APPEARANCE), **kwargs)
+
+
+def _default_derived() -> List[Metric]:
+    # NOTE: The number of appearances is not scraped, it is estimated from the passes.
+    return [Metric(APPEARANCE, "ceil_ratio", ("Passes", "Passes per match"))]
+
+
+@dataclass
+class PositionSchema:
+    """The metrics of a position.
+
+    :param position: The position name.
+    :type position: str
+    :param metrics: The metrics shown for the position, in order.
+    :type metrics: list[Metric]
+    :param extra_columns: Columns scraped even if no metric reads them, defaults to []
+    :type extra_columns: list[str], optional
+    :param derived: Intermediate columns computed before the metrics, defaults to APPEARANCE.
+    :type derived: list[Metric], optional
+    """
+
+    position: str
+    metrics: List[Metric]
+    extra_columns: List[str] = field(default_factory=list)
+    derived: List[Metric] = field(default_factory=_default_derived)
+    _plan: "EvaluationPlan" = field(default=None, init=False, repr=False)
+
+    @property
+    def required_columns(self) -> List[str]:
+        """The scraped columns read by the metrics."""
+        derived = {metric.name for metric in self.derived}
+        columns = []
+        for metric in self.derived + self.metrics:
+            for name in metric.inputs:
+                if name not in derived and name not in columns:
+                    columns.append(name)
+        return columns
+
+    @property
+    def raw_columns(self) -> List[str]:
+        """The columns to scrape: required_columns followed by extra_columns."""
+        columns = self.required_columns
+        return columns + [name for name in self.extra_columns if name not in columns]
+
+    def get_attributes(self) -> List[str]:
+        """Get the metric names in order.
+
+        :return: A list of attributes name.
+        :rtype: list[str]
+        """
+        return [metric.name for metric in self.metrics]
+
+    def get_display_name(self, attribute: str) -> str:
+        """Get the name shown in the UI for a metric.
+
+        :param attribute: The metric name.
+        :type attribute: str
+        :return: The display name, or the capitalized attribute if it is not a metric of the schema.
+        :rtype: str
+        """
+        for metric in self.metrics:
+            if metric.name == attribute:
+                return metric.display_name
+        return attribute.capitalize()
+
+    def compile(self) -> "EvaluationPlan":
+        """Get the evaluation plan of the schema. It is compiled once.
+
+        :return: The evaluation plan.
+        :rtype: EvaluationPlan
+        """
+        if self._plan is None:
+            self._plan = EvaluationPlan(self)
+        return self._plan
+
+
+def clean_values(values: Any) -> np.ndarray:
+    """Convert raw values into floats, see `utils.parser.parse_values`. Missing and invalid values become NaN.
+
+    :param values: A list or array of raw values.
+    :type values: Any
+    :return: A float64 array.
+    :rtype: np.ndarray
+    """
+    return parser.parse_values(values)[0]
+
+
+class EvaluationPlan:
+    """The compiled form of a schema: the formulas resolved once and applied to whole columns."""
+
+    def __init__(self, schema: PositionSchema):
+        self.inputs = schema.required_columns
+        self.attributes = schema.get_attributes()
+        self._derived = [
+            (m.name, FORMULAS[m.formula], m.inputs) for m in schema.derived
+        ]
+        self._metrics = [
+            (m.name, FORMULAS[m.formula], m.inputs) for m in schema.metrics
+        ]
+
+    def evaluate(self, columns: Mapping[str, Any]) -> Columns:
+        """Compute every metric for all the rows.
+
+        :param columns: The raw columns, e.g. a DataFrame, a structured array or a dictionary of lists.
+        :type columns: Mapping[str, Any]
+        :raises KeyError: If a column read by the schema is missing.
+        :return: A dictionary of metric name and float64 array, in the order of the schema.
+        :rtype: dict[str, np.ndarray]
+        """
+        env = {name: clean_values(columns[name]) for name in self.inputs}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name, formula, inputs in self._derived:
+                env[name] = formula(*[env[i] for i in inputs])
+            return {
+                name: formula(*[env[i] for i in inputs])
+                for name, formula, inputs in self._metrics
+            }
+
+    def evaluate_frame(self, columns: Mapping[str, Any]) -> pd.DataFrame:
+        """Compute every metric for all the rows, see `evaluate`.
+
+        :param columns: The raw columns.
+        :type columns: Mapping[str, Any]
+        :return: A DataFrame with one column per metric.
+        :rtype: pd.DataFrame
+        """
+        return pd.DataFrame(self.evaluate(columns), columns=self.attributes)
+
+    def evaluate_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """Compute every metric for a list of rows.
+
+        :param records: The raw rows, e.g. read from the csv file.
+        :type records: list[dict]
+        :return: One dictionary of metric name and value per row.
+        :rtype: list[dict[str, float]]
+        """
+        if not records:
+            return []
+        columns = {name: [record[name] for record in records] for name in self.inputs}
+        result = self.evaluate(columns)
+        rows = zip(*[result[name].tolist() for name in self.attributes])
+        return [dict(zip(self.attributes, row)) for row in rows]
+
+
+SCHEMAS: Dict[str, PositionSchema] = {}
+
+
+def register_schema(schema: PositionSchema):
+    """Add or replace the schema of a position.
+
+    :param schema: The schema.
+    :type schema: PositionSchema
+    """
+    SCHEMAS[schema.position.lower()] = schema
+
+
+def get_schema(position: str) -> PositionSchema:
+    """Get the schema of a position.
+
+    :param position: Position of the player.
+    :type position: str
+    :raises ValueError: If the position has no schema.
+    :return: The schema.
+    :rtype: PositionSchema
+    """
+    schema = SCHEMAS.get(position.lower())
+    if schema is None:
+        raise ValueError(
+            f"Invalid position. Position must be either {', '.join(SCHEMAS)}"
+        )
+    return schema
+
+
+def get_positions() -> List[str]:
+    """Get the positions with a schema.
+
+    :return: A list of positions.
+    :rtype: list[str]
+    """
+    return list(SCHEMAS)
+
+
+def format_attributes() -> str:
+    """List the metrics and the scraped columns of every position, the content of ATTRIBUTES_FILE.
+
+    :return: The text.
+    :rtype: str
+    """
+    lines = [
+        "# Generated from utils/schema.py by `python -m utils.schema`, do not edit."
+    ]
+    for position, schema in SCHEMAS.items():
+        lines += ["", f"{position.capitalize()}:"]
+        lines += [f"* {metric.display_name}" for metric in schema.metrics]
+        lines.append(f"Scraped columns: {', '.join(schema.raw_columns)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_attributes(filename: str = ATTRIBUTES_FILE) -> str:
+    """Write the list of the attributes of every position, see `format_attributes`.
+
+    :param filename: The output file, defaults to ATTRIBUTES_FILE
+    :type filename: str, optional
+    :return: The written filename.
+    :rtype: str
+    """
+    with open(filename, "w") as file:
+        file.write(format_attributes())
+    return filename
+
+
+register_schema(
+    PositionSchema(
+        "defender",
+        [
+            value("Tackle success %"),
+            pct("Headed Clearance", "Clearances"),
+            pct("Clearances", APPEARANCE),
+            cumulative_pct("Duels", "Duels won", "Duels lost"),
+            cumulative_pct(
+                "Aerial battles", "Aerial battles won", "Aerial battles lost"
+            ),
+            value("Cross accuracy %"),
+            value("Passes per match"),
+            value("Interceptions"),
+        ],
+    )
+)
+
+register_schema(
+    PositionSchema(
+        "forward",
+        [
+            pct("Headed goals", "Goals"),
+            value("Goals"),
+            value("Shots on target"),
+            value("Shooting accuracy %"),
+            value("Passes per match"),
+            value("Big Chances Created"),
+            value("Big chances missed"),
+            value("Freekicks scored"),
+            value("Assists"),
+            per_match("Cross accuracy %", "Crosses"),
+        ],
+        extra_columns=["Goals with right foot", "Goals with left foot"],
+    )
+)
+
+register_schema(
+    PositionSchema(
+        "midfielder",
+        [
+            pct("Headed goals", "Goals"),
+            value("Shooting accuracy %"),
+            value("Cross accuracy %"),
+            value("Tackle success %"),
+            cumulative_pct("Duels", "Duels won", "Duels lost"),
+            cumulative_pct(
+                "Aerial battles", "Aerial battles won", "Aerial battles lost"
+            ),
+            value("Passes per match"),
+            value("Big Chances Created"),
+        ],
+        extra_columns=["Goals with right foot", "Goals with left foot"],
+    )
+)
+
+register_schema(
+    PositionSchema(
+        "goalkeeper",
+        [
+            pct("Penalties Saved", "Saves"),
+            pct("Punches", "Saves"),
+            pct("Catches", "Saves"),
+            pct("Sweeper clearances", "Saves"),
+            value("Goal Kicks"),
+            value("Clean sheets"),
+            value("Passes per match"),
+        ],
+    )
+)
+
+
+if __name__ == "__main__":
+    print(f"[schema]   Written {write_attributes()}")
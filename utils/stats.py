@@ -0,0 +1,404 @@
+import math
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+
+class RunningStats:
+    """Online mean, variance, min and max of a stream of values (Welford's algorithm).
+
+    Values are pushed one at a time or in batches and never stored, so the memory
+    used does not depend on the number of values seen.
+    """
+
+    __slots__ = ("count", "mean", "min", "max", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+
+    def push(self, value: float):
+        """Add a single value. NaN values are ignored.
+
+        :param value: The value to add.
+        :type value: float
+        """
+        if value != value:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def push_many(self, values: Iterable[float]):
+        """Add a batch of values. NaN values are ignored.
+
+        :param values: The values to add.
+        :type values: Iterable[float]
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        other = RunningStats()
+        other.count = int(values.size)
+        other.mean = float(values.mean())
+        other._m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "RunningStats"):
+        """Merge another RunningStats into this one (Chan's parallel algorithm).
+
+        :param other: The statistics to merge.
+        :type other: RunningStats
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values seen so far."""
+        if self.count == 0:
+            return math.nan
+        return self._m2 / self.count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the values seen so far."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Values are counted in logarithmically sized buckets, so any quantile estimate is
+    within ``relative_accuracy`` of the true value while the memory used only grows
+    with the logarithm of the value range.
+
+    :param relative_accuracy: The maximum relative error of a quantile estimate, defaults to 0.01
+    :type relative_accuracy: float, optional
+    """
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def push(self, value: float):
+        """Add a single value. NaN values are ignored and negative values count as 0.
+
+        :param value: The value to add.
+        :type value: float
+        """
+        self.push_many([value])
+
+    def push_many(self, values: Iterable[float]):
+        """Add a batch of values. NaN values are ignored and negative values count as 0.
+
+        :param values: The values to add.
+        :type values: Iterable[float]
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        positive = values[values > self.MIN_VALUE]
+        self._zero_count += int(values.size - positive.size)
+        self.count += int(values.size)
+        if positive.size == 0:
+            return
+        keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        for key, n in zip(*np.unique(keys, return_counts=True)):
+            key = int(key)
+            self._bins[key] = self._bins.get(key, 0) + int(n)
+
+    def merge(self, other: "QuantileSketch"):
+        """Merge another sketch with the same relative accuracy into this one.
+
+        :param other: The sketch to merge.
+        :type other: QuantileSketch
+        :raises ValueError: If both sketches have different relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, n in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + n
+        self._zero_count += other._zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile of the values seen so far.
+
+        :param q: The quantile between 0 and 1, e.g. 0.5 for the median.
+        :type q: float
+        :raises ValueError: If q is not between 0 and 1.
+        :return: The estimated quantile, or NaN if no value was pushed.
+        :rtype: float
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if rank < seen:
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
+
+
+class AttributeSummary:
+    """Streaming summary of a single attribute: mean, std, min, max and quantiles.
+
+    :param relative_accuracy: The relative accuracy of the quantile estimates, defaults to 0.01
+    :type relative_accuracy: float, optional
+    """
+
+    QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+    __slots__ = ("stats", "sketch")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def push_many(self, values: Iterable[float]):
+        """Add a batch of values.
+
+        :param values: The values to add.
+        :type values: Iterable[float]
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.stats.push_many(values)
+        self.sketch.push_many(values)
+
+    def merge(self, other: "AttributeSummary"):
+        """Merge another summary into this one.
+
+        :param other: The summary to merge.
+        :type other: AttributeSummary
+        """
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+
+    def get(self) -> Dict[str, float]:
+        """Get the dictionary version of the summary.
+
+        :return: A dictionary of count, mean, std, min, max and the quantiles as p25, p50, ...
+        :rtype: dict[str, float]
+        """
+        result = {
+            "count": self.stats.count,
+            "mean": self.stats.mean if self.stats.count else math.nan,
+            "std": self.stats.std,
+            "min": self.stats.min if self.stats.count else math.nan,
+            "max": self.stats.max if self.stats.count else math.nan,
+        }
+        for q in self.QUANTILES:
+            result[f"p{int(q * 100)}"] = self.sketch.quantile(q)
+        return result
+
+
+class BenchmarkAggregator:
+    """Aggregate processed player data into per-attribute benchmark summaries without keeping the rows.
+
+    :param relative_accuracy: The relative accuracy of the quantile estimates, defaults to 0.01
+    :type relative_accuracy: float, optional
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.summaries: Dict[str, AttributeSummary] = {}
+
+    def push_records(self, records: List[Dict[str, float]]):
+        """Add a chunk of processed records, e.g. the output of `DataHandler.get_data`.
+
+        :param records: A list of dictionary with attribute names as keys.
+        :type records: list[dict[str, float]]
+        """
+        columns: Dict[str, List[float]] = {}
+        for record in records:
+            for attr, value in record.items():
+                columns.setdefault(attr, []).append(value)
+        for attr, values in columns.items():
+            self._summary(attr).push_many(values)
+
+    def push_columns(self, columns: Dict[str, Union[List[float], np.ndarray]]):
+        """Add a chunk of processed values given column by column.
+
+        :param columns: A mapping of attribute name to its values. A pandas.DataFrame works as well.
+        :type columns: dict[str, list[float] | np.ndarray]
+        """
+        for attr in columns:
+            self._summary(attr).push_many(columns[attr])
+
+    def merge(self, other: "BenchmarkAggregator"):
+        """Merge another aggregator into this one.
+
+        :param other: The aggregator to merge.
+        :type other: BenchmarkAggregator
+        """
+        for attr, summary in other.summaries.items():
+            self._summary(attr).merge(summary)
+
+    def get_attributes(self) -> List[str]:
+        """Get the attributes seen so far in insertion order.
+
+        :return: List of attributes
+        :rtype: list[str]
+        """
+        return list(self.summaries.keys())
+
+    def get(self) -> Dict[str, Dict[str, float]]:
+        """Get the benchmark of every attribute.
+
+        :return: A dictionary of attribute name to its summary, see `AttributeSummary.get`.
+        :rtype: dict[str, dict[str, float]]
+        """
+        return {attr: summary.get() for attr, summary in self.summaries.items()}
+
+    def _summary(self, attr: str) -> AttributeSummary:
+        summary = self.summaries.get(attr)
+        if summary is None:
+            summary = self.summaries[attr] = AttributeSummary(self.relative_accuracy)
+        return summary
+
+
+class EmpiricalCDF:
+    """Percentile ranks of the values of several attributes from their sorted values (empirical CDFs).
+
+    The values of every attribute are sorted once. A single lookup is then a binary search, and a
+    whole matrix of values, e.g. a squad, is ranked with one vectorized `np.searchsorted` over the
+    sorted values of all attributes laid out one after another.
+
+    :param sorted_values: A (rows, attributes) matrix where every column is sorted ascending with NaN values last.
+    :type sorted_values: np.ndarray
+    :param attributes: The attribute name of each column.
+    :type attributes: list[str]
+    """
+
+    # Every column is mapped into its own block [_BLOCK * i - 1, _BLOCK * i + 2] of the search keys.
+    _BLOCK = 4.0
+
+    def __init__(self, sorted_values: np.ndarray, attributes: List[str]):
+        self.sorted_values = sorted_values
+        self.attributes = list(attributes)
+        self._index = {attr: i for i, attr in enumerate(self.attributes)}
+        self.counts = (~np.isnan(np.asarray(sorted_values))).sum(axis=0)
+        self.low = np.array(
+            [sorted_values[0, i] if n else np.nan for i, n in enumerate(self.counts)]
+        )
+        self.high = np.array(
+            [
+                sorted_values[n - 1, i] if n else np.nan
+                for i, n in enumerate(self.counts)
+            ]
+        )
+        self._offsets = np.concatenate(([0], np.cumsum(self.counts)))
+        self._keys = np.concatenate(
+            [
+                self._to_keys(i, np.asarray(sorted_values[:n, i]))
+                for i, n in enumerate(self.counts)
+            ]
+        )
+
+    @classmethod
+    def from_data(cls, values: np.ndarray, attributes: List[str]) -> "EmpiricalCDF":
+        """Build the empirical CDFs from unsorted values.
+
+        :param values: A (rows, attributes) matrix.
+        :type values: np.ndarray
+        :param attributes: The attribute name of each column.
+        :type attributes: list[str]
+        :return: The empirical CDFs.
+        :rtype: EmpiricalCDF
+        """
+        return cls(np.sort(np.asarray(values, dtype=np.float64), axis=0), attributes)
+
+    def percentile(self, attr: str, value: float) -> float:
+        """Get the percentage of the values of an attribute that are lower or equal to value.
+
+        :param attr: The attribute name.
+        :type attr: str
+        :param value: The value to rank.
+        :type value: float
+        :return: The percentile rank between 0 and 100, or NaN if the attribute has no values.
+        :rtype: float
+        """
+        i = self._index[attr]
+        n = self.counts[i]
+        if n == 0:
+            return math.nan
+        rank = np.searchsorted(self.sorted_values[:n, i], value, side="right")
+        return float(rank / n * 100)
+
+    def percentiles(self, values: np.ndarray) -> np.ndarray:
+        """Get the percentile ranks of a matrix of values, one column per attribute.
+
+        :param values: A (rows, attributes) matrix, or a single row, in the order of `attributes`.
+        :type values: np.ndarray
+        :return: The percentile ranks between 0 and 100 in the same shape as values.
+        :rtype: np.ndarray
+        """
+        values = np.asarray(values, dtype=np.float64)
+        matrix = np.atleast_2d(values)
+        cols = np.arange(matrix.shape[1])
+        keys = self._to_keys(cols, matrix)
+        ranks = np.searchsorted(self._keys, keys, side="right") - self._offsets[cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = ranks / self.counts * 100
+        result[:, self.counts == 0] = np.nan
+        result[np.isnan(matrix)] = np.nan
+        return result.reshape(values.shape)
+
+    def quantile(self, attr: str, q: float) -> float:
+        """Get the value of an attribute at the q-quantile, e.g. 0.5 for the median.
+
+        :param attr: The attribute name.
+        :type attr: str
+        :param q: The quantile between 0 and 1.
+        :type q: float
+        :return: The value, or NaN if the attribute has no values.
+        :rtype: float
+        """
+        i = self._index[attr]
+        n = self.counts[i]
+        if n == 0:
+            return math.nan
+        return float(np.quantile(self.sorted_values[:n, i], q))
+
+    def _to_keys(self, cols, values: np.ndarray) -> np.ndarray:
+        """Map values into the search key block of their columns, keeping their order inside each column."""
+        low = self.low[cols]
+        span = self.high[cols] - low
+        span = np.where(span > 0, span, 1.0)
+        position = np.clip((values - low) / span, -0.5, 1.5)
+        return self._BLOCK * cols + position
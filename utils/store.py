@@ -0,0 +1,210 @@
+"""Read-only benchmark store shared across processes.
+
+Every season/position gets one file holding the processed position dataset as a float64 matrix
+behind a small header, followed by the same matrix with every column sorted (the empirical CDFs
+used for percentile scoring). The matrix is memory-mapped read-only, so every assessment worker or app
+instance on the same machine maps the same pages of the page cache instead of loading and
+processing its own copy of the dataset.
+
+File layout::
+
+    MAGIC (4 bytes) | version (uint16) | reserved (uint16) | header length (uint32)
+    JSON header with the attributes, the shape and the player names, padded with spaces to a multiple of ALIGNMENT bytes
+    float64 matrix of shape (rows, columns) in C order
+    float64 matrix of shape (rows, columns) in C order, every column sorted with NaN last
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import struct
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from . import lazy
+from .stats import EmpiricalCDF
+
+pd = lazy.lazy_import("pandas")
+
+MAGIC = b"PCAB"
+VERSION = 3
+ALIGNMENT = 64
+STORE_EXT = ".bench"
+_PREFIX = struct.Struct("<4sHHI")
+
+_opened: Dict[str, Tuple[float, "BenchmarkStore"]] = {}
+
+
+def get_store_location(position: str, season: str, root: str = "data") -> str:
+    """Get the location of the store file of a position and a season.
+
+    :param position: Position of the player.
+    :type position: str
+    :param season: The season directory name, e.g. "2022-23"
+    :type season: str
+    :param root: The data directory, defaults to "data"
+    :type root: str, optional
+    :return: String to the store file location.
+    :rtype: str
+    """
+    return os.path.join(root, season, f"{position.lower()}_benchmark{STORE_EXT}")
+
+
+def write_store(
+    data: pd.DataFrame, filename: str, names: List[str] = None, **metadata
+) -> str:
+    """Write processed data into a store file.
+
+    The file is written next to the target and moved in place, so processes that already
+    mapped the old file keep a consistent view and new processes never see a partial file.
+
+    :param data: The processed data, one row per player and one column per attribute.
+    :type data: pd.DataFrame
+    :param filename: The store filename.
+    :type filename: str
+    :param names: The name of each player, defaults to empty names
+    :type names: list[str], optional
+    :param metadata: Extra JSON serializable values to keep in the header, e.g. season and position.
+    :return: The written filename.
+    :rtype: str
+    """
+    values = np.ascontiguousarray(data.to_numpy(dtype=np.float64))
+    header = {
+        "attributes": [str(c) for c in data.columns],
+        "shape": list(values.shape),
+        "names": [str(n) for n in names] if names is not None else [""] * len(values),
+        **metadata,
+    }
+    raw_header = json.dumps(header).encode("utf-8")
+    total = _PREFIX.size + len(raw_header)
+    raw_header += b" " * (-total % ALIGNMENT)
+
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, 0, len(raw_header)))
+        file.write(raw_header)
+        file.write(values.tobytes(order="C"))
+        file.write(np.sort(values, axis=0).tobytes(order="C"))
+    os.replace(tmp_filename, filename)
+    return filename
+
+
+class BenchmarkStore:
+    """A read-only, memory-mapped view of a store file.
+
+    :param filename: The store filename.
+    :type filename: str
+    :raises ValueError: If the file is not a store file or has an unsupported version.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, "rb") as file:
+            magic, version, _, header_size = _PREFIX.unpack(file.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a benchmark store file.")
+            if version != VERSION:
+                raise ValueError(
+                    f"{filename} has unsupported store version {version}, expected {VERSION}."
+                )
+            self.header = json.loads(file.read(header_size))
+
+        self.attributes: List[str] = self.header["attributes"]
+        self.names: List[str] = self.header["names"]
+        self._index = {attr: i for i, attr in enumerate(self.attributes)}
+        rows, cols = self.header["shape"]
+        offset = _PREFIX.size + header_size
+        if rows * cols == 0:
+            self.values = np.empty((rows, cols), dtype=np.float64)
+            self.sorted_values = self.values
+        else:
+            self.values = np.memmap(
+                filename, dtype="<f8", mode="r", offset=offset, shape=(rows, cols)
+            )
+            self.sorted_values = np.memmap(
+                filename,
+                dtype="<f8",
+                mode="r",
+                offset=offset + self.values.nbytes,
+                shape=(rows, cols),
+            )
+        self._ecdf = None
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def get_attributes(self) -> List[str]:
+        """Get the attributes of the processed data.
+
+        :return: List of attributes
+        :rtype: list[str]
+        """
+        return list(self.attributes)
+
+    def get_names(self) -> List[str]:
+        """Get the player names in the same order as the processed data, like `DataHandler.get_names`.
+
+        :return: List of player names
+        :rtype: list[str]
+        """
+        return list(self.names)
+
+    def column(self, attr: str) -> np.ndarray:
+        """Get the values of a single attribute without copying them.
+
+        :param attr: The attribute name.
+        :type attr: str
+        :return: A read-only view of the attribute values.
+        :rtype: np.ndarray
+        """
+        return self.values[:, self._index[attr]]
+
+    def get_ecdf(self) -> EmpiricalCDF:
+        """Get the empirical CDFs of the attributes, built from the presorted values.
+
+        :return: The empirical CDFs.
+        :rtype: EmpiricalCDF
+        """
+        if self._ecdf is None:
+            self._ecdf = EmpiricalCDF(self.sorted_values, self.attributes)
+        return self._ecdf
+
+    def get_pd_data(self) -> pd.DataFrame:
+        """Retrieve the processed data as pandas.DataFrame, like `DataHandler.get_pd_data`.
+
+        :return: pandas dataframe object containing processed data.
+        :rtype: pd.DataFrame
+        """
+        return pd.DataFrame(np.asarray(self.values), columns=self.attributes)
+
+    def get_normalized_data(self) -> pd.DataFrame:
+        """Return the normalized DataFrame, like `DataHandler.get_normalized_data`.
+
+        :return: A pd.DataFrame with normalize value 0 - 100
+        :rtype: pd.DataFrame
+        """
+        values = np.asarray(self.values)
+        low = np.nanmin(values, axis=0)
+        high = np.nanmax(values, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = (values - low) / (high - low) * 100
+        return pd.DataFrame(normalized, columns=self.attributes)
+
+
+def open_store(filename: str) -> BenchmarkStore:
+    """Open a store file. Stores are opened once per process and reused until the file changes.
+
+    :param filename: The store filename.
+    :type filename: str
+    :return: The opened store.
+    :rtype: BenchmarkStore
+    """
+    mtime = os.path.getmtime(filename)
+    cached = _opened.get(filename)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    store = BenchmarkStore(filename)
+    _opened[filename] = (mtime, store)
+    return store